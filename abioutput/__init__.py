@@ -1,6 +1,9 @@
 from .parsers import (OutputParser, LogParser, DOSParser, SelfEnergyParser, 
                       plot_self_energy, EIGParser, FatbandParser,
-                      FilesFileParser)
+                      FilesFileParser, EigenvalueStore)
 from .parsers.dmft import DMFTEigParser, DMFTProjectorsParser
 from .constants import *
-from .bandstructure import Bandstructure
+from .bandstructure import (Bandstructure, get_band_edges,
+                            get_output_eigenvalues)
+from .render import render_figure, render_figures
+from .aio import aparse, aiter_parse, astatus
@@ -0,0 +1,99 @@
+"""asyncio API: parse files and check calculation trees without blocking
+the event loop.
+
+    parser = await aparse("calc_o_EIG")
+    async for path, parser in aiter_parse(paths, executor=process_pool):
+        ...
+    async for status in astatus("calculations/"):
+        ...
+
+File I/O and parsing are done in executors: threads by default (the
+default executor of the event loop) or processes to parse in parallel.
+"""
+from .parsers.loader import load_file
+from .utils.routines import MAX_CONCURRENCY, aimap
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import asyncio
+
+
+async def aparse(path, kind=None, executor=None):
+    """Parse a file (or load a binary file) in an executor.
+
+    Parameters
+    ----------
+    path : str
+           The path of the file.
+    kind : str, optional
+           The kind of file (see parsers.loader.load_file). If None, it
+           is given by the file name.
+    executor : concurrent.futures.Executor, optional
+               The executor parsing the file. If None, the default executor
+               of the event loop (threads) is used.
+
+    Returns
+    -------
+    The parser.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, load_file, path, kind)
+
+
+async def aiter_parse(paths, kind=None, executor=None,
+                      max_concurrency=MAX_CONCURRENCY, on_error=None):
+    """Parse many files in an executor and yield the (path, parser) pairs as
+    soon as each file is parsed (not in the order of the paths).
+
+    Parameters
+    ----------
+    paths : list
+            The paths of the files.
+    kind : str, optional
+           The kind of files (see aparse).
+    executor : concurrent.futures.Executor, optional
+               The executor parsing the files (e.g.: a ProcessPoolExecutor
+               to parse in parallel). If None, the default executor of the
+               event loop (threads) is used.
+    max_concurrency : int, optional
+                      The maximal number of files parsed at the same time.
+    on_error : callable, optional
+               If not None, called as on_error(path, exception) when a file
+               cannot be parsed and its return value is yielded instead of
+               the parser. Otherwise, the exception is raised.
+    """
+    paths = list(paths)
+    load = partial(load_file, kind=kind)
+    async for index, parser in aimap(load, paths, executor=executor,
+                                     max_concurrency=max_concurrency,
+                                     on_error=on_error):
+        yield paths[index], parser
+
+
+async def astatus(top_directory, executor=None, max_concurrency=None,
+                  **kwargs):
+    """Find the calculations under a directory and yield their status as
+    soon as each one is known (see TreeBuilder.astatus).
+
+    Parameters
+    ----------
+    top_directory : str
+                    The top directory of the calculation tree.
+    executor : concurrent.futures.ThreadPoolExecutor, optional
+               The threads searching the tree and getting the status. If
+               None, the default executor of the event loop is used.
+               Processes cannot be used (see TreeBuilder.astatus).
+    max_concurrency : int, optional
+                      The maximal number of calculations checked at the same
+                      time. If None, it is the TreeBuilder max_workers.
+    Other kwargs are passed to the TreeBuilder.
+    """
+    from .utils.builders import TreeBuilder
+    if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+        raise TypeError("The status can only be computed in threads"
+                        " (a ThreadPoolExecutor).")
+    loop = asyncio.get_running_loop()
+    builder = await loop.run_in_executor(
+            executor, partial(TreeBuilder, top_directory, **kwargs))
+    async for status in builder.astatus(executor=executor,
+                                        max_concurrency=max_concurrency):
+        yield status
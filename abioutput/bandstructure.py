@@ -1,5 +1,7 @@
+import matplotlib.pyplot as plt
 import numpy as np
 from abioutput import EIGParser
+from .parsers.eig_store import EigenvalueStore
 from .plot import Plot
 
 
@@ -11,6 +13,11 @@ HIGH_SYM_PTS = {"FCC": {"L": (0.5, 0.0, 0.0),
                               "X": (0.5, 0.0, 0.0),
                               "Y": (0.0, 0.5, 0.0),
                               "M": (0.5, 0.5, 0.0)}}
+# maximal distance (in reduced coordinates) between a kpt and a high
+# symmetry point for the kpt to be labelled.
+SYM_PTS_TOLERANCE = 1e-4
+# number of kpts per pixel above which downsample="auto" downsamples bands
+DOWNSAMPLE_MIN_DENSITY = 2
 
 
 class Bandstructure:
@@ -22,7 +29,10 @@ class Bandstructure:
     Parameters
     ----------
     kpts : list of kpts
-    eigenvalues : list of eigenvalues for each kpt.
+    eigenvalues : list of eigenvalues for each kpt. They are stored as a
+                  single C-contiguous (nkpt x nband) array (not copied if
+                  it is already one) and the bands attribute is a
+                  transposed view of it.
     fermi_band : int, optional
                  If not None, gives the band index of the last valence band.
                  Thus, it can compute the fermi energy from the maximum value
@@ -30,17 +40,32 @@ class Bandstructure:
     fermi_energy : float, optional
                    This parameter lets define manually the fermi energy
                    (must be same units as the eigenvalues).
+    reciprocal_lattice : array, optional
+                         The 3 reciprocal lattice vectors (as rows). If given,
+                         the kpath distances are cartesian distances.
+                         Otherwise, they are computed from the reduced
+                         coordinates.
+    dtype : numpy dtype, optional
+            The storage type of the eigenvalues (e.g.: float32 to halve the
+            memory). If None, it is the type of the eigenvalues array
+            (float64 for lists).
     """
-    def __init__(self, kpts, eigenvalues, fermi_band=None, fermi_energy=None):
-        self.kpts = kpts
-        self.eigenvalues = eigenvalues
-        self.bands = self._get_bands(eigenvalues)
+    def __init__(self, kpts, eigenvalues, fermi_band=None, fermi_energy=None,
+                 reciprocal_lattice=None, dtype=None):
+        self.kpts = np.asarray(kpts, dtype=float)
+        self.reciprocal_lattice = reciprocal_lattice
+        self.eigenvalues = np.ascontiguousarray(eigenvalues, dtype=dtype)
         self.fermi_band = fermi_band
         self.fermi_energy = fermi_energy
         if self.fermi_band is not None:
             if self.fermi_energy is not None:
                 raise ValueError("fermi_energy is already defined.")
-            self.fermi_energy = max(self.bands[self.fermi_band])
+            self.fermi_energy = float(self.bands[self.fermi_band].max())
+
+    @property
+    def bands(self):
+        # (nband x nkpt) view of the eigenvalues
+        return self.eigenvalues.T
 
     def plot(self, bands=None, symmetry="none",
              line_at_zero=True,
@@ -49,7 +74,11 @@ class Bandstructure:
              other_k_labels=None,
              ylabel="Energy",
              color="k",
-             linestyle="-"):
+             linestyle="-",
+             xaxis="distance",
+             kpath_breaks=None,
+             jump_factor=None,
+             downsample=None):
         """Plot the bandstructure.
 
         Parameters
@@ -76,6 +105,25 @@ class Bandstructure:
               If True, the plot will be shown.
         ylabel : str, optional
                  ylabel for the plot.
+        xaxis : str, optional {"distance", "index"}
+                If "distance", the x axis is the distance along the kpath
+                (see the get_kpath method). If "index", it is the kpt index.
+        kpath_breaks : list, optional
+                       The indices of the kpts starting a new segment after
+                       a jump in the kpath (e.g.: K in X|K). The path is
+                       broken there when xaxis is "distance".
+        jump_factor : float, optional
+                      If not None, the kpath is also broken at the steps
+                      larger than this factor times the median step (see
+                      the get_kpath method). Only used when xaxis is
+                      "distance".
+        downsample : int or str, optional
+                     If not None, each band is reduced to its minimum and
+                     maximum in this number of bins of the x axis (the band
+                     extrema and the high symmetry points are kept exactly).
+                     If "auto", the number of bins is the width of the
+                     figure in pixels and the bands are downsampled only if
+                     there are many more kpts than pixels.
         """
         considered_bands = self.bands
         fermi_energy = self.fermi_energy
@@ -84,19 +132,52 @@ class Bandstructure:
         if bands is not None:
             considered_bands = self.bands[range(bands[0], bands[1] + 1), :]
         ys = considered_bands - fermi_energy
-        xs = list(range(len(self.kpts)))
+        if xaxis == "distance":
+            xs, breaks = self.get_kpath(breaks=kpath_breaks,
+                                        jump_factor=jump_factor)
+        elif xaxis == "index":
+            xs, breaks = np.arange(len(self.kpts), dtype=float), []
+        else:
+            raise ValueError(f"Invalid xaxis: {xaxis}.")
         labels, labels_loc = self._get_sym_pts_labels(symmetry)
+        xtick_labels = {}
+        for loc, label in zip(labels_loc, labels):
+            # labels of both sides of a jump are at the same position
+            xtick_labels.setdefault(xs[loc], []).append(label)
+        if downsample == "auto":
+            width, dpi = plt.rcParams["figure.figsize"][0], plt.rcParams[
+                    "figure.dpi"]
+            downsample = int(width * dpi)
+            if len(xs) < DOWNSAMPLE_MIN_DENSITY * downsample:
+                downsample = None
+        # the ends of each segment are always kept
+        keep = np.concatenate(([0, len(xs) - 1], labels_loc, breaks,
+                               np.asarray(breaks, dtype=int) - 1))
+        if downsample is not None:
+            kept = downsample_bands(xs, ys, downsample,
+                                    keep=keep.astype(int))
+        else:
+            kept = np.ones(ys.shape, dtype=bool)
 
         plot = Plot()
         plot.ylabel = ylabel
-        for band in ys:
-            plot.add_curve(xs, band, color=color, linestyle=linestyle)
-        plot.xtick_labels = [(pos, label) for pos, label in
-                             zip(labels_loc, labels)]
+        for band, band_kept in zip(ys, kept):
+            indices = np.flatnonzero(band_kept)
+            band_xs, band_ys = xs[indices], band[indices]
+            if len(breaks):
+                # nan between segments such that they are not joined
+                where = np.searchsorted(indices, breaks)
+                band_xs = np.insert(band_xs, where, np.nan)
+                band_ys = np.insert(band_ys, where, np.nan)
+            plot.add_curve(band_xs, band_ys, color=color,
+                           linestyle=linestyle)
+        if xtick_labels:
+            plot.xtick_labels = [(pos, "|".join(label)) for pos, label in
+                                 xtick_labels.items()]
         if line_at_zero:
             plot.add_hline(0, linestyle="--")
         if high_sym_vlines:
-            for pos in labels_loc:
+            for pos in xtick_labels:
                 plot.add_vline(pos)
 
         if show:
@@ -105,42 +186,386 @@ class Bandstructure:
             plot.save(save_at)
         return plot
 
-    def _get_sym_pts_labels(self, symmetry):
-        labels = []
-        labels_loc = []
+    def get_band_edges(self):
+        """Returns the band edges and gaps of this band structure (see the
+        get_band_edges function). The fermi_band or the fermi_energy must
+        be defined.
+        """
+        edges = get_band_edges([self])
+        return {key: value[0] for key, value in edges.items()}
+
+    def get_kpath(self, breaks=None, jump_factor=None):
+        """Compute the cumulative distance of each kpt along the kpath.
+
+        Parameters
+        ----------
+        breaks : list, optional
+                 The indices of the kpts starting a new segment after a
+                 jump in the kpath (e.g.: K in X|K). They are put at the same
+                 distance as the kpt before them.
+        jump_factor : float, optional
+                      If not None, a step larger than this factor times the
+                      median of the nonzero steps is a jump too. This is a
+                      heuristic: a long and sparsely sampled segment is
+                      taken as a jump as well. Prefer breaks when the jumps
+                      are known.
+
+        Returns
+        -------
+        distances : The array of distances along the kpath.
+        breaks : The array of the indices of the kpts starting a new
+                 segment after a jump.
+        """
+        coordinates = self.kpts
+        if self.reciprocal_lattice is not None:
+            coordinates = coordinates @ np.asarray(self.reciprocal_lattice)
+        steps = np.linalg.norm(np.diff(coordinates, axis=0), axis=1)
+        jumps = np.zeros(len(steps), dtype=bool)
+        if breaks is not None:
+            breaks = np.asarray(breaks, dtype=int)
+            if ((breaks < 1) | (breaks >= len(self.kpts))).any():
+                raise ValueError(f"Invalid kpath breaks: {breaks.tolist()}"
+                                 f" (must be in [1, {len(self.kpts) - 1}]).")
+            jumps[breaks - 1] = True
+        if jump_factor is not None:
+            # repeated kpts (e.g.: at the ends of segments) are not steps
+            nonzero = steps[steps > 0]
+            if len(nonzero):
+                jumps |= steps > jump_factor * np.median(nonzero)
+        steps[jumps] = 0
+        distances = np.concatenate(([0], np.cumsum(steps)))
+        return distances, np.flatnonzero(jumps) + 1
+
+    def _get_sym_pts_labels(self, symmetry, tolerance=SYM_PTS_TOLERANCE):
+        # find the kpts which are high symmetry points. When consecutive
+        # kpts match the same point, only the closest one is labelled.
         high_sym_coordinates = HIGH_SYM_PTS[symmetry]
-        for index, kpt in enumerate(self.kpts):
-            for label, high_sym_kpt in high_sym_coordinates.items():
-                kpt = list(kpt)
-                high_sym_kpt = list(high_sym_kpt)
-                if kpt == high_sym_kpt:
-                    labels_loc.append(index)
-                    if label == "Gamma":
-                        labels.append(r"$\Gamma$")
-                    else:
-                        labels.append(label)
-                    break
-        return labels, labels_loc
-
-    def _get_bands(self, eigenvalues):
-        if not isinstance(eigenvalues, np.ndarray):
-            eigenvalues = np.array(eigenvalues)
-
-        bands = eigenvalues.T
-        return bands
+        names = list(high_sym_coordinates)
+        points = np.array([high_sym_coordinates[x] for x in names])
+        # distances between each kpt and each high symmetry point
+        distances = np.linalg.norm(self.kpts[:, None, :] - points[None, :, :],
+                                   axis=2)
+        closest = np.argmin(distances, axis=1)
+        closest_distances = distances[np.arange(len(self.kpts)), closest]
+        indices = np.flatnonzero(closest_distances <= tolerance)
+        if not len(indices):
+            return [], []
+        # group consecutive kpts matching the same point
+        new_group = np.ones(len(indices), dtype=bool)
+        new_group[1:] = ((np.diff(indices) != 1) |
+                         (np.diff(closest[indices]) != 0))
+        groups = np.cumsum(new_group)
+        # for each group, keep the closest kpt
+        order = np.lexsort((closest_distances[indices], groups))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = np.diff(groups[order]) != 0
+        labels_loc = np.sort(indices[order[first]])
+        labels = []
+        for name in (names[x] for x in closest[labels_loc]):
+            if name == "Gamma":
+                labels.append(r"$\Gamma$")
+            else:
+                labels.append(name)
+        return labels, labels_loc.tolist()
 
     @classmethod
-    def from_file(cls, path, conversion_factor=None, **kwargs):
+    def from_file(cls, path, conversion_factor=None, dtype=np.float64,
+                  **kwargs):
         """Classmethod to read kpts and eigenvalues directly from an EIG file.
 
         Parameters
         ----------
         path : The EIG file path.
         conversion_factor : optional, float
-                            Multiplies all eigenvalues with this factor.
+                            Multiplies all eigenvalues with this factor
+                            (in place, without copy).
+        dtype : numpy dtype, optional
+                The storage type of the eigenvalues (float64 or float32).
         """
-        eigparser = EIGParser.from_file(path)
-        eigs = np.array(eigparser.data["eigenvalues"])
+        eigparser = EIGParser.from_file(path, dtype=dtype)
+        eigs = eigparser.data["eigenvalues"]
         if conversion_factor is not None:
             eigs *= conversion_factor
         return cls(eigparser.data["coordinates"], eigs, **kwargs)
+
+    @classmethod
+    def from_store(cls, path, kpts=None, spin=None, conversion_factor=None,
+                   dtype=None, **kwargs):
+        """Classmethod to read kpts and eigenvalues from an eigenvalue store
+        (see EIGParser.to_store). Only the selected kpts are read.
+
+        Parameters
+        ----------
+        path : str
+               The path of the store.
+        kpts : slice or array, optional
+               The kpts to read (e.g.: slice(0, 1000)). If None, all kpts
+               are read.
+        spin : str, optional
+               The spin to read ('up' or 'down') for spin polarized data.
+        conversion_factor : optional, float
+                            Multiplies all eigenvalues with this factor.
+        dtype : numpy dtype, optional
+                The storage type of the eigenvalues. If None, it is the type
+                of the store.
+        """
+        if kpts is None:
+            kpts = slice(None)
+        with EigenvalueStore(path, spin=spin) as store:
+            eigs = np.ascontiguousarray(store.eigenvalues[kpts], dtype=dtype)
+            coordinates = store.coordinates[kpts]
+        if conversion_factor is not None:
+            eigs *= conversion_factor
+        return cls(coordinates, eigs, **kwargs)
+
+    @classmethod
+    def from_output(cls, parser, dataset=1, spin=None, **kwargs):
+        """Classmethod to get kpts and eigenvalues from an output file
+        already parsed (no EIG file needed). The eigenvalues array of the
+        parser is used as is (not copied).
+
+        Parameters
+        ----------
+        parser : OutputParser instance
+                 The parsed output file.
+        dataset : int, optional
+                  The dataset index (starting at 1).
+        spin : str, optional
+               The spin ('up' or 'down') for spin polarized data.
+        Other kwargs are passed to the init method.
+        """
+        data = _get_output_eigenvalues_data(parser, dataset, spin=spin)
+        return cls(data["coordinates"], data["eigenvalues"], **kwargs)
+
+    @classmethod
+    def from_output_datasets(cls, parser, datasets=None, spin=None,
+                             **kwargs):
+        """Same as from_output for many datasets.
+
+        Parameters
+        ----------
+        parser : OutputParser instance
+                 The parsed output file.
+        datasets : list, optional
+                   The dataset indices. If None, all the datasets with
+                   eigenvalues are used.
+        spin : str, optional
+               The spin ('up' or 'down') for spin polarized data.
+        Other kwargs are passed to the init method.
+
+        Returns
+        -------
+        list : The Bandstructure of each dataset.
+        """
+        if datasets is None:
+            datasets = _get_output_datasets_with_eigenvalues(parser)
+        return [cls.from_output(parser, dataset=dataset, spin=spin,
+                                **kwargs) for dataset in datasets]
+
+
+def get_output_eigenvalues(parser, datasets=None):
+    """Stack the eigenvalues of many datasets of a parsed output file in a
+    single array (e.g.: to compute the band edges of all datasets at once
+    with get_band_edges).
+
+    Parameters
+    ----------
+    parser : OutputParser instance
+             The parsed output file.
+    datasets : list, optional
+               The dataset indices (starting at 1). If None, all the
+               datasets with eigenvalues are used. They must have the same
+               number of kpts and bands.
+
+    Returns
+    -------
+    eigenvalues : The (ndataset, nkpt, nband) array of eigenvalues or the
+                  (ndataset, nspin, nkpt, nband) array for spin polarized
+                  data (spin up first).
+    kpts : The (ndataset, nkpt, 3) array of kpt coordinates.
+    """
+    if datasets is None:
+        datasets = _get_output_datasets_with_eigenvalues(parser)
+    if not len(datasets):
+        raise LookupError("No eigenvalues found in the output file.")
+    eigenvalues, kpts = [], []
+    for dataset in datasets:
+        data = _get_output_eigenvalues_data(parser, dataset, spin=False)
+        if "eigenvalues" in data:
+            eigenvalues.append(data["eigenvalues"])
+            kpts.append(data["coordinates"])
+        else:
+            spins = [x for x in ("up", "down") if x in data]
+            eigenvalues.append(np.stack([data[x]["eigenvalues"]
+                                         for x in spins]))
+            kpts.append(data[spins[0]]["coordinates"])
+    try:
+        return np.stack(eigenvalues), np.stack(kpts)
+    except ValueError:
+        raise ValueError("The datasets do not have the same number of kpts"
+                         " and bands.")
+
+
+def _get_output_eigenvalues_data(parser, dataset, spin=None):
+    # returns the eigenvalues data of a dataset of a parsed output file
+    # (the data of all spins if spin is False)
+    if dataset not in parser.datasets:
+        raise ValueError(f"No dataset {dataset} in the output file.")
+    data = parser.data_per_dtset[list(parser.datasets).index(dataset)]
+    if data is None:
+        raise ValueError(f"Dataset {dataset} was not parsed (see the"
+                         f" OutputParser datasets argument).")
+    if data.get("eigenvalues") is None:
+        raise LookupError(f"No eigenvalues found in dataset {dataset}.")
+    data = data["eigenvalues"]
+    if spin is False or "eigenvalues" in data:
+        return data
+    if spin not in data:
+        raise ValueError(f"Spin polarized data: spin must be one of"
+                         f" {list(data)}.")
+    return data[spin]
+
+
+def _get_output_datasets_with_eigenvalues(parser):
+    return [dataset for dataset, data in
+            zip(parser.datasets, parser.data_per_dtset)
+            if data is not None and data.get("eigenvalues") is not None]
+
+
+def downsample_bands(xs, bands, nbins, keep=None):
+    """Select the points to draw for each band: in each bin of the x axis,
+    only the minimum and the maximum of each band are kept. Thus, the band
+    extrema are always kept and the drawing looks the same as long as
+    there are about as many bins as pixels.
+
+    Parameters
+    ----------
+    xs : array
+         The x coordinates (sorted) of the points.
+    bands : array
+            The bands (nbands x npoints).
+    nbins : int
+            The number of bins.
+    keep : array, optional
+           The indices of points that are always kept (e.g.: high
+           symmetry points).
+
+    Returns
+    -------
+    array : The boolean mask (nbands x npoints) of the points kept.
+    """
+    xs = np.asarray(xs, dtype=float)
+    bands = np.atleast_2d(bands)
+    span = xs[-1] - xs[0]
+    if span > 0:
+        bins = np.minimum(((xs - xs[0]) / span * nbins).astype(int),
+                          nbins - 1)
+    else:
+        bins = np.zeros(len(xs), dtype=int)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bins)) + 1))
+    # index of the bin of each point (bins can be empty)
+    bin_index = np.cumsum(np.isin(np.arange(len(xs)), starts)) - 1
+    minima = np.minimum.reduceat(bands, starts, axis=1)[:, bin_index]
+    maxima = np.maximum.reduceat(bands, starts, axis=1)[:, bin_index]
+    kept = (bands == minima) | (bands == maxima)
+    if keep is not None:
+        kept[:, keep] = True
+    return kept
+
+
+def get_band_edges(structures, fermi_band=None, fermi_energy=None,
+                   kpts=None):
+    """Compute the band edges (VBM and CBM) and the band gaps of many band
+    structures at once.
+
+    Parameters
+    ----------
+    structures : array or list of Bandstructure instances
+                 The eigenvalues as a (nstruct, nkpt, nband) array or as a
+                 (nstruct, nspin, nkpt, nband) array for spin polarized
+                 data. If it is a list of Bandstructure instances (with the
+                 same number of kpts and bands), their eigenvalues, kpts
+                 and fermi_band (or fermi_energy) are used.
+    fermi_band : int or array, optional
+                 The index of the last valence band. Can be given for each
+                 structure (nstruct, ) and each spin (nstruct, nspin).
+    fermi_energy : float or array, optional
+                   If fermi_band is None, the valence states are the ones
+                   below this energy. Can be given for each structure
+                   (nstruct, ) and each spin (nstruct, nspin).
+    kpts : array, optional
+           The kpts coordinates (nkpt, 3) or (nstruct, nkpt, 3). If given,
+           the coordinates of the edges are returned too.
+
+    Returns
+    -------
+    dict : Arrays (nstruct, ) of the 'vbm', 'cbm', 'gap' (cbm - vbm,
+           negative for overlapping bands), 'direct_gap' (smallest gap at
+           the same kpt and spin) and 'is_direct' as well as the kpt
+           indices ('vbm_kpt', 'cbm_kpt', 'direct_gap_kpt') and, for spin
+           polarized data, the spin indices ('vbm_spin', 'cbm_spin',
+           'direct_gap_spin'). If kpts is given, the kpt coordinates
+           ('vbm_coordinates', 'cbm_coordinates',
+           'direct_gap_coordinates') are also returned.
+    """
+    if isinstance(structures, (list, tuple)) and all(
+            isinstance(x, Bandstructure) for x in structures):
+        eigenvalues = np.stack([np.asarray(x.eigenvalues, dtype=float)
+                                for x in structures])
+        if kpts is None:
+            kpts = np.stack([x.kpts for x in structures])
+        if fermi_band is None and fermi_energy is None:
+            if all(x.fermi_band is not None for x in structures):
+                fermi_band = [x.fermi_band for x in structures]
+            elif all(x.fermi_energy is not None for x in structures):
+                fermi_energy = [x.fermi_energy for x in structures]
+    else:
+        eigenvalues = np.asarray(structures, dtype=float)
+    polarized = eigenvalues.ndim == 4
+    if not polarized:
+        eigenvalues = eigenvalues[:, None]
+    nstruct, nspin, nkpt, nband = eigenvalues.shape
+    # valence states mask (nstruct, nspin, nkpt, nband)
+    if fermi_band is not None:
+        valence = (np.arange(nband) <=
+                   _to_per_state_array(fermi_band, polarized))
+    elif fermi_energy is not None:
+        valence = (eigenvalues <=
+                   _to_per_state_array(fermi_energy, polarized))
+    else:
+        raise ValueError("fermi_band or fermi_energy must be given.")
+    valence = np.broadcast_to(valence, eigenvalues.shape)
+    # band edges at each kpt and spin (nstruct, nspin, nkpt)
+    vbm_per_kpt = np.where(valence, eigenvalues, -np.inf).max(axis=3)
+    cbm_per_kpt = np.where(valence, np.inf, eigenvalues).min(axis=3)
+    # edges over all kpts and spins
+    vbm_per_kpt = vbm_per_kpt.reshape(nstruct, nspin * nkpt)
+    cbm_per_kpt = cbm_per_kpt.reshape(nstruct, nspin * nkpt)
+    direct_gaps = cbm_per_kpt - vbm_per_kpt
+    edges = {}
+    for name, values, function in (("vbm", vbm_per_kpt, np.argmax),
+                                   ("cbm", cbm_per_kpt, np.argmin),
+                                   ("direct_gap", direct_gaps, np.argmin)):
+        index = function(values, axis=1)
+        edges[name] = values[np.arange(nstruct), index]
+        spin, edges[name + "_kpt"] = np.divmod(index, nkpt)
+        if polarized:
+            edges[name + "_spin"] = spin
+    edges["gap"] = edges["cbm"] - edges["vbm"]
+    edges["is_direct"] = np.isclose(edges["gap"], edges["direct_gap"])
+    if kpts is not None:
+        kpts = np.broadcast_to(np.asarray(kpts, dtype=float),
+                               (nstruct, nkpt, 3))
+        for name in ("vbm", "cbm", "direct_gap"):
+            edges[name + "_coordinates"] = kpts[np.arange(nstruct),
+                                                edges[name + "_kpt"]]
+    return edges
+
+
+def _to_per_state_array(values, polarized):
+    # reshape a scalar, per structure or per structure and spin value such
+    # that it broadcasts against a (nstruct, nspin, nkpt, nband) array
+    values = np.asarray(values)
+    if values.ndim == 2 and not polarized:
+        raise ValueError("Values per spin given for non polarized data.")
+    return values.reshape(values.shape + (1, ) * (4 - values.ndim))
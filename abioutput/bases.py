@@ -2,10 +2,24 @@ import abc
 import logging
 
 
+# True once the logging system has been configured
+_LOGGING_CONFIGURED = False
+
+
+def configure_logging():
+    """Configure the logging system the first time it is called (instead of
+    once per parser).
+    """
+    global _LOGGING_CONFIGURED
+    if not _LOGGING_CONFIGURED:
+        logging.basicConfig()
+        _LOGGING_CONFIGURED = True
+
+
 class BaseUtility(abc.ABC):
 
     def __init__(self, loglevel=logging.WARNING):
-        logging.basicConfig()
+        configure_logging()
         self._logger = logging.getLogger(self._loggername)
         self._logger.setLevel(loglevel)
 
@@ -0,0 +1,271 @@
+"""Command line interface of abioutput.
+
+    abioutput status [top_directory] ...
+    abioutput parse files ...
+    abioutput convert files ...
+
+Each subcommand imports the modules it needs when it runs.
+"""
+from abioutput.parsers.loader import OUTPUT_KIND, PARSERS, load_file
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import numpy as np
+import os
+import sys
+
+
+def main(argv=None):
+    """Run the command line interface.
+
+    Parameters
+    ----------
+    argv : list, optional
+           The command line arguments. If None, sys.argv is used.
+
+    Returns
+    -------
+    int : The exit code.
+    """
+    args = get_argument_parser().parse_args(argv)
+    try:
+        return args.function(args)
+    except BrokenPipeError:
+        # output piped to a command which stopped reading (e.g.: head)
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+
+
+def get_argument_parser():
+    """Returns the argument parser of the command line interface.
+    """
+    parser = argparse.ArgumentParser(
+            prog="abioutput",
+            description="Read ABINIT calculations and their output files.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    status = subparsers.add_parser(
+            "status", help="Print the status of a tree of calculations.")
+    status.add_argument("top_directory", nargs="?", default=".",
+                        help="The top directory of the calculation tree.")
+    status.add_argument("-a", "--attributes", nargs="+",
+                        default=["status", "convergence_reached"],
+                        help="The attributes to print ('status',"
+                             " 'convergence_reached' or output variables).")
+    status.add_argument("--sortby", help="Sort calculations by this"
+                                         " attribute.")
+    status.add_argument("--delta", nargs="+",
+                        help="Add the difference of these attributes between"
+                             " calculations (needs --sortby).")
+    status.add_argument("--delta-type", default="percent",
+                        choices=("percent", "absolute", "absolute_per_atom"),
+                        help="Type of difference.")
+    status.add_argument("--ignore", nargs="+",
+                        help="Names of the directories to ignore.")
+    status.add_argument("--cache", nargs="?", const=True, default=None,
+                        help="Use the status cache (at the given path or"
+                             " in the user cache directory).")
+    status.add_argument("--full-path", action="store_true",
+                        help="Print full paths of the calculations.")
+    status.add_argument("-o", "--output",
+                        help="Write the attributes to this file ('-' for the"
+                             " standard output) instead of printing a"
+                             " table.")
+    status.add_argument("--format", choices=("csv", "jsonl", "npz"),
+                        help="Format of the output file (by default, given"
+                             " by its extension).")
+    _add_jobs_argument(status, "calculation directories (threads)",
+                       default=None)
+    status.set_defaults(function=run_status)
+
+    parse = subparsers.add_parser(
+            "parse", help="Parse files and print a JSON summary of their"
+                          " data (one line per file).")
+    _add_files_arguments(parse)
+    parse.add_argument("--data", action="store_true",
+                       help="Also print the data arrays.")
+    parse.add_argument("--variables", nargs="+", default=[],
+                       help="Output variables to extract from output files.")
+    _add_jobs_argument(parse, "files (processes)")
+    parse.set_defaults(function=run_parse)
+
+    convert = subparsers.add_parser(
+            "convert", help="Parse files and save their data in a binary"
+                            " file (HDF5 or npz) which can be loaded"
+                            " without parsing.")
+    _add_files_arguments(convert)
+    convert.add_argument("--binary-format", choices=("h5", "npz"),
+                         help="Binary format (HDF5 if h5py is installed by"
+                              " default).")
+    convert.add_argument("-d", "--directory",
+                         help="Directory where to write the binary files"
+                              " (by default, next to the parsed files).")
+    convert.add_argument("--json", action="store_true",
+                         help="Print a JSON object per file instead of the"
+                              " path of the binary file.")
+    _add_jobs_argument(convert, "files (processes)")
+    convert.set_defaults(function=run_convert)
+    return parser
+
+
+def _add_files_arguments(parser):
+    parser.add_argument("files", nargs="+", help="The files to read.")
+    parser.add_argument("-t", "--type", choices=list(PARSERS) + [OUTPUT_KIND],
+                        help="The kind of files (by default, given by the"
+                             " file names).")
+
+
+def _add_jobs_argument(parser, what, default=1):
+    parser.add_argument("-j", "--jobs", type=int, default=default,
+                        help=f"Number of {what} handled in parallel.")
+
+
+def run_status(args):
+    from abioutput.utils.builders import TreeBuilder
+    options = {}
+    if args.jobs is not None:
+        # otherwise, the TreeBuilder default number of threads
+        options["max_workers"] = args.jobs
+    builder = TreeBuilder(args.top_directory, ignore=args.ignore,
+                          cache=args.cache, **options)
+    kwargs = {"shortpath": not args.full_path, "delta": args.delta,
+              "sortby": args.sortby, "delta_type": args.delta_type}
+    if args.output is not None:
+        builder.export_attributes(args.output, *args.attributes,
+                                  format=args.format, **kwargs)
+    else:
+        builder.print_attributes(*args.attributes, **kwargs)
+    return 0
+
+
+def run_parse(args):
+    jobs = [(path, args.type, args.data, args.variables)
+            for path in args.files]
+    return _run_jobs(parse_file, jobs, args.jobs)
+
+
+def run_convert(args):
+    extension = None
+    if args.binary_format is not None:
+        extension = "." + args.binary_format
+    jobs = [(path, args.type, extension, args.directory, args.json)
+            for path in args.files]
+    return _run_jobs(convert_file, jobs, args.jobs)
+
+
+def _run_jobs(function, jobs, max_workers):
+    # run jobs (in processes if max_workers > 1) and print their result as
+    # they come (in order). Errors are printed and do not stop the others.
+    exit_code = 0
+    if max_workers == 1:
+        results = (_run_job(function, job) for job in jobs)
+        exit_code = _print_results(results)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(_run_job, [function] * len(jobs), jobs)
+            exit_code = _print_results(results)
+    return exit_code
+
+
+def _run_job(function, job):
+    try:
+        return function(*job), None
+    except Exception as e:
+        return None, f"{job[0]}: {type(e).__name__}: {e}"
+
+
+def _print_results(results):
+    exit_code = 0
+    for result, error in results:
+        if error is not None:
+            print(error, file=sys.stderr)
+            exit_code = 1
+            continue
+        print(result, flush=True)
+    return exit_code
+
+
+def parse_file(path, kind=None, data=False, variables=()):
+    """Parse a file and returns a JSON summary of its data.
+
+    Parameters
+    ----------
+    path : str
+           The path of the file.
+    kind : str, optional
+           The kind of file (see load_file).
+    data : bool, optional
+           If True, the data arrays are given too.
+    variables : list, optional
+                The output variables to give (for output files).
+    """
+    # only the variables of output files are given
+    parser = load_file(path, kind=kind, sections=("outvars", ))
+    if not hasattr(parser, "describe"):
+        # output file
+        summary = {"kind": OUTPUT_KIND, "variables": {}}
+        for variable in variables:
+            value = parser.extract_output_variable(variable)
+            summary["variables"][variable] = _to_json(value)
+    else:
+        summary = parser.describe()
+        if data:
+            arrays = parser._to_binary()[0]
+            summary["data"] = {name: _to_json(array)
+                               for name, array in arrays.items()}
+    summary["path"] = path
+    return json.dumps(summary)
+
+
+def convert_file(path, kind=None, extension=None, directory=None,
+                 as_json=False):
+    """Parse a file and save its data to a binary file.
+
+    Parameters
+    ----------
+    path : str
+           The path of the file.
+    kind : str, optional
+           The kind of file (see load_file).
+    extension : str, optional
+                The binary file extension ('.h5' or '.npz'). If None, the
+                default binary format is used.
+    directory : str, optional
+                Where to write the binary file. If None, it is written next
+                to the parsed file.
+    as_json : bool, optional
+              If True, a JSON object is returned instead of the path of
+              the binary file.
+    """
+    from abioutput.parsers.binary import default_binary_extension
+    if extension is None:
+        extension = default_binary_extension()
+    if directory is None:
+        directory = os.path.dirname(path)
+    parser = load_file(path, kind=kind)
+    if not hasattr(parser, "save"):
+        raise TypeError("Output files cannot be converted.")
+    binary_path = os.path.join(directory, os.path.basename(path) + extension)
+    parser.save(binary_path)
+    if as_json:
+        return json.dumps({"path": path, "binary_path": binary_path,
+                           "kind": parser.describe()["kind"]})
+    return binary_path
+
+
+def _to_json(value):
+    # convert data to something JSON serializable (complex numbers are
+    # given as (real, imaginary) pairs)
+    if isinstance(value, (list, tuple)):
+        return [_to_json(x) for x in value]
+    if isinstance(value, dict):
+        return {key: _to_json(x) for key, x in value.items()}
+    value = np.asarray(value)
+    if np.iscomplexobj(value):
+        value = np.stack((value.real, value.imag), axis=-1)
+    return value.tolist()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
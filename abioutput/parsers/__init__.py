@@ -5,3 +5,4 @@ from .self_energy_parser import SelfEnergyParser, plot_self_energy
 from .output_subparsers import EIGParser
 from .filesfile_parser import FilesFileParser
 from .fatband_parser import FatbandParser
+from .eig_store import EigenvalueStore
@@ -18,3 +18,7 @@ class BaseParserPathChecker(BaseUtility):
 class DataFileParser(BaseParserPathChecker):
     def __getitem__(self, key):
         return self.data[key]
+
+    def _init_from_binary(self, path):
+        BaseUtility.__init__(self)
+        self.filepath = path
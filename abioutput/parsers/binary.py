@@ -0,0 +1,208 @@
+import json
+import numpy as np
+import os
+try:
+    import h5py
+except ImportError:
+    # HDF5 is optional: .npz files are used instead
+    h5py = None
+
+
+BINARY_FORMATS = {".h5": "hdf5", ".hdf5": "hdf5", ".npz": "npz"}
+# reserved names used to store the metadata
+KIND_KEY = "__kind__"
+ATTRIBUTES_KEY = "__attributes__"
+DIMENSIONS_KEY = "__dimensions__"
+# message of the errors raised when h5py is needed but not installed
+H5PY_MISSING = ("h5py is needed to use HDF5 files: install it with"
+                " 'pip install abioutput[hdf5]' (or 'pip install h5py').")
+
+
+def default_binary_extension():
+    """Returns the extension of the default binary format: '.h5' if h5py is
+    installed, '.npz' otherwise.
+    """
+    if h5py is not None:
+        return ".h5"
+    return ".npz"
+
+
+def get_binary_format(path):
+    """Returns the binary format ('hdf5' or 'npz') of a file from its
+    extension.
+
+    Parameters
+    ----------
+    path : str
+           The path of the binary file.
+    """
+    extension = os.path.splitext(path)[1]
+    if extension not in BINARY_FORMATS:
+        raise ValueError(f"Invalid binary file extension: '{extension}'."
+                         f" Valid ones are: {list(BINARY_FORMATS)}.")
+    binary_format = BINARY_FORMATS[extension]
+    if binary_format == "hdf5" and h5py is None:
+        raise ImportError(H5PY_MISSING)
+    return binary_format
+
+
+def save_binary(path, kind, arrays, attributes=None, dimensions=None):
+    """Write arrays and their metadata to a binary file (HDF5 or npz
+    depending on the file extension).
+
+    Parameters
+    ----------
+    path : str
+           The path of the file to write.
+    kind : str
+           What is stored (e.g.: 'eig'). It is checked when loading.
+    arrays : dict
+             The arrays to store (name: array).
+    attributes : dict, optional
+                 Other metadata (must be JSON serializable).
+    dimensions : dict, optional
+                 The name of the dimensions of each array (name: list).
+    """
+    binary_format = get_binary_format(path)
+    attributes = json.dumps(attributes or {})
+    dimensions = json.dumps(dimensions or {})
+    arrays = {name: np.asarray(array) for name, array in arrays.items()}
+    if binary_format == "hdf5":
+        with h5py.File(path, "w") as f:
+            f.attrs[KIND_KEY] = kind
+            f.attrs[ATTRIBUTES_KEY] = attributes
+            f.attrs[DIMENSIONS_KEY] = dimensions
+            for name, array in arrays.items():
+                f.create_dataset(name, data=array)
+        return
+    np.savez(path, **{KIND_KEY: np.array(kind),
+                      ATTRIBUTES_KEY: np.array(attributes),
+                      DIMENSIONS_KEY: np.array(dimensions)}, **arrays)
+
+
+class BinaryContainer:
+    """Content of a binary file written by save_binary.
+
+    For HDF5 files read lazily, the arrays are h5py datasets: they can be
+    sliced without reading the whole array and the file stays open until
+    the close method is called. Otherwise, the arrays are read in memory.
+    """
+    def __init__(self, path, lazy=True):
+        """BinaryContainer init method.
+
+        Parameters
+        ----------
+        path : str
+               The path of the binary file.
+        lazy : bool, optional
+               If True, HDF5 arrays are only read when sliced.
+        """
+        self.path = path
+        self._file = None
+        if get_binary_format(path) == "hdf5":
+            f = h5py.File(path, "r")
+            metadata = {key: f.attrs[key] for key in
+                        (KIND_KEY, ATTRIBUTES_KEY, DIMENSIONS_KEY)}
+            self.arrays = {}
+            f.visititems(self._add_dataset)
+            if lazy:
+                self._file = f
+            else:
+                self.arrays = {name: dataset[()] for name, dataset in
+                               self.arrays.items()}
+                f.close()
+        else:
+            with np.load(path) as f:
+                self.arrays = {name: f[name] for name in f.files}
+            metadata = {key: self.arrays.pop(key).item() for key in
+                        (KIND_KEY, ATTRIBUTES_KEY, DIMENSIONS_KEY)}
+        self.kind = str(metadata[KIND_KEY])
+        self.attributes = json.loads(metadata[ATTRIBUTES_KEY])
+        self.dimensions = json.loads(metadata[DIMENSIONS_KEY])
+
+    def _add_dataset(self, name, item):
+        if isinstance(item, h5py.Dataset):
+            self.arrays[name] = item
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class BinaryMixin:
+    """Mixin class giving save and load methods to a parser.
+
+    Subclasses define the kind of data they store and how their data is
+    converted to arrays and attributes (and back).
+    """
+    _binary_kind = None
+
+    def save(self, path):
+        """Save the parsed data to a binary file (HDF5 or npz depending on
+        the extension). It can be read again without parsing with the
+        load classmethod.
+
+        Parameters
+        ----------
+        path : str
+               The path of the file to write (.h5, .hdf5 or .npz).
+        """
+        arrays, attributes, dimensions = self._to_binary()
+        save_binary(path, self._binary_kind, arrays, attributes=attributes,
+                    dimensions=dimensions)
+
+    @classmethod
+    def load(cls, path, lazy=True):
+        """Create the parser from a binary file written by the save method.
+        Nothing is parsed.
+
+        Parameters
+        ----------
+        path : str
+               The path of the binary file.
+        lazy : bool, optional
+               If True and the file is an HDF5 file, arrays are only read
+               when sliced (the file stays open).
+        """
+        return cls._from_container(BinaryContainer(path, lazy=lazy))
+
+    @classmethod
+    def _from_container(cls, container):
+        if container.kind != cls._binary_kind:
+            container.close()
+            raise TypeError(f"{container.path} contains '{container.kind}'"
+                            f" data, not '{cls._binary_kind}'.")
+        parser = cls.__new__(cls)
+        parser._binary_container = container
+        parser._init_from_binary(container.path)
+        parser._from_binary(container.arrays, container.attributes)
+        return parser
+
+    def describe(self):
+        """Returns a summary of the parsed data: the kind of data, the
+        shape, type and dimension names of each array and the other
+        attributes.
+        """
+        arrays, attributes, dimensions = self._to_binary()
+        description = {}
+        for name, array in arrays.items():
+            # lazy HDF5 datasets are not read
+            if not hasattr(array, "dtype"):
+                array = np.asarray(array)
+            description[name] = {"shape": list(array.shape),
+                                 "dtype": str(array.dtype),
+                                 "dimensions": dimensions.get(name)}
+        return {"kind": self._binary_kind, "arrays": description,
+                "attributes": attributes}
+
+    def _init_from_binary(self, path):
+        # replaces the init method when loading from a binary file
+        pass
+
+    def _to_binary(self):
+        # returns the arrays, attributes and dimensions to save
+        return {"data": self.data}, {}, {}
+
+    def _from_binary(self, arrays, attributes):
+        self.data = arrays["data"]
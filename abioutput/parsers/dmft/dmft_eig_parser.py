@@ -1,12 +1,18 @@
+import array
 import numpy as np
 from ..bases import DataFileParser
+from ..binary import BinaryMixin
 from ..utils._common_routines import decompose_line
+from ...profiling import phase
 
 
-class DMFTEigParser(DataFileParser):
+class DMFTEigParser(DataFileParser, BinaryMixin):
     """Class that reads a .eig file produced by the DMFT module of Abinit.
     """
     _loggername = "DMFT_eig_parser"
+    _binary_kind = "dmft_eig"
+    _binary_attributes = ("nkpt", "nbandtot", "nspins", "dmftbandi",
+                          "dmftbandf", "nband")
 
     def __init__(self, *args, **kwargs):
         """The .eig file parser init method.
@@ -21,10 +27,21 @@ class DMFTEigParser(DataFileParser):
         super().__init__(*args, **kwargs)
         self.data = self._read_data_from_file(self.filepath)
 
+    def _to_binary(self):
+        dimensions = ["nkpt", "nband"]
+        if self.data.ndim == 3:
+            dimensions.insert(0, "nspins")
+        attributes = {name: int(getattr(self, name))
+                      for name in self._binary_attributes}
+        return {"data": self.data}, attributes, {"data": dimensions}
+
+    def _from_binary(self, arrays, attributes):
+        super()._from_binary(arrays, attributes)
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
     def _read_data_from_file(self, path):
-        self._logger.info("Extracting eigenvalues from %s" % path)
-        with open(path, 'r') as f:
-            lines = f.readlines()
+        self._logger.info(f"Extracting eigenvalues from {path}")
         # DATA ORGANIZED AS FOLLOWS:
         # META DATA HEADER ...
         # For spin
@@ -40,94 +57,64 @@ class DMFTEigParser(DataFileParser):
         # 1         2    value
         # ...
 
-        # First strip header
-        body, header = self._strip_header(lines)
+        # the file is read line by line and the eigenvalues are stored in a
+        # flat array of floats (see FatbandParser). The number of kpts of
+        # each spin and of eigenvalues of each kpt are checked at the end.
+        header = []
+        in_header = True
+        values = array.array("d")
+        nkpts = []  # number of kpts of each spin
+        nvalues = array.array("l")  # number of eigenvalues of each kpt
+        nlines = 0
+        with phase(self, "tokenize", path=path) as tokenize:
+            with open(path) as f:
+                for nlines, line in enumerate(f, start=1):
+                    if in_header:
+                        header.append(line)
+                        in_header = "For each k-point" not in line
+                        continue
+                    if "For spin" in line:
+                        nkpts.append(0)
+                    elif "For k-point" in line:
+                        if not nkpts:
+                            raise ValueError("Found a k-point outside of"
+                                             " a spin block.")
+                        nkpts[-1] += 1
+                        nvalues.append(0)
+                    elif nvalues:
+                        s, i, floats = decompose_line(line)
+                        if floats:
+                            # divide eigenvalue by 2 here because for some
+                            # reason, it is multiplied by 2 in the ABINIT
+                            # code.
+                            values.append(floats[0] / 2)
+                            nvalues[-1] += 1
+            tokenize.lines = nlines
+        if in_header:
+            raise LookupError("Could not strip header from .eig file...")
         # extract meta data from header
         self._extract_meta_data(header)
-        # extract data for each spin, kpt and considered band
-        return np.array(self._extract_data(body))
-
-    def _extract_data(self, body):
-        self._logger.debug("Starting data extraction.")
-        # extract eigenvalues data
-        data = []
-        end = 0
-        for i, line in enumerate(body):
-            if i < end:
-                # skip lines until end of spin clock
-                continue
-            if "For spin" in line:
-                data_per_spin, rel_end = self._extract_data_per_spin(body[i:])
-                # check that number of kpts matches header
-                if len(data_per_spin) != self.nkpt:
-                    raise ValueError("Was expecting %i kpts but found %i" %
-                                     (self.nkpt, len(data_per_spin)))
-                assert len(data_per_spin) == self.nkpt
-                data.append(data_per_spin)
-                end += rel_end
-        # check that number of spins matches header
-        assert len(data) == self.nspins
-        if len(data) == 1:
-            # only one spin; return first block directly
-            return data[0]
-        return data
-
-    def _extract_data_per_spin(self, lines):
-        self._logger.debug("Starting data extraction for one spin.")
-        # extract eigenvalues for a spin block
-        data = []
-        end = 0
-        block_end = False
-        for i, line in enumerate(lines):
-            if i < end:
-                continue
-            if "For spin" in line:
-                if not block_end:
-                    continue
-                # arrived at end of file or spin block
-                return data, i
-            if "For k-point" in line:
-                data_per_kpt, rel_end = self._extract_data_per_kpt(lines[i:])
-                # check that number of eigenvalues matches number of bands
-                if len(data_per_kpt) != self.nband:
-                    raise ValueError("Was expecting %i bands but found %i" %
-                                     (self.nband, len(data_per_kpt)))
-                block_end = True
-                data.append(data_per_kpt)
-                end += rel_end
-        # arrived at the end of the file / block, return what we got
-        # SHOW ME WHAT U GOT !!
-        return data, len(lines) - 1
-
-    def _extract_data_per_kpt(self, lines):
-        self._logger.debug("Starting data extraction for one kpt.")
-        # extract eigenvalues for a kpt block
-        eigenvalues = []
-        block_end = False
-        for index, line in enumerate(lines):
-            s, i, f = decompose_line(line)
-            if len(f) == 0:
-                if not block_end:
-                    # no data here skip
-                    continue
-                if block_end:
-                    # arrived at next block, return eigenvalues
-                    return eigenvalues, index
-            block_end = True
-            # divide eigenvalue by 2 here because for some reason,
-            # it is multiplied by 2 in the ABINIT code.
-            eigenvalues.append(f[0] / 2)
-        # arrived at the end of the block return what we have
-        return eigenvalues, len(lines) - 1
+        self._check_sizes(nkpts, nvalues)
+        with phase(self, "reshape"):
+            shape = (self.nspins, self.nkpt, self.nband)
+            if self.nspins == 1:
+                # only one spin
+                shape = shape[1:]
+            return np.frombuffer(values).reshape(shape)
 
-    def _strip_header(self, lines):
-        self._logger.debug("Stripping header.")
-        for i, line in enumerate(lines):
-            if "For each k-point" in line:
-                # skip next line also
-                return lines[i + 1:], lines[:i + 1]
-        # if here, could not strip header
-        raise LookupError("Could not strip header from .eig file...")
+    def _check_sizes(self, nkpts, nvalues):
+        # check that the numbers of spins, kpts and bands match the header
+        if len(nkpts) != self.nspins:
+            raise ValueError("Was expecting %i spins but found %i" %
+                             (self.nspins, len(nkpts)))
+        for nkpt in nkpts:
+            if nkpt != self.nkpt:
+                raise ValueError("Was expecting %i kpts but found %i" %
+                                 (self.nkpt, nkpt))
+        for nband in nvalues:
+            if nband != self.nband:
+                raise ValueError("Was expecting %i bands but found %i" %
+                                 (self.nband, nband))
 
     def _extract_meta_data(self, header):
         # extract number of kpts and hamiltonian dimensions from the first
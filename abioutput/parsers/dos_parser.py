@@ -1,21 +1,39 @@
+from .binary import BinaryMixin
+from ..profiling import phase
 import numpy as np
 
 
-class DOSParser:
+class DOSParser(BinaryMixin):
+    _binary_kind = "dos"
+
     def __init__(self, path):
         self.data, self.titles = self._get_data_from_file(path)
 
+    def _to_binary(self):
+        return ({"data": self.data}, {"titles": self.titles},
+                {"data": ["nenergy", "ncolumn"]})
+
+    def _from_binary(self, arrays, attributes):
+        super()._from_binary(arrays, attributes)
+        self.titles = attributes["titles"]
+
     def _get_data_from_file(self, path):
         # this is a numpy array with the data.
-        data = np.loadtxt(path)
+        with phase(self, "tokenize", path=path) as tokenize:
+            data = np.loadtxt(path)
+            tokenize.lines = len(data)
         # we now need the columns title
         titles = self._get_titles(path)
         return data, titles
 
     def _get_titles(self, path):
+        # only the header is read (the comment lines before the data)
+        lines = []
         with open(path) as f:
-            lines = f.readlines()
-
+            for line in f:
+                lines.append(line)
+                if not line.startswith("#"):
+                    break
         for i, line in enumerate(lines):
             if not line.startswith("#"):
                 titleindex = i - 1
@@ -0,0 +1,295 @@
+from .binary import (ATTRIBUTES_KEY, DIMENSIONS_KEY, H5PY_MISSING,
+                     KIND_KEY, BinaryContainer, h5py)
+from .output_subparsers.eig_parser import EIG_ARRAYS, EIG_DTYPE
+import json
+import numpy as np
+
+
+CHUNK_NKPT = 4096  # kpts per chunk of the stores
+DOS_NENERGY = 1000  # energies of the DOS computed from a store
+DOS_SMEARING_WIDTH = 5  # the gaussians are cut at this many smearings
+
+
+class EigenvalueStore:
+    """Eigenvalues stored on disk in a HDF5 file chunked along the kpts
+    (e.g.: written by EIGParser.to_store for k-meshes too dense to hold the
+    eigenvalues in memory).
+
+    The file has the same layout as the files written by EIGParser.save
+    (EIGParser.load can read it too). The arrays are h5py datasets: slicing
+    them only reads the slice from the file. The reductions (band extrema,
+    histogram, DOS) read one chunk of kpts at a time.
+    """
+    def __init__(self, path, spin=None):
+        """EigenvalueStore init method.
+
+        Parameters
+        ----------
+        path : str
+               The path of the HDF5 file.
+        spin : str, optional
+               The spin ('up' or 'down') to read for spin polarized data.
+        """
+        self._container = BinaryContainer(path, lazy=True)
+        if self._container.kind != "eig":
+            self.close()
+            raise TypeError(f"{path} contains '{self._container.kind}' data,"
+                            f" not eigenvalues.")
+        attributes = self._container.attributes
+        self.spins = attributes.get("spins", [])
+        if self.spins and spin not in self.spins:
+            self.close()
+            raise ValueError(f"Spin polarized data: spin must be one of"
+                             f" {self.spins}.")
+        prefix = f"{spin}/" if self.spins else ""
+        arrays = self._container.arrays
+        self.path = path
+        self.spin = spin
+        self.units = attributes[prefix + "units"]
+        self.eigenvalues = arrays[prefix + "eigenvalues"]
+        self.coordinates = arrays[prefix + "coordinates"]
+        self.occupations = arrays.get(prefix + "occupations")
+        self.nkpt, self.nband = self.eigenvalues.shape
+        self.chunk_nkpt = CHUNK_NKPT
+        if getattr(self.eigenvalues, "chunks", None):
+            self.chunk_nkpt = self.eigenvalues.chunks[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._container.close()
+
+    def iter_chunks(self, name="eigenvalues"):
+        """Yields the (start, array) pairs of each chunk of kpts of an array
+        ('eigenvalues', 'coordinates' or 'occupations').
+        """
+        array = getattr(self, name)
+        for start in range(0, self.nkpt, self.chunk_nkpt):
+            yield start, array[start:start + self.chunk_nkpt]
+
+    def band_extrema(self):
+        """Returns the minimum and the maximum of each band (two arrays of
+        nband values).
+        """
+        minima = np.full(self.nband, np.inf)
+        maxima = np.full(self.nband, -np.inf)
+        for start, chunk in self.iter_chunks():
+            np.minimum(minima, chunk.min(axis=0), out=minima)
+            np.maximum(maxima, chunk.max(axis=0), out=maxima)
+        return minima, maxima
+
+    def band_edges(self, fermi_band):
+        """Returns the 'vbm', 'cbm' and 'gap' (cbm - vbm) given the index of
+        the last valence band.
+        """
+        minima, maxima = self.band_extrema()
+        vbm, cbm = maxima[fermi_band], minima[fermi_band + 1]
+        return {"vbm": vbm, "cbm": cbm, "gap": cbm - vbm}
+
+    def histogram(self, bins=100, range=None):
+        """Histogram of all the eigenvalues (see numpy.histogram).
+
+        Parameters
+        ----------
+        bins : int, optional
+               The number of bins.
+        range : tuple, optional
+                The (min, max) energies. If None, it is the range of the
+                eigenvalues.
+
+        Returns
+        -------
+        counts : The number of eigenvalues in each bin.
+        edges : The bin edges (bins + 1 values).
+        """
+        if range is None:
+            minima, maxima = self.band_extrema()
+            range = (minima.min(), maxima.max())
+        edges = np.histogram_bin_edges([], bins=bins, range=range)
+        counts = np.zeros(bins, dtype=int)
+        for start, chunk in self.iter_chunks():
+            counts += np.histogram(chunk, bins=edges)[0]
+        return counts, edges
+
+    def dos(self, smearing, nenergy=DOS_NENERGY, range=None):
+        """Density of states with a gaussian smearing (computed from a fine
+        histogram of the eigenvalues). It is normalized per kpt: its
+        integral is the number of bands.
+
+        Parameters
+        ----------
+        smearing : float
+                   The standard deviation of the gaussians (same units as
+                   the eigenvalues).
+        nenergy : int, optional
+                  The number of energies.
+        range : tuple, optional
+                The (min, max) energies. If None, it is the range of the
+                eigenvalues extended by a few smearings.
+
+        Returns
+        -------
+        energies : The energies (nenergy values).
+        dos : The density of states at these energies.
+        """
+        if range is None:
+            minima, maxima = self.band_extrema()
+            margin = DOS_SMEARING_WIDTH * smearing
+            range = (minima.min() - margin, maxima.max() + margin)
+        counts, edges = self.histogram(bins=nenergy, range=range)
+        step = edges[1] - edges[0]
+        energies = (edges[:-1] + edges[1:]) / 2
+        half_width = int(np.ceil(DOS_SMEARING_WIDTH * smearing / step))
+        x = np.arange(-half_width, half_width + 1) * step
+        kernel = np.exp(-x ** 2 / (2 * smearing ** 2))
+        kernel /= kernel.sum()
+        dos = np.convolve(counts, kernel)[half_width:half_width + nenergy]
+        return energies, dos / (step * self.nkpt)
+
+
+class EigenvalueStoreWriter:
+    """Write kpts one by one in a chunked HDF5 eigenvalue store (see
+    EigenvalueStore). Only one chunk of kpts is kept in memory.
+    """
+    def __init__(self, path, dtype=EIG_DTYPE, chunk_nkpt=CHUNK_NKPT):
+        """EigenvalueStoreWriter init method.
+
+        Parameters
+        ----------
+        path : str
+               The path of the HDF5 file to write.
+        dtype : numpy dtype, optional
+                The storage type of the eigenvalues and occupations.
+        chunk_nkpt : int, optional
+                     The number of kpts per chunk.
+        """
+        if h5py is None:
+            raise ImportError(H5PY_MISSING)
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.chunk_nkpt = chunk_nkpt
+        self._file = h5py.File(path, "w")
+        self._file.attrs[KIND_KEY] = "eig"
+        self._attributes = {}
+        self._dimensions = {}
+        self._prefix = None
+        self._buffers = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def start_spin(self, units, nkpt=0, spin=None):
+        """Start a new set of eigenvalues (the data of one spin).
+
+        Parameters
+        ----------
+        units : str
+                The eigenvalues units.
+        nkpt : int, optional
+               The expected number of kpts (the arrays grow if there are
+               more and are shrunk at the end if there are less).
+        spin : str, optional
+               The spin ('up' or 'down') for spin polarized data.
+        """
+        self._finish_spin()
+        if spin is not None:
+            self._attributes.setdefault("spins", []).append(spin)
+            self._prefix = f"{spin}/"
+        else:
+            self._prefix = ""
+        self._attributes[self._prefix + "units"] = units
+        self._nkpt_hint = nkpt
+        self._nkpt = 0
+        self._buffers = None
+
+    def add_kpt(self, coordinates, eigenvalues, occupations=()):
+        """Add the data of the next kpt.
+
+        Parameters
+        ----------
+        coordinates : list
+                      The kpt reduced coordinates.
+        eigenvalues : list
+                      The eigenvalues at this kpt.
+        occupations : list, optional
+                      The occupation numbers at this kpt (if given).
+        """
+        if self._prefix is None:
+            raise ValueError("start_spin must be called before adding kpts.")
+        if self._buffers is None:
+            self._create_buffers(len(eigenvalues), bool(len(occupations)))
+        nband = self._buffers["eigenvalues"].shape[1]
+        if len(eigenvalues) != nband:
+            raise ValueError(f"Was expecting {nband} eigenvalues, got"
+                             f" {len(eigenvalues)}: the number of bands must"
+                             f" be the same at each kpt.")
+        index = self._nbuffered
+        for name, values in (("coordinates", coordinates),
+                             ("eigenvalues", eigenvalues),
+                             ("occupations", occupations)):
+            if name in self._buffers:
+                self._buffers[name][index] = values
+        self._nbuffered += 1
+        if self._nbuffered == self.chunk_nkpt:
+            self._flush()
+
+    def close(self):
+        if self._file is None:
+            return
+        self._finish_spin()
+        self._file.attrs[ATTRIBUTES_KEY] = json.dumps(self._attributes)
+        self._file.attrs[DIMENSIONS_KEY] = json.dumps(self._dimensions)
+        self._file.close()
+        self._file = None
+
+    def _create_buffers(self, nband, with_occupations):
+        # create the datasets of the current spin and the chunk buffers
+        names = ["coordinates", "eigenvalues"]
+        if with_occupations:
+            names.append("occupations")
+        self._buffers = {}
+        for name in names:
+            ncolumn = 3 if name == "coordinates" else nband
+            dtype = float if name == "coordinates" else self.dtype
+            # the chunks are not larger than the expected number of kpts
+            # (if it is given)
+            chunk_nkpt = self.chunk_nkpt
+            if self._nkpt_hint:
+                chunk_nkpt = min(chunk_nkpt, self._nkpt_hint)
+            self._file.create_dataset(self._prefix + name,
+                                      shape=(self._nkpt_hint, ncolumn),
+                                      maxshape=(None, ncolumn),
+                                      chunks=(chunk_nkpt, ncolumn),
+                                      dtype=dtype)
+            self._dimensions[self._prefix + name] = EIG_ARRAYS[name]
+            self._buffers[name] = np.empty((self.chunk_nkpt, ncolumn),
+                                           dtype=dtype)
+        self._nbuffered = 0
+
+    def _flush(self):
+        # write the buffered kpts
+        start, stop = self._nkpt, self._nkpt + self._nbuffered
+        for name, buffer in self._buffers.items():
+            dataset = self._file[self._prefix + name]
+            if dataset.shape[0] < stop:
+                dataset.resize(stop, axis=0)
+            dataset[start:stop] = buffer[:self._nbuffered]
+        self._nkpt = stop
+        self._nbuffered = 0
+
+    def _finish_spin(self):
+        # write the last kpts of the current spin and shrink its datasets
+        # to the number of kpts written
+        if self._buffers is None:
+            return
+        self._flush()
+        for name in self._buffers:
+            self._file[self._prefix + name].resize(self._nkpt, axis=0)
+        self._buffers = None
@@ -1,10 +1,14 @@
 from .bases import DataFileParser
+from .binary import BinaryMixin
 from .utils._common_routines import decompose_line
+from ..profiling import phase
+import array
 import numpy as np
 
 
-class FatbandParser(DataFileParser):
+class FatbandParser(DataFileParser, BinaryMixin):
     _loggername = "FatbandParser"
+    _binary_kind = "fatband"
 
     def __init__(self, *args, **kwargs):
         """Parser that reads a FATBAND file.
@@ -21,43 +25,54 @@ class FatbandParser(DataFileParser):
         self.nkpt = self.data.shape[1]
         self.nband = self.data.shape[0]
         self._logger.info("Data extracted.")
-        self._logger.debug("Fatbands calculation: %i bands and %i kpts" %
-                           (self.nband, self.nkpt))
+        self._logger.debug(f"Fatbands calculation: {self.nband} bands and"
+                           f" {self.nkpt} kpts")
+
+    def _to_binary(self):
+        return ({"data": self.data}, {},
+                {"data": ["nband", "nkpt", "eigenvalue_character"]})
+
+    def _from_binary(self, arrays, attributes):
+        super()._from_binary(arrays, attributes)
+        self.nband, self.nkpt = self.data.shape[:2]
 
     def _extract_data(self, path):
         self._logger.info("Starting to extract data.")
-        with open(path) as f:
-            lines = f.readlines()
-
-        data = []
-        end = 0
-        for i, line in enumerate(lines):
-            if i < end:
-                continue
-            if line.startswith("# BAND"):
-                band, skip = self._extract_data_band_block(lines[i:])
-                data.append(band)
-                end += skip
+        # the file is read line by line and the values are stored in a flat
+        # array of floats such that the memory used stays close to the size
+        # of the final array.
+        values = array.array("d")
+        nkpts = array.array("l")  # number of kpts of each band
+        in_block = False
+        with phase(self, "tokenize", path=path) as tokenize:
+            with open(path) as f:
+                for nlines, line in enumerate(f, start=1):
+                    if line.startswith("# BAND"):
+                        nkpts.append(0)
+                        in_block = True
+                        continue
+                    if line.startswith("&") or not len(line.rstrip("\n")):
+                        in_block = False
+                    if in_block:
+                        values.extend(self._extract_data_line(line))
+                        nkpts[-1] += 1
+            tokenize.lines = nlines
         # data should be nband x nkpt x 2
         # where the last axis is the eigenvalue followed by the character
-        return np.array(data)
-
-    def _extract_data_band_block(self, lines):
-        self._logger.debug("Extracting data from one band block.")
-        block_end = False
-        data = []
-        for i, line in enumerate(lines):
-            if line.startswith("# BAND") or (line.startswith("&") or not
-                                             len(line.rstrip("\n"))):
-                if not block_end:
-                    block_end = True
-                    continue
-                else:
-                    return data, i
-            s, i, f = decompose_line(line)
-            if len(f) != 2 or len(i) != 1:  # should be 2 numbers + kpt index
-                self._logger.error("Error while extracting data from: '%s'" %
-                                   line)
-                raise LookupError("Error while reading fatband file.")
-            data.append(f)
-        return data, len(lines) - 1
+        with phase(self, "reshape"):
+            if not nkpts:
+                raise LookupError("Error while reading fatband file: no"
+                                  " band found.")
+            if min(nkpts) != max(nkpts):
+                raise LookupError("Error while reading fatband file: all"
+                                  " bands must have the same number of"
+                                  " kpts.")
+            return np.frombuffer(values).reshape((len(nkpts), nkpts[0], 2))
+
+    def _extract_data_line(self, line):
+        s, i, f = decompose_line(line)
+        if len(f) != 2 or len(i) != 1:  # should be 2 numbers + kpt index
+            self._logger.error(f"Error while extracting data from:"
+                               f" '{line}'")
+            raise LookupError("Error while reading fatband file.")
+        return f
@@ -0,0 +1,85 @@
+"""Find the kind of a data file and parse it with the right parser.
+Parser modules are only imported when a file of their kind is read.
+"""
+import importlib
+import os
+
+
+# parser class of each kind of data file (module, class name)
+PARSERS = {"eig": ("abioutput.parsers.output_subparsers", "EIGParser"),
+           "fatband": ("abioutput.parsers.fatband_parser", "FatbandParser"),
+           "dos": ("abioutput.parsers.dos_parser", "DOSParser"),
+           "dmft_eig": ("abioutput.parsers.dmft", "DMFTEigParser"),
+           "dmft_projectors": ("abioutput.parsers.dmft",
+                               "DMFTProjectorsParser"),
+           "self_energy": ("abioutput.parsers.self_energy_parser",
+                           "SelfEnergyParser")}
+OUTPUT_KIND = "output"
+# the DMFT self energy files of ABINIT (e.g.: ..._Self-omega_iatom0001_isppol1)
+SELF_ENERGY_NAMES = ("Self-omega", "Self_ra-omega")
+# kinds of files which cannot be told from their name
+UNDETECTED_KINDS = ("dmft_projectors", )
+
+
+def get_file_kind(path):
+    """Returns the kind of a data file from its name (see PARSERS). The kind
+    of DMFT projectors files cannot be told (see UNDETECTED_KINDS).
+
+    Parameters
+    ----------
+    path : str
+           The path of the file.
+    """
+    name = os.path.basename(path)
+    if any(x in name for x in SELF_ENERGY_NAMES):
+        return "self_energy"
+    if name.endswith("_EIG"):
+        return "eig"
+    if "_FATBAND" in name:
+        return "fatband"
+    if "_DOS" in name:
+        return "dos"
+    if name.endswith(".eig"):
+        return "dmft_eig"
+    if ".out" in name:
+        return OUTPUT_KIND
+    raise ValueError(f"Cannot tell the kind of {path} from its name: give"
+                     f" the kind of file (always needed for"
+                     f" {', '.join(UNDETECTED_KINDS)} files).")
+
+
+def load_file(path, kind=None, sections=None):
+    """Parse a data file (or load it if it is a binary file).
+
+    Parameters
+    ----------
+    path : str
+           The path of the file.
+    kind : str, optional
+           The kind of file (see PARSERS). If None, it is given by the file
+           name (or read from the binary file).
+    sections : list, optional
+               For output files, the sections to parse (see OutputParser).
+               If None, everything is parsed.
+    """
+    from .binary import BINARY_FORMATS, BinaryContainer
+    if os.path.splitext(path)[1] in BINARY_FORMATS:
+        container = BinaryContainer(path)
+        return _get_parser_class(container.kind)._from_container(container)
+    if kind is None:
+        kind = get_file_kind(path)
+    if kind == OUTPUT_KIND:
+        from .output_parser import OutputParser
+        return OutputParser(path, sections=sections)
+    cls = _get_parser_class(kind)
+    if kind == "eig":
+        return cls.from_file(path)
+    return cls(path)
+
+
+def _get_parser_class(kind):
+    if kind not in PARSERS:
+        raise ValueError(f"Invalid kind of file: '{kind}'. Valid ones are:"
+                         f" {list(PARSERS)}.")
+    module, name = PARSERS[kind]
+    return getattr(importlib.import_module(module), name)
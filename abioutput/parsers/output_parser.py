@@ -1,11 +1,24 @@
 from abipy.abio.outputs import AbinitOutputFile
+import abipy
 from ..bases import BaseUtility
+from ..profiling import phase
 from .output_subparsers import DtsetParser
+from .output_subparsers.dtset_parser import SUBPARSERS
 from .utils.abinit_vars import AbinitVarStrToNum
 from collections import OrderedDict
 import logging
 
 
+# sections which can be selected: the input and output variables and the
+# sections parsed in each dataset
+OUTVARS_SECTION = "outvars"
+SECTIONS = (OUTVARS_SECTION, ) + tuple(x.subject for x in SUBPARSERS)
+# version of abipy whose AbinitOutputFile._parse (a private method) is
+# reproduced by the selective parsing. Check _parse_selection against the
+# new _parse when abipy is upgraded, then update this version.
+ABIPY_PARSE_VERSION = "1.0.0"
+
+
 class OutputParser(AbinitOutputFile, BaseUtility):
     """An ABINIT output file parser that gets data from an output file.
 
@@ -13,14 +26,40 @@ class OutputParser(AbinitOutputFile, BaseUtility):
     ----------
     filepath : str
                The path to the output file.
+    sections : list, optional
+               If not None, only these sections are parsed (see SECTIONS):
+               'outvars' for the input and output variables and the
+               sections of each dataset (e.g.: 'eigenvalues'). The file is
+               read in a single pass. Once all the requested sections are
+               read, the next datasets are only counted and the footer is
+               not read if 'outvars' is not requested (then run_completed
+               is None).
+    datasets : list, optional
+               If not None, only these datasets (indices starting at 1) are
+               parsed. The data_per_dtset item of the other datasets is
+               None and their text is not kept.
     """
     _loggername = "OutputParser"
+    _abipy_version_checked = False
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, sections=None, datasets=None, **kwargs):
         BaseUtility.__init__(self, kwargs.pop("loglevel", logging.INFO))
-        AbinitOutputFile.__init__(self, *args, **kwargs)
+        if sections is not None:
+            sections = tuple(sections)
+            for section in sections:
+                if section not in SECTIONS:
+                    raise ValueError(f"Invalid section: '{section}'. Valid"
+                                     f" ones are: {SECTIONS}.")
+        if datasets is not None:
+            datasets = set(datasets)
+        self.sections = sections
+        self.selected_datasets = datasets
+        with phase(self, "read") as read:
+            AbinitOutputFile.__init__(self, *args, **kwargs)
+            read.path = self.filepath
 
-        self.data_per_dtset = self._get_data_per_dtset()
+        with phase(self, "tokenize"):
+            self.data_per_dtset = self._get_data_per_dtset()
         self._output_vars_global = None
         self._output_vars_dataset = None
 
@@ -46,6 +85,7 @@ class OutputParser(AbinitOutputFile, BaseUtility):
     def output_vars_dataset(self):
         if self._output_vars_dataset is not None:
             return self._output_vars_dataset
+        self._check_section_parsed(OUTVARS_SECTION)
         vars_dtsets = self.final_vars_dataset
         variables = OrderedDict()
         for jdtset, vars_dict in vars_dtsets.items():
@@ -58,21 +98,157 @@ class OutputParser(AbinitOutputFile, BaseUtility):
     def output_vars_global(self):
         if self._output_vars_global is not None:
             return self._output_vars_global
+        self._check_section_parsed(OUTVARS_SECTION)
         # we need to convert the variables given as a single string by abipy
         # in order that they are immediately usable
         a = AbinitVarStrToNum(self.final_vars_global)
         self._output_vars_global = a.data
         return self.output_vars_global
 
+    def _check_section_parsed(self, section):
+        if self.sections is not None and section not in self.sections:
+            raise ValueError(f"The '{section}' section was not parsed (see"
+                             f" the sections argument).")
+
+    def _is_dataset_selected(self, jdtset):
+        if self.selected_datasets is None:
+            return True
+        return jdtset in self.selected_datasets
+
+    def _get_dataset_sections(self):
+        # the requested sections parsed in the datasets (None for all)
+        if self.sections is None:
+            return None
+        return [x for x in self.sections if x != OUTVARS_SECTION]
+
+    def _parse(self):
+        # abipy parses the whole file. With a selection, only the requested
+        # parts are kept and the file is read only once.
+        if self.sections is None and self.selected_datasets is None:
+            super()._parse()
+            return
+        self._parse_selection()
+
+    def _parse_selection(self):
+        # same as AbinitOutputFile._parse (see ABIPY_PARSE_VERSION) but in
+        # one pass and keeping only the selected parts
+        self._check_abipy_version()
+        with_outvars = (self.sections is None or
+                        OUTVARS_SECTION in self.sections)
+        with_datasets = self._get_dataset_sections() != []
+        last_dataset = None
+        if self.selected_datasets is not None:
+            last_dataset = max(self.selected_datasets, default=0)
+        self.version, self.run_completed = None, False
+        self.overall_cputime, self.overall_walltime = 0.0, 0.0
+        self.proc0_cputime, self.proc0_walltime = 0.0, 0.0
+        self.header, self.footer, self.datasets = [], [], {}
+        where = "in_header"
+        # once the requested datasets are read, the next datasets are only
+        # counted (their text is not kept) such that ndtset is the same
+        counting = False
+        with open(self.filepath) as f:
+            for line in f:
+                if counting:
+                    if "== DATASET" in line:
+                        self.datasets[_get_dataset_index(line)] = []
+                    elif "== END DATASET(S) " in line:
+                        self.run_completed = None
+                        break
+                    continue
+                if "== DATASET" in line:
+                    where = _get_dataset_index(line)
+                    # datasets not selected are kept empty (their output
+                    # variables are still parsed)
+                    self.datasets[where] = []
+                    if not with_outvars and (
+                            not with_datasets or
+                            last_dataset is not None and
+                            where > last_dataset):
+                        # all requested datasets are read
+                        counting = True
+                        continue
+                elif "== END DATASET(S) " in line:
+                    where = "in_footer"
+                    if not with_outvars:
+                        # the footer is not read
+                        self.run_completed = None
+                        break
+                elif line.startswith(".Version") and self.version is None:
+                    self.version = line.split()[1]
+                elif line.startswith("- Proc."):
+                    tokens = line.split()
+                    self.proc0_walltime = float(tokens[-1])
+                    self.proc0_cputime = float(tokens[-3])
+                elif line.startswith("+Overall time"):
+                    tokens = line.split()
+                    self.overall_cputime = float(tokens[-3])
+                    self.overall_walltime = float(tokens[-1])
+                elif " Calculation completed." in line:
+                    self.run_completed = True
+
+                if where == "in_header":
+                    if with_outvars:
+                        self.header.append(line)
+                elif where == "in_footer":
+                    self.footer.append(line)
+                elif with_datasets and self._is_dataset_selected(where):
+                    self.datasets[where].append(line)
+        self.header = "".join(self.header)
+        self.footer = "".join(self.footer)
+        self.datasets = {key: "".join(lines) for key, lines in
+                         self.datasets.items()}
+        self.ndtset = len(self.datasets)
+        if not self.datasets:
+            # no dataset yet (e.g.: running calculation): same as abipy
+            self.ndtset = 1
+            self.datasets[1] = "Empty dataset"
+        self.dryrun_mode = "debugging mode => will skip driver" in self.header
+        self.initial_vars_global, self.initial_vars_dataset = None, None
+        self.final_vars_global, self.final_vars_dataset = None, None
+        if not with_outvars:
+            return
+        self.initial_vars_global, self.initial_vars_dataset = (
+                self._parse_variables("header"))
+        if self.run_completed:
+            if self.dryrun_mode:
+                self.final_vars_global = self.initial_vars_global
+                self.final_vars_dataset = self.initial_vars_dataset
+            else:
+                self.final_vars_global, self.final_vars_dataset = (
+                        self._parse_variables("footer"))
+
+    def _check_abipy_version(self):
+        # warn (once) if abipy's parsing may have changed
+        if OutputParser._abipy_version_checked:
+            return
+        OutputParser._abipy_version_checked = True
+        if abipy.__version__ != ABIPY_PARSE_VERSION:
+            self._logger.warning(
+                    f"The selective parsing reproduces the parsing of abipy"
+                    f" {ABIPY_PARSE_VERSION} but abipy {abipy.__version__}"
+                    f" is installed: the results may differ from a full"
+                    f" parsing.")
+
     def _get_data_per_dtset(self):
         data = []
-        self._logger.debug("%i datasets found in output." % len(self.datasets))
+        self._logger.debug(f"{len(self.datasets)} datasets found in output.")
+        sections = self._get_dataset_sections()
         for jdtset, string_dtset in self.datasets.items():
-            data.append(self._extract_data_from_dtset(string_dtset))
+            if sections == [] or not self._is_dataset_selected(jdtset):
+                data.append(None)
+                continue
+            data.append(self._extract_data_from_dtset(string_dtset,
+                                                      sections=sections))
         return data
 
-    def _extract_data_from_dtset(self, string):
+    def _extract_data_from_dtset(self, string, sections=None):
         # string is a single string from a dtset.
-        dtsetparser = DtsetParser.from_string(string,
+        dtsetparser = DtsetParser.from_string(string, sections=sections,
                                               loglevel=self._logger.level)
         return dtsetparser.data
+
+
+def _get_dataset_index(line):
+    # index of a dataset from its first line (== DATASET  1 =====...)
+    return int(line.replace("=", "").split()[-1])
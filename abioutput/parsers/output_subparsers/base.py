@@ -1,3 +1,4 @@
+from ...bases import configure_logging
 import logging
 import abc
 
@@ -11,7 +12,7 @@ class BaseSubParser(abc.ABC):
     trigger = None
 
     def __init__(self, loglevel=logging.INFO):
-        logging.basicConfig()
+        configure_logging()
         self._logger = logging.getLogger(self._loggerName)
         self._logger.setLevel(loglevel)
         self._ending_relative_index = None
@@ -25,8 +25,22 @@ class DtsetParser(BaseSubParser):
     subject = "dtset"
     trigger = "== DATASET"
 
-    def __init__(self, lines, loglevel=logging.INFO):
+    def __init__(self, lines, loglevel=logging.INFO, sections=None):
+        """DtsetParser init method.
+
+        Parameters
+        ----------
+        lines : list
+                The lines of the dataset.
+        loglevel : int, optional
+                   The logging level.
+        sections : list, optional
+                   If not None, only the sections with these subjects are
+                   parsed (see SUBPARSERS) and parsing stops once they are
+                   all found.
+        """
         super().__init__(loglevel=loglevel)
+        self.sections = sections
         self._logger.debug("=== Parsing DATASET ===")
         # lines is a list of all the lines in the dtset
         # The lines given here are only the lines of one dataset
@@ -41,8 +55,13 @@ class DtsetParser(BaseSubParser):
         data = {}
         # extract data from dtset
         skip = 0
-        subparsers = SubParsersList(SUBPARSERS)
+        subparsers = SubParsersList(
+                [x for x in SUBPARSERS
+                 if self.sections is None or x.subject in self.sections])
         for index, line in enumerate(lines):
+            if not subparsers.subparsers:
+                # all sections found
+                break
             if index < skip:
                 # don't work on this line
                 continue
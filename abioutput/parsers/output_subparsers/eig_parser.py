@@ -1,18 +1,43 @@
 from .base import BaseSubParser
+from ..binary import BinaryMixin
 from ..utils._common_routines import decompose_line
+from ...profiling import phase
+import array
 import logging
+import numpy as np
 
 
-class EIGParser(BaseSubParser):
+EIG_ARRAYS = {"coordinates": ["nkpt", "reduced_coordinate"],
+              "eigenvalues": ["nkpt", "nband"],
+              "occupations": ["nkpt", "nband"]}
+# storage types of the eigenvalues and occupations (with the typecode of the
+# array module used while parsing). float32 halves the memory.
+EIG_DTYPES = {np.dtype(np.float64): "d", np.dtype(np.float32): "f"}
+EIG_DTYPE = np.float64  # default storage type
+
+
+class EIGParser(BaseSubParser, BinaryMixin):
     trigger = "Eigenvalues"
     _loggerName = "EIGParser"
     subject = "eigenvalues"
+    _binary_kind = "eig"
 
-    def __init__(self, lines, loglevel=logging.INFO, check_loi=True):
+    def __init__(self, lines, loglevel=logging.INFO, check_loi=True,
+                 dtype=EIG_DTYPE):
         """Normally called from the AbinitOutput class but can also be called
         directly onto an EIG file with the from_file classmethod.
+
+        The eigenvalues and occupations are stored as C-contiguous
+        (nkpt x nband) arrays of type dtype (float64 or float32) and the
+        kpts coordinates as a (nkpt x 3) array. If the number of bands
+        changes with the kpt, nband is the largest one and the missing
+        bands are NaN.
         """
         super().__init__(loglevel=loglevel)
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in EIG_DTYPES:
+            raise ValueError(f"Invalid dtype: {self.dtype}. Valid ones are:"
+                             f" {[str(x) for x in EIG_DTYPES]}.")
         self._logger.debug("\n##########  GETTING EIGENVALUES  #########")
         # if check_loi, find the ending of the loi
         if check_loi:
@@ -22,8 +47,9 @@ class EIGParser(BaseSubParser):
             self._ending_relative_index = len(lines) - 1
         self.data = None
         if loi is not None:
-            self._logger.debug("%i eigenvalues line to parse." % len(loi))
-            self.data = self._get_data(loi)
+            self._logger.debug(f"{len(loi)} eigenvalues line to parse.")
+            with phase(self, "tokenize", lines=len(loi)):
+                self.data = self._get_data(loi)
         self._logger.debug("Eigenvalues done.")
 
     def _get_loi(self, lines):
@@ -63,80 +89,218 @@ class EIGParser(BaseSubParser):
         return data
 
     def _get_eigs(self, lines):
-        # get eigenvalues data
-        data = {"coordinates": [],
-                "eigenvalues": [],
-                "occupations": [],
-                "nbands": None,
+        # get eigenvalues data. The values are gathered in flat arrays (4 or
+        # 8 bytes per value) which are reshaped once all kpts are read.
+        typecode = EIG_DTYPES[self.dtype]
+        coordinates = []
+        eigenvalues = array.array(typecode)
+        occupations = array.array(typecode)
+        data = {"nbands": None,
                 "units": None}
-        # units in first line inside parenthesis
-        splitted = lines[0].split("(")[1].split(")")[0].split(" ")
-        units = list(filter(lambda x: x != "", splitted))[0]
-        data["units"] = units
+        data["units"] = self._get_units(lines[0])
         loi = lines[1:]
 
         # get eigenvalues
-        nlines = len(loi)
-        lines_for_10percent = nlines // 10
-        if lines_for_10percent == 0:
-            lines_for_10percent = 1
         skip = 0
-
+        # number of eigenvalues and occupations of each kpt
+        neigenvalues = array.array("l")
+        noccupations = array.array("l")
         for i, line in enumerate(loi):
-            if not i % lines_for_10percent:
-                self._logger.debug("EIG progression : %.1f / 100" %
-                                   (i / nlines * 100))
             if i < skip:
                 continue
             if line.startswith("kpt#"):
                 coord = self._get_kpt_coord(line)
-                data["coordinates"].append(coord)
-                block = self._get_next_number_block(loi[i + 1:])
-                eigs = self._get_data_from_block(block)
-                data["eigenvalues"].append(eigs)
-
-                skip = i + len(block) + 1
-                if not len(eigs):
-                    self._logger.debug("No eigenvalues found for coord: %s" %
-                                       str(coord))
+                coordinates.append(coord)
+                end = self._get_next_number_block_end(loi, i + 1)
+                nvalues = len(eigenvalues)
+                self._get_data_from_block(loi, i + 1, end, eigenvalues)
+                neigenvalues.append(len(eigenvalues) - nvalues)
+                skip = end
             elif "occupation numbers" in line:
                 # occupation numbers are specified inside the eigenvalues
-                # we need to append this info to the last kpt dict
-                block = self._get_next_number_block(loi[i + 1:])
-                data["occupations"].append(self._get_data_from_block(block))
-                skip = i + len(block) + 1
-        data["nbands"] = len(data["eigenvalues"][0])
+                # they are given for the last kpt
+                end = self._get_next_number_block_end(loi, i + 1)
+                nvalues = len(occupations)
+                self._get_data_from_block(loi, i + 1, end, occupations)
+                noccupations.append(len(occupations) - nvalues)
+                skip = end
+        if not len(neigenvalues) or not neigenvalues[0]:
+            raise LookupError("No eigenvalues found.")
+        nband = max(neigenvalues)
+        if min(neigenvalues) != nband:
+            self._logger.warning(f"The number of bands changes with the kpt"
+                                 f" ({min(neigenvalues)} to {nband}): the"
+                                 f" missing bands are NaN.")
+        data["coordinates"] = np.array(coordinates, dtype=float)
+        data["eigenvalues"] = self._to_array(eigenvalues, neigenvalues, nband)
+        data["occupations"] = self._to_array(occupations, noccupations,
+                                             nband)
+        data["nbands"] = nband
         return data
 
-    def _get_data_from_block(self, block):
-        data = []
-        for line in block:
+    def _to_array(self, values, counts, nband):
+        # (nkpt x nband) array sharing the memory of the flat array
+        values = np.frombuffer(values, dtype=self.dtype)
+        if all(count == nband for count in counts):
+            return values.reshape((-1, nband))
+        # the number of bands changes with the kpt: the array is padded
+        # with NaN (a copy)
+        padded = np.full((len(counts), nband), np.nan, dtype=self.dtype)
+        padded[np.arange(nband) < np.array(counts)[:, None]] = values
+        return padded
+
+    def _get_data_from_block(self, lines, start, end, values):
+        # append the numbers of lines[start:end] to values
+        for line in lines[start:end]:
             s, i, f = decompose_line(line)
-            data.extend(f)
-        return data
+            values.extend(f)
 
-    def _get_next_number_block(self, loi):
-        # get next eigenvalues block
-        for i, line in enumerate(loi):
+    def _get_next_number_block_end(self, lines, start):
+        # get the end index of the eigenvalues block starting at start
+        for i in range(start, len(lines)):
+            line = lines[i]
             if "kpt#" in line or "occupation numbers" in line:
-                return loi[:i]
+                return i
         # if at the end, return the whole thing
-        return loi
+        return len(lines)
 
-    def _get_kpt_coord(self, line):
-            # get kpt coordinates
-            splitted = line.split(" ")
-            filtered = list(filter(lambda xx: xx != '', splitted))
-            return [float(filtered[-5]),
-                    float(filtered[-4]),
-                    float(filtered[-3])]
+    @staticmethod
+    def _get_units(line):
+        # units in the title line inside parenthesis
+        splitted = line.split("(")[1].split(")")[0].split(" ")
+        return list(filter(lambda x: x != "", splitted))[0]
 
     @classmethod
-    def from_file(cls, path):
+    def _get_title_data(cls, line):
+        # get the units, number of kpts (0 if not given) and spin (None if
+        # not polarized) from a title line
+        nkpt = 0
+        if "nkpt=" in line:
+            s, i, f = decompose_line(line.split("nkpt=")[1])
+            if i:
+                nkpt = i[0]
+        spin = None
+        if "SPIN" in line:
+            spin = line.split(" ")[-1][:-1].lower()  # down or up
+        return cls._get_units(line), nkpt, spin
+
+    @staticmethod
+    def _get_kpt_coord(line):
+        # get kpt coordinates
+        splitted = line.split(" ")
+        filtered = list(filter(lambda xx: xx != '', splitted))
+        return [float(filtered[-5]),
+                float(filtered[-4]),
+                float(filtered[-3])]
+
+    def _init_from_binary(self, path):
+        BaseSubParser.__init__(self)
+        self._ending_relative_index = 0
+        self.dtype = None
+
+    def _to_binary(self):
+        # polarized data is stored in one group per spin
+        arrays, attributes, dimensions = {}, {}, {}
+        if "eigenvalues" in self.data:
+            spins = {"": self.data}
+        else:
+            spins = {f"{spin}/": data for spin, data in self.data.items()}
+            attributes["spins"] = list(self.data)
+        for prefix, data in spins.items():
+            for name, dims in EIG_ARRAYS.items():
+                # occupations are not always given
+                if len(data[name]):
+                    arrays[prefix + name] = data[name]
+                    dimensions[prefix + name] = dims
+            attributes[prefix + "units"] = data["units"]
+        return arrays, attributes, dimensions
+
+    def _from_binary(self, arrays, attributes):
+        if "spins" not in attributes:
+            self.data = self._get_binary_spin_data("", arrays, attributes)
+            return
+        self.data = {spin: self._get_binary_spin_data(f"{spin}/", arrays,
+                                                      attributes)
+                     for spin in attributes["spins"]}
+
+    @staticmethod
+    def _get_binary_spin_data(prefix, arrays, attributes):
+        data = {name: arrays.get(prefix + name, []) for name in EIG_ARRAYS}
+        data["nbands"] = data["eigenvalues"].shape[1]
+        data["units"] = attributes[prefix + "units"]
+        return data
+
+    @classmethod
+    def from_file(cls, path, dtype=EIG_DTYPE):
         """Get the eigenvalues from an EIG file.
+
+        Parameters
+        ----------
+        path : str
+               The path of the EIG file.
+        dtype : numpy dtype, optional
+                The storage type of the eigenvalues and occupations
+                (float64 or float32).
         """
-        with open(path, "r") as f:
-            lines = f.readlines()
-        # preprocess lines
-        lines = cls.preprocess_lines(lines)
-        return cls(lines, check_loi=False)
+        with phase(cls, "read", path=path) as read:
+            # preprocess lines while reading them (no copy of the raw lines)
+            with open(path, "r") as f:
+                lines = cls.preprocess_lines(f)
+            read.lines = len(lines)
+        return cls(lines, check_loi=False, dtype=dtype)
+
+    @classmethod
+    def to_store(cls, path, store_path, dtype=EIG_DTYPE, chunk_nkpt=None):
+        """Stream an EIG file into a chunked HDF5 eigenvalue store (see
+        eig_store.EigenvalueStore) without holding the file or the
+        eigenvalues in memory: only one chunk of kpts is kept at a time.
+
+        Parameters
+        ----------
+        path : str
+               The path of the EIG file.
+        store_path : str
+                     The path of the HDF5 file to write.
+        dtype : numpy dtype, optional
+                The storage type of the eigenvalues and occupations.
+        chunk_nkpt : int, optional
+                     The number of kpts per chunk. If None, the store
+                     default is used.
+
+        Returns
+        -------
+        EigenvalueStore : The store (for spin polarized data, the spin up
+                          data).
+        """
+        from ..eig_store import CHUNK_NKPT, EigenvalueStore
+        from ..eig_store import EigenvalueStoreWriter
+        if chunk_nkpt is None:
+            chunk_nkpt = CHUNK_NKPT
+        writer = EigenvalueStoreWriter(store_path, dtype=dtype,
+                                       chunk_nkpt=chunk_nkpt)
+        kpt = None
+        spins = []
+        with phase(cls, "tokenize", path=path) as tokenize, writer:
+            with open(path, "r") as f:
+                for nlines, line in enumerate(f, start=1):
+                    line = line.strip()
+                    if line.startswith("kpt#") or cls.trigger in line:
+                        if kpt is not None:
+                            writer.add_kpt(*kpt)
+                            kpt = None
+                    if line.startswith("kpt#"):
+                        kpt = (cls._get_kpt_coord(line), [], [])
+                        values = kpt[1]
+                    elif cls.trigger in line:
+                        units, nkpt, spin = cls._get_title_data(line)
+                        if spin is not None:
+                            spins.append(spin)
+                        writer.start_spin(units, nkpt=nkpt, spin=spin)
+                    elif "occupation numbers" in line:
+                        values = kpt[2]
+                    elif line and kpt is not None:
+                        values.extend(decompose_line(line)[2])
+                if kpt is not None:
+                    writer.add_kpt(*kpt)
+            tokenize.lines = nlines
+        return EigenvalueStore(store_path, spin=spins[0] if spins else None)
@@ -1,3 +1,5 @@
+from .binary import BinaryMixin
+from ..profiling import phase
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -7,53 +9,69 @@ def plot_self_energy(selfparsers,
                      ylabel_re=r"$\Re(\Sigma(\omega_n))$",
                      ylabel_im=r"$\Im(\Sigma(\omega_n))$",
                      labels=None,
-                     with_renorm_factor=True):
-        """Plot the self energy from one or many self energy parsers.
+                     with_renorm_factor=True,
+                     fig=None,
+                     save_at=None):
+    """Plot the self energy from one or many self energy parsers.
 
-        Parameters
-        ----------
-        selfparser : list
-                     The list of self energy parsers.
-        xlabel : str, optional
-                 Gives the label for the x axis (usally matsubara freqs).
-        ylabel_re : str, optional
-                    Gives the label for the real part of the self energy.
-        ylabel_im : str, optional
-                    Gives the label for the imaginary part of the self energy.
-        labels : list, optional
-                 If not None, gives the label
-                 (only shown in the real part pane)
-                 of the curve (if many curves).
-        with_renorm_factor : bool, optional
-                             If True, the mass renormalization factor is
-                             added in the label.
-        """
-        showlegend = True
-        if isinstance(selfparsers, SelfEnergyParser):
-            selfparsers = (selfparsers, )
-        if labels is None:
-            showlegend = False
-            labels = [None] * len(selfparsers)
+    Parameters
+    ----------
+    selfparser : list
+                 The list of self energy parsers.
+    xlabel : str, optional
+             Gives the label for the x axis (usally matsubara freqs).
+    ylabel_re : str, optional
+                Gives the label for the real part of the self energy.
+    ylabel_im : str, optional
+                Gives the label for the imaginary part of the self energy.
+    labels : list, optional
+             If not None, gives the label
+             (only shown in the real part pane)
+             of the curve (if many curves).
+    with_renorm_factor : bool, optional
+                         If True, the mass renormalization factor is
+                         added in the label.
+    fig : matplotlib Figure, optional
+          The figure to draw on. If None, a new pyplot figure is created.
+    save_at : str, optional
+              If not None, gives the path to where the figure will be saved.
+
+    Returns
+    -------
+    The figure.
+    """
+    showlegend = True
+    if isinstance(selfparsers, SelfEnergyParser):
+        selfparsers = (selfparsers, )
+    if labels is None:
+        showlegend = False
+        labels = [None] * len(selfparsers)
+    if fig is None:
         fig = plt.figure()
-        axRe = fig.add_subplot(211)
-        axRe.set_ylabel(ylabel_re)
-
-        axIm = fig.add_subplot(212)
-        axIm.set_ylabel(ylabel_im)
-        axIm.set_xlabel(xlabel)
-        for self, label in zip(selfparsers, labels):
-            if with_renorm_factor:
-                showlegend = True
-                if label is None:
-                    label = r""
-                label += r" $Z^{-1}$=%.2f" % self.mass_renormalization_factor()
-            axRe.plot(self.data["frequencies"], self.data["real"], label=label)
-            axIm.plot(self.data["frequencies"], self.data["imaginary"])
-        if showlegend:
-            axRe.legend(loc="best")
-
-
-class SelfEnergyParser:
+    axRe = fig.add_subplot(211)
+    axRe.set_ylabel(ylabel_re)
+
+    axIm = fig.add_subplot(212)
+    axIm.set_ylabel(ylabel_im)
+    axIm.set_xlabel(xlabel)
+    for self, label in zip(selfparsers, labels):
+        if with_renorm_factor:
+            showlegend = True
+            if label is None:
+                label = r""
+            label += r" $Z^{-1}$=%.2f" % self.mass_renormalization_factor()
+        axRe.plot(self.data["frequencies"], self.data["real"], label=label)
+        axIm.plot(self.data["frequencies"], self.data["imaginary"])
+    if showlegend:
+        axRe.legend(loc="best")
+    if save_at is not None:
+        fig.savefig(save_at)
+    return fig
+
+
+class SelfEnergyParser(BinaryMixin):
+    _binary_kind = "self_energy"
+
     def __init__(self, path, many_self_option="mean", dc=0):
 
         if isinstance(path, str):
@@ -83,11 +101,26 @@ class SelfEnergyParser:
         with_renorm_factor : bool, optional
                              If True, the mass renormalization factor is
                              added in the label.
+        fig : matplotlib Figure, optional
+              The figure to draw on. If None, a new pyplot figure is created.
+        save_at : str, optional
+                  If not None, gives the path to where the figure will be
+                  saved.
         """
-        plot_self_energy((self, ), labels=(label, ), **kwargs)
+        return plot_self_energy((self, ), labels=(label, ), **kwargs)
+
+    def _to_binary(self):
+        return (dict(self.data), {},
+                {name: ["nfrequency"] for name in self.data})
+
+    def _from_binary(self, arrays, attributes):
+        self.data = {name: arrays[name] for name in
+                     ("frequencies", "real", "imaginary")}
 
     def _extract_data(self, path, dc=0):
-        d = np.loadtxt(path)
+        with phase(self, "tokenize", path=path) as tokenize:
+            d = np.loadtxt(path)
+            tokenize.lines = len(d)
         return {"frequencies": d[:, 0],
                 "real": d[:, 1] - dc,
                 "imaginary": d[:, 2]}
@@ -1,3 +1,6 @@
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 import abc
 import matplotlib.pyplot as plt
 import numpy as np
@@ -108,11 +111,12 @@ class Plot:
         newplot = Plot()
         for attr in ("_curves", "_hlines", "_vlines"):
             setattr(newplot, attr, getattr(self, attr) + getattr(plot, attr))
-        all_xticks = list(self.xtick_labels)
-        for xtick in plot.xtick_labels:
+        all_xticks = list(self.xtick_labels or [])
+        for xtick in plot.xtick_labels or []:
             if xtick not in all_xticks:
                 all_xticks.append(xtick)
-        newplot.xtick_labels = all_xticks
+        if all_xticks:
+            newplot.xtick_labels = all_xticks
         # compute new title
         if self.title == "" and plot.title != "":
             title = plot.title
@@ -139,10 +143,37 @@ class Plot:
                          outside graph.
         """
         self._fig = plt.figure()
-        ax = self._fig.add_subplot(111)
-        # plot curves and lines
-        for curve in self._curves:
-            curve.plot_on_axis(ax)
+        self._draw(self._fig, show_legend=show_legend,
+                   legend_outside=legend_outside)
+        plt.show()
+
+    def render(self, path, show_legend=True, legend_outside=True, **kwargs):
+        """Draw the figure and save it without showing it (no display
+        needed). The figure is not kept in memory.
+
+        Parameters
+        ----------
+        path : str
+               The path of the file to write.
+        show_legend : bool, optional
+                      If True, the legend is shown.
+        legend_outside : bool, optional
+                         If True, the legend (if displayed) will be drawn
+                         outside graph.
+        Other kwargs are passed to the savefig method of the figure.
+        """
+        fig = get_headless_figure()
+        self._draw(fig, show_legend=show_legend,
+                   legend_outside=legend_outside)
+        fig.savefig(path, **kwargs)
+
+    def _draw(self, fig, show_legend=True, legend_outside=True):
+        ax = fig.add_subplot(111)
+        # plot curves (grouped by style) and lines
+        for curves in self._get_curve_groups():
+            ax.add_collection(self._get_line_collection(curves))
+        if self._curves:
+            ax.autoscale_view()
         for hline in self._hlines:
             hline.plot_on_axis(ax)
         for vline in self._vlines:
@@ -165,18 +196,67 @@ class Plot:
                 ax.legend(loc="center left", bbox_to_anchor=(1, 0.5))
             else:
                 ax.legend(loc="best")
-        plt.show()
 
-    def save(self, path):
+    def _get_curve_groups(self):
+        # curves with the same style and label are drawn together
+        groups = {}
+        for curve in self._curves:
+            key = (curve.linestyle, curve.color, curve.label)
+            groups.setdefault(key, []).append(curve)
+        return list(groups.values())
+
+    @staticmethod
+    def _get_line_collection(curves):
+        # all curves of a group in a single artist. When all curves have the
+        # same length, the segments are one (ncurves, npoints, 2) array.
+        lengths = {len(curve.xdata) for curve in curves}
+        if len(lengths) == 1:
+            segments = np.empty((len(curves), lengths.pop(), 2))
+            for segment, curve in zip(segments, curves):
+                segment[:, 0] = curve.xdata
+                segment[:, 1] = curve.ydata
+        else:
+            segments = [np.column_stack((curve.xdata, curve.ydata))
+                        for curve in curves]
+        return LineCollection(segments,
+                              linestyles=curves[0].linestyle,
+                              colors=curves[0].color,
+                              label=curves[0].label)
+
+    def save(self, path, **kwargs):
+        """Save the figure. If it was not plotted, it is rendered without
+        being shown (see the render method).
+
+        Parameters
+        ----------
+        path : str
+               The path of the file to write.
+        Other kwargs are passed to the savefig method of the figure.
+        """
         if self._fig is None:
-            raise ValueError("Use the plot method to generate figure.")
-        self._fig.savefig(path)
+            self.render(path, **kwargs)
+            return
+        self._fig.savefig(path, **kwargs)
 
     def reset(self):
+        if self._fig is not None:
+            plt.close(self._fig)
         del self._fig
         self._fig = None
 
 
+def get_headless_figure(**kwargs):
+    """Returns a figure drawn with the Agg backend. It is not managed by
+    pyplot: it is never shown and its memory is freed as soon as it is not
+    used anymore (no need to close it).
+
+    All kwargs are passed to the matplotlib Figure class.
+    """
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
 class Curve:
     """Class that represents a curve."""
 
@@ -206,12 +286,13 @@ class Curve:
 
     def _check_list(self, data):
         # check if arguments are array-like and return numpy arrays
+        # (arrays are not copied)
         if type(data) not in (np.ndarray, list, tuple):
             raise TypeError("Argument should be array-like.")
         if isinstance(data, np.ndarray):
             if len(data.shape) >= 2:
                 raise TypeError("Argument is > 1D data!")
-        return np.array(data)
+        return np.asarray(data)
 
     def plot_on_axis(self, axis):
         axis.plot(self.xdata,
@@ -0,0 +1,192 @@
+"""Profiling of the parsers.
+
+Parsers record the wall time, bytes read, lines processed and (optionally)
+the peak memory allocated in each phase of their work ('read', 'tokenize'
+and 'reshape') when profiling is enabled:
+
+    with profile() as profiler:
+        EIGParser.from_file(path)
+    profiler.summary()  # {"EIGParser": {"read": {...}, "tokenize": {...}}}
+
+Profiling costs (almost) nothing when it is disabled.
+"""
+import contextlib
+import os
+import time
+import tracemalloc
+
+
+# active profilers
+_PROFILERS = []
+
+
+class Profiler:
+    """Collects the metrics recorded by the parsers while it is enabled.
+    """
+    def __init__(self, callback=None, memory=False):
+        """Profiler init method.
+
+        Parameters
+        ----------
+        callback : callable, optional
+                   If not None, it is called with each record (a dict with
+                   the 'parser', 'phase', 'time', 'bytes', 'lines' and
+                   'peak_memory' keys) as soon as it is recorded.
+        memory : bool, optional
+                 If True, the peak memory allocated in each phase is
+                 recorded with tracemalloc (which slows down everything).
+                 For nested phases, the peak of the outer phase only
+                 covers what happens after the end of the inner phase.
+        """
+        self.callback = callback
+        self.memory = memory
+        self.records = []
+        self._started_tracemalloc = False
+
+    def enable(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        _PROFILERS.append(self)
+
+    def disable(self):
+        if self in _PROFILERS:
+            _PROFILERS.remove(self)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def add_record(self, record):
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def summary(self):
+        """Returns the metrics summed over all records of each parser and
+        phase (the peak memory is the maximum).
+
+        Returns
+        -------
+        dict : {parser: {phase: {"calls", "time", "bytes", "lines",
+                "peak_memory"}}}
+        """
+        summary = {}
+        for record in self.records:
+            phases = summary.setdefault(record["parser"], {})
+            metrics = phases.setdefault(record["phase"],
+                                        {"calls": 0, "time": 0.0,
+                                         "bytes": 0, "lines": 0,
+                                         "peak_memory": None})
+            metrics["calls"] += 1
+            for key in ("time", "bytes", "lines"):
+                metrics[key] += record[key]
+            if record["peak_memory"] is not None:
+                metrics["peak_memory"] = max(metrics["peak_memory"] or 0,
+                                             record["peak_memory"])
+        return summary
+
+
+@contextlib.contextmanager
+def profile(callback=None, memory=False):
+    """Context manager enabling the profiling of the parsers.
+
+    Parameters
+    ----------
+    callback : callable, optional
+               Called with each record (see Profiler).
+    memory : bool, optional
+             If True, the peak memory of each phase is recorded.
+
+    Yields
+    ------
+    Profiler : The profiler holding the records.
+    """
+    profiler = Profiler(callback=callback, memory=memory)
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+
+
+def is_profiling():
+    """Returns True if profiling is enabled.
+    """
+    return bool(_PROFILERS)
+
+
+class _Phase:
+    # records the metrics of one phase. The 'bytes' and 'lines' attributes
+    # can be set while in the phase.
+    def __init__(self, parser, name, nbytes=0, lines=0, path=None):
+        self.parser = parser
+        self.name = name
+        self.bytes = nbytes
+        self.lines = lines
+        self.path = path
+
+    def __enter__(self):
+        self._memory = any(x.memory for x in _PROFILERS)
+        if self._memory and tracemalloc.is_tracing():
+            self._start_memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        else:
+            self._memory = False
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        elapsed = time.perf_counter() - self._start
+        if self.path is not None:
+            self.bytes = os.path.getsize(self.path)
+        peak = None
+        if self._memory:
+            peak = tracemalloc.get_traced_memory()[1] - self._start_memory
+        record = {"parser": self.parser, "phase": self.name,
+                  "time": elapsed, "bytes": self.bytes,
+                  "lines": self.lines, "peak_memory": peak}
+        for profiler in _PROFILERS:
+            profiler.add_record(record)
+
+
+class _NoPhase:
+    # used when profiling is disabled: does nothing
+    bytes = 0
+    lines = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(parser, name, nbytes=0, lines=0, path=None):
+    """Returns a context manager recording the metrics of a phase of a
+    parser if profiling is enabled.
+
+    Parameters
+    ----------
+    parser : object
+             The parser or its class (the class name is recorded).
+    name : str
+           The phase name ('read', 'tokenize' or 'reshape').
+    nbytes : int, optional
+             The number of bytes read.
+    lines : int, optional
+            The number of lines processed.
+    path : str, optional
+           If not None, the number of bytes read is the size of this file.
+    """
+    if not _PROFILERS:
+        return _NO_PHASE
+    if not isinstance(parser, type):
+        parser = type(parser)
+    return _Phase(parser.__name__, name, nbytes=nbytes, lines=lines,
+                  path=path)
@@ -0,0 +1,67 @@
+from concurrent.futures import ProcessPoolExecutor
+from .bandstructure import Bandstructure
+from .parsers import SelfEnergyParser, plot_self_energy
+from .plot import Plot, get_headless_figure
+
+
+def render_figure(plottable, path, **kwargs):
+    """Draw a figure and save it without showing it (with the Agg backend,
+    no display needed). The figure is freed once saved.
+
+    Parameters
+    ----------
+    plottable : Bandstructure, SelfEnergyParser or Plot instance
+                The object to plot. A list of SelfEnergyParser instances is
+                drawn on the same figure.
+    path : str
+           The path of the file to write.
+    Other kwargs are passed to the plot method of the object.
+
+    Returns
+    -------
+    str : The path of the file written.
+    """
+    if isinstance(plottable, Bandstructure):
+        plottable.plot(show=False, save_at=path, **kwargs)
+    elif isinstance(plottable, Plot):
+        plottable.render(path, **kwargs)
+    elif (isinstance(plottable, SelfEnergyParser) or
+          isinstance(plottable, (list, tuple)) and
+          all(isinstance(x, SelfEnergyParser) for x in plottable)):
+        plot_self_energy(plottable, fig=get_headless_figure(), save_at=path,
+                         **kwargs)
+    else:
+        raise TypeError(f"Cannot render a {type(plottable)} object.")
+    return path
+
+
+def render_figures(jobs, max_workers=None):
+    """Render many figures to files in parallel (one process per figure).
+
+    Parameters
+    ----------
+    jobs : list
+           The figures to render. Each job is a (plottable, path) or a
+           (plottable, path, kwargs) tuple (see render_figure).
+    max_workers : int, optional
+                  The number of processes. If None, it is the number of
+                  CPUs. If 1, figures are rendered in this process.
+
+    Returns
+    -------
+    list : The paths of the files written (same order as the jobs).
+    """
+    plottables, paths, all_kwargs = [], [], []
+    for job in jobs:
+        plottables.append(job[0])
+        paths.append(job[1])
+        all_kwargs.append(job[2] if len(job) > 2 else {})
+    if max_workers == 1:
+        return list(map(_render_job, plottables, paths, all_kwargs))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_job, plottables, paths, all_kwargs))
+
+
+def _render_job(plottable, path, kwargs):
+    # executor.map does not take kwargs
+    return render_figure(plottable, path, **kwargs)
@@ -0,0 +1,433 @@
+import numpy as np
+import os
+
+
+# values per line in EIG blocks (as ABINIT writes them)
+VALUES_PER_LINE = 8
+SEPARATOR = "=" * 80
+
+
+def _get_bands(nkpt, nband, seed=0):
+    # smooth and realistic looking bands (nkpt x nband, sorted at each kpt)
+    rng = np.random.default_rng(seed)
+    path = np.linspace(0, np.pi, nkpt)[:, None]
+    centers = np.sort(rng.uniform(-0.5, 1.0, nband))
+    widths = rng.uniform(0.02, 0.2, nband)
+    return np.sort(centers + widths * np.cos(path * rng.integers(1, 3, nband)),
+                   axis=1)
+
+
+def _get_kpts(nkpt):
+    # straight path from Gamma to X
+    return np.column_stack((np.linspace(0, 0.5, nkpt), np.zeros(nkpt),
+                            np.linspace(0, 0.5, nkpt)))
+
+
+def _format_values(values, fmt="%10.5f"):
+    # values written VALUES_PER_LINE by line
+    lines = []
+    for start in range(0, len(values), VALUES_PER_LINE):
+        lines.append(" " + "".join(fmt % x for x in
+                                   values[start:start + VALUES_PER_LINE]))
+    return lines
+
+
+def _eig_block(nkpt, nband, units="hartree", occupations=False, spin=None,
+               seed=0):
+    title = f" Eigenvalues ({units}) for nkpt= {nkpt:4d}  k points"
+    if spin is not None:
+        title += f", SPIN {spin.upper()}:"
+    else:
+        title += ":"
+    lines = [title]
+    bands = _get_bands(nkpt, nband, seed=seed)
+    nocc = nband // 2
+    for ikpt, (kpt, eigs) in enumerate(zip(_get_kpts(nkpt), bands)):
+        lines.append(f" kpt# {ikpt + 1:4d}, nband= {nband:3d}, wtk=  1.00000,"
+                     f" kpt= {kpt[0]:7.4f} {kpt[1]:7.4f} {kpt[2]:7.4f}"
+                     f" (reduced coord)")
+        lines.extend(_format_values(eigs))
+        if occupations:
+            lines.append(f"      occupation numbers for kpt# {ikpt + 1:4d}")
+            occ = np.zeros(nband)
+            occ[:nocc] = 2
+            lines.extend(_format_values(occ))
+    return lines
+
+
+def eig_text(nkpt=10, nband=8, polarized=False, units="hartree",
+             occupations=False, seed=0):
+    """Returns the content of an EIG file.
+
+    Parameters
+    ----------
+    nkpt : int, optional
+           The number of kpts.
+    nband : int, optional
+            The number of bands.
+    polarized : bool, optional
+                If True, the eigenvalues are given for spin up and down.
+    units : str, optional
+            The eigenvalues units.
+    occupations : bool, optional
+                  If True, occupation numbers are written after each kpt.
+    seed : int, optional
+           The random seed.
+    """
+    if not polarized:
+        lines = _eig_block(nkpt, nband, units=units, occupations=occupations,
+                           seed=seed)
+    else:
+        lines = []
+        for ispin, spin in enumerate(("up", "down")):
+            lines += _eig_block(nkpt, nband, units=units,
+                                occupations=occupations, spin=spin,
+                                seed=seed + ispin)
+    return "\n".join(lines) + "\n"
+
+
+def fatband_text(nkpt=10, nband=8, seed=0):
+    """Returns the content of a FATBAND file.
+
+    Parameters
+    ----------
+    nkpt : int, optional
+           The number of kpts.
+    nband : int, optional
+            The number of bands.
+    seed : int, optional
+           The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    bands = _get_bands(nkpt, nband, seed=seed).T
+    lines = ["# ABINIT package : FATBAND file",
+             f"# nband= {nband} nkpt= {nkpt}"]
+    for iband, band in enumerate(bands):
+        lines.append(f"# BAND number : {iband + 1:5d}")
+        for ikpt, (eig, character) in enumerate(zip(band,
+                                                    rng.random(nkpt))):
+            lines.append(f" {ikpt + 1:6d} {eig:14.8f} {character:14.8f}")
+        lines.append("&")
+    return "\n".join(lines) + "\n"
+
+
+def dos_text(nenergy=100, ncolumn=5, seed=0):
+    """Returns the content of a _DOS file.
+
+    Parameters
+    ----------
+    nenergy : int, optional
+              The number of energies.
+    ncolumn : int, optional
+              The number of columns (energy, DOS, integrated DOS and
+              projections).
+    seed : int, optional
+           The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    energies = np.linspace(-0.5, 1.0, nenergy)
+    dos = rng.random((nenergy, ncolumn - 2))
+    integrated = np.cumsum(dos[:, 0]) * (energies[1] - energies[0])
+    data = np.column_stack((energies, dos[:, :1], integrated, dos[:, 1:]))
+    titles = ["energy", "DOS", "Integr. DOS"] + ["DOS"] * (ncolumn - 3)
+    lines = ["# ABINIT package : DOS file",
+             "#",
+             "#     energy(Ha)" + "".join(f"{x:>15}" for x in titles[1:])]
+    lines += [" " + "".join(f"{x:15.8f}" for x in row) for row in data]
+    return "\n".join(lines) + "\n"
+
+
+def dmft_eig_text(nkpt=10, nband=8, nspin=1, dmftbandi=1, nbandtot=None,
+                  seed=0):
+    """Returns the content of a DMFT .eig file.
+
+    Parameters
+    ----------
+    nkpt : int, optional
+           The number of kpts.
+    nband : int, optional
+            The number of bands in the DMFT window.
+    nspin : int, optional
+            The number of spins.
+    dmftbandi : int, optional
+                The first band of the DMFT window.
+    nbandtot : int, optional
+               The total number of bands (by default, the last band of the
+               DMFT window).
+    seed : int, optional
+           The random seed.
+    """
+    dmftbandf = dmftbandi + nband - 1
+    if nbandtot is None:
+        nbandtot = dmftbandf
+    lines = ["# nband nsppol nkpt nsym dmftbandi dmftbandf",
+             f" {nbandtot} {nspin} {nkpt} 1 {dmftbandi} {dmftbandf}",
+             "# Eigenvalues in Ha (times 2) For each k-point,"
+             " eigenvalues for each band"]
+    for ispin in range(nspin):
+        lines += [" For spin", f" {ispin + 1:10d}"]
+        # eigenvalues are written times 2 by ABINIT
+        bands = 2 * _get_bands(nkpt, nband, seed=seed + ispin)
+        for ikpt, eigs in enumerate(bands):
+            lines += [" For k-point", f" {ikpt + 1:10d}"]
+            lines += [f" {iband + dmftbandi:10d} {ikpt + 1:10d} {eig:20.12f}"
+                      for iband, eig in enumerate(eigs)]
+    return "\n".join(lines) + "\n"
+
+
+def dmft_projectors_text(nkpt=10, nband=8, nspin=1, natom=1, norb=5,
+                         dmftbandi=1, seed=0):
+    """Returns the content of a DMFT projectors file.
+
+    Parameters
+    ----------
+    nkpt : int, optional
+           The number of kpts.
+    nband : int, optional
+            The number of bands in the DMFT window.
+    nspin : int, optional
+            The number of spins.
+    natom : int, optional
+            The number of correlated atoms.
+    norb : int, optional
+           The number of correlated orbitals.
+    dmftbandi : int, optional
+                The first band of the DMFT window.
+    seed : int, optional
+           The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    dmftbandf = dmftbandi + nband - 1
+    lines = ["# Projectors of the correlated orbitals",
+             f" {dmftbandi} {dmftbandf}"]
+    nvalues = nspin * natom * norb
+    indices = [(s + 1, a + 1, o + 1) for s in range(nspin)
+               for a in range(natom) for o in range(norb)]
+    for ikpt in range(nkpt):
+        lines.append(f" ikpt = {ikpt + 1:6d}")
+        values = rng.uniform(-1, 1, (nband, nvalues, 2))
+        for iband in range(nband):
+            lines.append(f"  iband = {iband + dmftbandi:6d}")
+            lines += [f" {s:4d} {a:4d} {o:4d} {re:18.12f} {im:18.12f}"
+                      for (s, a, o), (re, im) in zip(indices,
+                                                     values[iband])]
+    return "\n".join(lines) + "\n"
+
+
+def self_energy_text(nfrequency=100, seed=0):
+    """Returns the content of a self energy file (matsubara frequencies,
+    real and imaginary parts).
+
+    Parameters
+    ----------
+    nfrequency : int, optional
+                 The number of matsubara frequencies.
+    seed : int, optional
+           The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    frequencies = np.pi * (2 * np.arange(nfrequency) + 1) / 40
+    real = -0.5 + 0.01 * rng.random(nfrequency)
+    imaginary = -0.8 * frequencies / (1 + frequencies ** 2)
+    return "".join(f"{w:20.12f} {re:20.12f} {im:20.12f}\n" for w, re, im in
+                   zip(frequencies, real, imaginary))
+
+
+def _outvars(title, ndtset, ecuts, natom, nkpt, nband):
+    lines = [f" -outvars: {title} --------",
+             "            acell      1.0000000000E+01  1.0000000000E+01"
+             "  1.0000000000E+01 Bohr"]
+    if ndtset > 1:
+        lines.append(f"           ndtset           {ndtset}")
+        for idtset, ecut in enumerate(ecuts):
+            lines.append(f"            ecut{idtset + 1}      {ecut:.8E}"
+                         f" Hartree")
+        for idtset, ecut in enumerate(ecuts):
+            lines.append(f"          etotal{idtset + 1}     "
+                         f"-{8.0 + ecut / 100:.10E}")
+    else:
+        lines.append(f"             ecut      {ecuts[0]:.8E} Hartree")
+        lines.append(f"           etotal     -{8.0 + ecuts[0] / 100:.10E}")
+    lines += ["             iscf           7",
+              f"            natom           {natom}",
+              f"            nband           {nband}",
+              f"             nkpt           {nkpt}",
+              SEPARATOR]
+    return lines
+
+
+def output_text(ndtset=1, nkpt=10, nband=8, natom=2, ecut=10.0,
+                converged=True, completed=True, seed=0):
+    """Returns the content of an ABINIT output file with the input and
+    output variables and, for each dataset, the SCF convergence and the
+    eigenvalues.
+
+    Parameters
+    ----------
+    ndtset : int, optional
+             The number of datasets.
+    nkpt : int, optional
+           The number of kpts.
+    nband : int, optional
+            The number of bands.
+    natom : int, optional
+            The number of atoms.
+    ecut : float, optional
+           The ecut of the first dataset (it increases by 5 Ha for each
+           next dataset). The total energies depend on it.
+    converged : bool, optional
+                If True, the SCF cycles are converged.
+    completed : bool, optional
+                If True, the calculation is completed (the output variables
+                are written).
+    seed : int, optional
+           The random seed.
+    """
+    ecuts = [ecut + 5 * idtset for idtset in range(ndtset)]
+    lines = [".Version 9.0.0 of ABINIT", ""]
+    lines += _outvars("echo values of preprocessed input variables", ndtset,
+                      ecuts, natom, nkpt, nband)
+    for idtset in range(ndtset):
+        lines += ["", f"== DATASET {idtset + 1:2d} " + "=" * 66, ""]
+        for istep in range(1, 6):
+            lines.append(f" ETOT {istep:2d}  -8.{istep:04d}"
+                         f"   -1.0E-{istep:02d} 1.0E-{istep:02d}")
+        if converged:
+            lines.append(" At SCF step    5       vres2   =  1.0E-20 <"
+                         " tolvrs=  1.0E-18 =>converged.")
+        else:
+            lines += [" scprqt:  WARNING -",
+                      "  nstep=    5 was not enough SCF cycles to converge;"]
+        lines.append("")
+        lines += _eig_block(nkpt, nband, occupations=True,
+                            seed=seed + idtset)
+        lines += ["", " Total charge density [el/Bohr^3]", ""]
+    lines.append(" == END DATASET(S) " + "=" * 62)
+    if completed:
+        lines += _outvars("echo values of variables after computation ",
+                          ndtset, ecuts, natom, nkpt, nband)
+        lines += ["",
+                  "- Proc.   0 individual time (sec): cpu=         25.5"
+                  "  wall=         26.1",
+                  "+Overall time at end (sec) : cpu=        102.0"
+                  "  wall=        104.4",
+                  "", " Calculation completed."]
+    return "\n".join(lines) + "\n"
+
+
+def log_text(ndtset=1, nkpt=10, nband=8, natom=2, ecut=10.0, converged=True,
+             completed=True, seed=0):
+    """Returns the content of an ABINIT log file (an output file with the
+    verbose messages of each SCF step).
+
+    The parameters are the same as for output_text.
+    """
+    lines = output_text(ndtset=ndtset, nkpt=nkpt, nband=nband, natom=natom,
+                        ecut=ecut, converged=converged, completed=completed,
+                        seed=seed).split("\n")
+    verbose = []
+    for line in lines:
+        verbose.append(line)
+        if line.startswith(" ETOT"):
+            verbose += [" --- !COMMENT", " message: |",
+                        "    Computing the density from the wavefunctions",
+                        " ..."]
+    return "\n".join(verbose)
+
+
+# text generator of each kind of file (see cli.PARSERS)
+GENERATORS = {"eig": eig_text,
+              "fatband": fatband_text,
+              "dos": dos_text,
+              "dmft_eig": dmft_eig_text,
+              "dmft_projectors": dmft_projectors_text,
+              "self_energy": self_energy_text,
+              "output": output_text,
+              "log": log_text}
+
+
+def write_synthetic_file(path, kind, **kwargs):
+    """Write a synthetic ABINIT file.
+
+    Parameters
+    ----------
+    path : str
+           The path of the file to write.
+    kind : str
+           The kind of file (see GENERATORS).
+    Other kwargs are passed to the generator of this kind of file.
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Invalid kind of file: '{kind}'. Valid ones are:"
+                         f" {list(GENERATORS)}.")
+    with open(path, "w") as f:
+        f.write(GENERATORS[kind](**kwargs))
+    return path
+
+
+# states of the calculations of a synthetic tree
+CALCULATION_STATES = ("not_started", "running", "finished", "unconverged")
+# calculations per group directory in a synthetic tree
+CALCULATIONS_PER_GROUP = 100
+
+
+def make_calculation_tree(top_directory, ncalculations,
+                          states=CALCULATION_STATES, nkpt=4, nband=8,
+                          seed=0):
+    """Write a tree of synthetic calculation directories. Calculations are
+    put in group directories (top_directory/groupXXXX/calcXXXXXX). Each one
+    has an input file and a files file. Calculations which started also
+    have a log file and an output file in a 'run' subdirectory. The ecut
+    of each calculation (10 + index % 20) is the one of its input file and
+    its output and log files.
+
+    Parameters
+    ----------
+    top_directory : str
+                    The top directory of the tree (created if needed).
+    ncalculations : int
+                    The number of calculations.
+    states : list, optional
+             The states of the calculations (see CALCULATION_STATES). They
+             are given in turn to the calculations.
+    nkpt : int, optional
+           The number of kpts in each output file.
+    nband : int, optional
+            The number of bands in each output file.
+    seed : int, optional
+           The random seed.
+
+    Returns
+    -------
+    list : The paths of the calculation directories.
+    """
+    top_directory = os.path.abspath(top_directory)
+    calculations = []
+    for index in range(ncalculations):
+        state = states[index % len(states)]
+        directory = os.path.join(
+                top_directory, f"group{index // CALCULATIONS_PER_GROUP:04d}",
+                f"calc{index:06d}")
+        run = os.path.join(directory, "run")
+        os.makedirs(run, exist_ok=True)
+        ecut = 10 + index % 20
+        with open(os.path.join(directory, "calc.in"), "w") as f:
+            f.write(f"ecut {ecut}\nnband {nband}\n")
+        with open(os.path.join(directory, "calc.files"), "w") as f:
+            f.write("\n".join([os.path.join(directory, "calc.in"),
+                               os.path.join(run, "calc.out"),
+                               os.path.join(run, "idat"),
+                               os.path.join(run, "odat"),
+                               os.path.join(run, "tmp"),
+                               "pseudo.psp8"]) + "\n")
+        if state != "not_started":
+            completed = state != "running"
+            kwargs = {"nkpt": nkpt, "nband": nband, "ecut": float(ecut),
+                      "converged": state != "unconverged",
+                      "completed": completed, "seed": seed + index}
+            write_synthetic_file(os.path.join(run, "calc.log"), "log",
+                                 **kwargs)
+            write_synthetic_file(os.path.join(run, "calc.out"), "output",
+                                 **kwargs)
+        calculations.append(directory)
+    return calculations
@@ -0,0 +1,96 @@
+from abioutput.aio import aiter_parse, aparse, astatus
+from abioutput.parsers.output_subparsers import EIGParser
+from abioutput.unittests.synthetic import (make_calculation_tree,
+                                           write_synthetic_file)
+from abioutput.utils.builders import TreeBuilder
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+async def collect(iterator):
+    return [x async for x in iterator]
+
+
+class ParseTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.paths = [write_synthetic_file(
+                          os.path.join(self.tmpdir.name, f"calc{i}_o_EIG"),
+                          "eig", nkpt=4 + i, nband=3)
+                      for i in range(4)]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _assert_parsed(self, path, parser):
+        np.testing.assert_array_equal(
+                parser.data["eigenvalues"],
+                EIGParser.from_file(path).data["eigenvalues"])
+
+    def test_aparse(self):
+        parser = asyncio.run(aparse(self.paths[0]))
+        self._assert_parsed(self.paths[0], parser)
+
+    def test_aiter_parse(self):
+        for executor in (None, ThreadPoolExecutor(2), ProcessPoolExecutor(2)):
+            with self.subTest(executor=executor):
+                pairs = asyncio.run(collect(aiter_parse(self.paths,
+                                                        executor=executor)))
+                if executor is not None:
+                    executor.shutdown()
+                self.assertEqual(sorted(path for path, parser in pairs),
+                                 self.paths)
+                for path, parser in pairs:
+                    self._assert_parsed(path, parser)
+
+    def test_errors(self):
+        paths = self.paths + [os.path.join(self.tmpdir.name, "unknown")]
+        pairs = dict(asyncio.run(collect(aiter_parse(
+                paths, max_concurrency=2,
+                on_error=lambda path, error: "error"))))
+        self.assertEqual(pairs[paths[-1]], "error")
+        with self.assertRaises(ValueError):
+            asyncio.run(collect(aiter_parse(paths)))
+
+
+class StatusTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.top = os.path.join(self.tmpdir.name, "tree")
+        make_calculation_tree(self.top, 6)
+        self.cache = os.path.join(self.tmpdir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_astatus(self):
+        expected = TreeBuilder(self.top, max_workers=1).status
+        with ThreadPoolExecutor(2) as executor:
+            statuses = asyncio.run(collect(astatus(self.top,
+                                                   executor=executor,
+                                                   cache=self.cache,
+                                                   max_concurrency=2)))
+        # yielded as they come
+        self.assertEqual(sorted(statuses, key=lambda x: x["path"]),
+                         sorted(expected, key=lambda x: x["path"]))
+
+    def test_builder_astatus(self):
+        builder = TreeBuilder(self.top, max_workers=2)
+        statuses = asyncio.run(collect(builder.astatus()))
+        self.assertEqual(len(statuses), 6)
+        # the status property is updated in the tree order
+        self.assertEqual([status["path"] for status in builder.status],
+                         [calc.path for calc in builder.tree])
+
+    def test_processes(self):
+        with ProcessPoolExecutor(2) as executor:
+            with self.assertRaises(TypeError):
+                asyncio.run(collect(astatus(self.top, executor=executor,
+                                            cache=self.cache)))
+            builder = TreeBuilder(self.top, cache=self.cache)
+            with self.assertRaises(TypeError):
+                asyncio.run(collect(builder.astatus(executor=executor)))
@@ -0,0 +1,244 @@
+from abioutput.bandstructure import (Bandstructure, downsample_bands,
+                                     get_band_edges, get_output_eigenvalues)
+from abioutput.parsers.output_parser import OutputParser
+from abioutput.unittests.synthetic import write_synthetic_file
+from unittest import mock
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+class KpathTest(unittest.TestCase):
+    def setUp(self):
+        # Gamma -> X (5 kpts), then a jump to L -> Gamma (2 kpts only)
+        kpts = np.concatenate((
+            np.linspace((0, 0, 0), (0.5, 0, 0), 5),
+            np.linspace((0.5, 0.5, 0.5), (0, 0, 0), 2)))
+        self.structure = Bandstructure(kpts, np.zeros((len(kpts), 2)))
+
+    def test_no_jump_by_default(self):
+        # the long segment L -> Gamma is kept as is
+        distances, breaks = self.structure.get_kpath()
+        self.assertEqual(len(breaks), 0)
+        np.testing.assert_allclose(np.diff(distances),
+                                   [0.125] * 4 + [np.sqrt(0.5),
+                                                  np.sqrt(0.75)])
+
+    def test_breaks(self):
+        distances, breaks = self.structure.get_kpath(breaks=[5])
+        np.testing.assert_array_equal(breaks, [5])
+        self.assertEqual(distances[5], distances[4])
+        np.testing.assert_allclose(distances[-1], 0.5 + np.sqrt(0.75))
+        with self.assertRaises(ValueError):
+            self.structure.get_kpath(breaks=[0])
+        with self.assertRaises(ValueError):
+            self.structure.get_kpath(breaks=[7])
+
+    def test_jump_factor(self):
+        # opt-in heuristic: the sparse L -> Gamma segment is a jump too
+        distances, breaks = self.structure.get_kpath(jump_factor=5)
+        np.testing.assert_array_equal(breaks, [5, 6])
+        distances, breaks = self.structure.get_kpath(jump_factor=10)
+        self.assertEqual(len(breaks), 0)
+
+    def test_repeated_kpts(self):
+        # most kpts are repeated: only the real jump is a jump
+        kpts = [(0, 0, 0)] * 4 + [(0.1, 0, 0)] * 4 + [(0.2, 0, 0), (1, 1, 1)]
+        structure = Bandstructure(kpts, np.zeros((len(kpts), 2)))
+        distances, breaks = structure.get_kpath(jump_factor=5)
+        np.testing.assert_array_equal(breaks, [9])
+        np.testing.assert_allclose(distances[-2:], [0.2, 0.2])
+
+    def test_plot_jump_factor(self):
+        with mock.patch.object(self.structure, "get_kpath",
+                               wraps=self.structure.get_kpath) as get_kpath:
+            plot = self.structure.plot(show=False, jump_factor=5)
+        get_kpath.assert_called_once_with(breaks=None, jump_factor=5)
+        # the curves are broken at both jumps
+        for curve in plot._curves:
+            self.assertEqual(np.isnan(curve.xdata).sum(), 2)
+
+
+class DownsampleTest(unittest.TestCase):
+    def test_min_max(self):
+        # two bins of 5 points: their minimum and maximum are kept
+        xs = np.arange(10)
+        band = [3, 1, 4, 1.5, 5, 9, 2, 6, 5.5, 3.5]
+        kept = downsample_bands(xs, band, 2)
+        self.assertEqual(kept.shape, (1, 10))
+        np.testing.assert_array_equal(np.flatnonzero(kept[0]), [1, 4, 5, 6])
+
+    def test_bands_independent(self):
+        xs = np.arange(6)
+        bands = [[0, 1, 2, 3, 4, 5], [5, 4, 3, 2, 1, 0]]
+        kept = downsample_bands(xs, bands, 2)
+        np.testing.assert_array_equal(kept, [[1, 0, 1, 1, 0, 1],
+                                             [1, 0, 1, 1, 0, 1]])
+        # ties are all kept
+        kept = downsample_bands(xs, [[1, 1, 1, 2, 0, 2]], 2)
+        np.testing.assert_array_equal(kept[0], [1, 1, 1, 1, 1, 1])
+
+    def test_last_partial_bin(self):
+        # the last point (at the end of the x axis) is in the last bin
+        # which has more points than the others
+        xs = np.arange(7)
+        band = [0, 1, 0, 1, 4, 2, 3]
+        kept = downsample_bands(xs, band, 3)
+        np.testing.assert_array_equal(np.flatnonzero(kept[0]),
+                                      [0, 1, 2, 3, 4, 5])
+        kept = downsample_bands(xs, [0, 1, 0, 1, 2, 3, 4], 3)
+        np.testing.assert_array_equal(np.flatnonzero(kept[0]),
+                                      [0, 1, 2, 3, 4, 6])
+
+    def test_empty_bins(self):
+        # no point between 0.1 and 9: the bins in between are empty
+        xs = [0, 0.05, 0.1, 9, 9.5, 10]
+        band = [1, 3, 2, 5, 4, 6]
+        kept = downsample_bands(xs, band, 100)
+        np.testing.assert_array_equal(kept[0], [1, 1, 1, 1, 1, 1])
+        kept = downsample_bands(xs, band, 2)
+        np.testing.assert_array_equal(np.flatnonzero(kept[0]), [0, 1, 4, 5])
+
+    def test_fewer_points_than_bins(self):
+        # nothing is removed
+        xs = np.linspace(0, 1, 5)
+        bands = np.random.default_rng(0).normal(size=(3, 5))
+        for nbins in (5, 100):
+            kept = downsample_bands(xs, bands, nbins)
+            self.assertTrue(kept.all())
+        # a single point or repeated x
+        self.assertTrue(downsample_bands([0], [[1.0]], 10).all())
+        kept = downsample_bands([1, 1, 1], [2, 1, 3], 10)
+        np.testing.assert_array_equal(kept[0], [0, 1, 1])
+
+    def test_keep(self):
+        xs = np.arange(10)
+        band = np.arange(10.0)
+        kept = downsample_bands(xs, band, 1, keep=[4, 7])
+        np.testing.assert_array_equal(np.flatnonzero(kept[0]), [0, 4, 7, 9])
+
+
+class BandEdgesTest(unittest.TestCase):
+    def setUp(self):
+        # (nstruct=2, nkpt=3, nband=3)
+        self.eigenvalues = np.array([[[-1.0, 0.0, 2.0],
+                                      [-1.0, 0.5, 1.0],
+                                      [-1.0, 0.2, 1.5]],
+                                     [[-2.0, 0.0, 3.0],
+                                      [-2.0, 1.0, 2.0],
+                                      [-2.0, 0.5, 4.0]]])
+        self.kpts = np.linspace((0, 0, 0), (0.5, 0, 0), 3)
+
+    def test_edges(self):
+        edges = get_band_edges(self.eigenvalues, fermi_band=1,
+                               kpts=self.kpts)
+        np.testing.assert_allclose(edges["vbm"], [0.5, 1.0])
+        np.testing.assert_allclose(edges["cbm"], [1.0, 2.0])
+        np.testing.assert_allclose(edges["gap"], [0.5, 1.0])
+        np.testing.assert_array_equal(edges["vbm_kpt"], [1, 1])
+        np.testing.assert_array_equal(edges["cbm_kpt"], [1, 1])
+        np.testing.assert_array_equal(edges["is_direct"], [True, True])
+        np.testing.assert_allclose(edges["vbm_coordinates"][0],
+                                   (0.25, 0, 0))
+        # the fermi band per structure
+        edges = get_band_edges(self.eigenvalues, fermi_band=[0, 1])
+        np.testing.assert_allclose(edges["gap"], [1.0, 1.0])
+        np.testing.assert_array_equal(edges["cbm_kpt"], [0, 1])
+        np.testing.assert_allclose(edges["direct_gap"], [1.0, 1.0])
+        np.testing.assert_array_equal(edges["direct_gap_kpt"], [0, 1])
+
+    def test_fermi_energy(self):
+        edges = get_band_edges(self.eigenvalues, fermi_energy=0.8)
+        np.testing.assert_allclose(edges["vbm"], [0.5, 0.5])
+        np.testing.assert_allclose(edges["cbm"], [1.0, 1.0])
+        with self.assertRaises(ValueError):
+            get_band_edges(self.eigenvalues)
+
+    def test_polarized(self):
+        # spin down shifted up: the cbm is in spin up, the vbm in spin down
+        eigenvalues = np.stack((self.eigenvalues, self.eigenvalues + 0.1),
+                               axis=1)
+        edges = get_band_edges(eigenvalues, fermi_band=[[1, 1], [1, 1]])
+        np.testing.assert_allclose(edges["vbm"], [0.6, 1.1])
+        np.testing.assert_array_equal(edges["vbm_spin"], [1, 1])
+        np.testing.assert_array_equal(edges["cbm_spin"], [0, 0])
+        np.testing.assert_array_equal(edges["is_direct"], [False, False])
+        with self.assertRaises(ValueError):
+            get_band_edges(self.eigenvalues, fermi_band=[[1, 1], [1, 1]])
+
+    def test_bandstructure_edges(self):
+        structure = Bandstructure(self.kpts, self.eigenvalues[0],
+                                  fermi_band=1)
+        edges = structure.get_band_edges()
+        self.assertAlmostEqual(edges["gap"], 0.5)
+        np.testing.assert_allclose(edges["cbm_coordinates"], (0.25, 0, 0))
+        edges = get_band_edges([structure, structure])
+        np.testing.assert_allclose(edges["vbm"], [0.5, 0.5])
+
+
+class OutputEigenvaluesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = write_synthetic_file(
+                os.path.join(self.tmpdir.name, "calc.out"), "output",
+                ndtset=3, nkpt=4, nband=6)
+        self.parser = OutputParser(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _get_data(self, dataset):
+        return self.parser.data_per_dtset[dataset - 1]["eigenvalues"]
+
+    def test_from_output(self):
+        structure = Bandstructure.from_output(self.parser, dataset=2,
+                                              fermi_band=2)
+        data = self._get_data(2)
+        # the arrays of the parser are not copied
+        self.assertIs(structure.eigenvalues, data["eigenvalues"])
+        np.testing.assert_array_equal(structure.kpts, data["coordinates"])
+        self.assertEqual(structure.fermi_band, 2)
+        with self.assertRaises(ValueError):
+            Bandstructure.from_output(self.parser, dataset=4)
+        # the spin is only used for spin polarized data
+        structure = Bandstructure.from_output(self.parser, spin="up")
+        np.testing.assert_array_equal(structure.eigenvalues,
+                                      self._get_data(1)["eigenvalues"])
+
+    def test_from_output_datasets(self):
+        structures = Bandstructure.from_output_datasets(self.parser)
+        self.assertEqual(len(structures), 3)
+        for dataset, structure in enumerate(structures, 1):
+            np.testing.assert_array_equal(
+                    structure.eigenvalues,
+                    self._get_data(dataset)["eigenvalues"])
+        structures = Bandstructure.from_output_datasets(self.parser,
+                                                        datasets=[3, 1])
+        np.testing.assert_array_equal(structures[0].eigenvalues,
+                                      self._get_data(3)["eigenvalues"])
+
+    def test_selected_datasets(self):
+        parser = OutputParser(self.path, datasets=[2],
+                              sections=["eigenvalues"])
+        structures = Bandstructure.from_output_datasets(parser)
+        self.assertEqual(len(structures), 1)
+        np.testing.assert_array_equal(structures[0].eigenvalues,
+                                      self._get_data(2)["eigenvalues"])
+        # the dataset exists but was not parsed
+        with self.assertRaises(ValueError):
+            Bandstructure.from_output(parser, dataset=1)
+
+    def test_get_output_eigenvalues(self):
+        eigenvalues, kpts = get_output_eigenvalues(self.parser)
+        self.assertEqual(eigenvalues.shape, (3, 4, 6))
+        self.assertEqual(kpts.shape, (3, 4, 3))
+        for index in range(3):
+            np.testing.assert_array_equal(
+                    eigenvalues[index],
+                    self._get_data(index + 1)["eigenvalues"])
+        eigenvalues, kpts = get_output_eigenvalues(self.parser,
+                                                   datasets=[2])
+        self.assertEqual(eigenvalues.shape, (1, 4, 6))
+        with self.assertRaises(LookupError):
+            get_output_eigenvalues(self.parser, datasets=[])
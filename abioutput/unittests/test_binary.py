@@ -0,0 +1,80 @@
+from abioutput.parsers.loader import PARSERS, load_file
+from abioutput.parsers.binary import get_binary_format, h5py
+from abioutput.parsers.dos_parser import DOSParser
+from abioutput.parsers.filesfile_parser import FilesFileParser
+from abioutput.parsers.output_subparsers import EIGParser
+from abioutput.unittests.synthetic import write_synthetic_file
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+# small files of each kind of data
+KWARGS = {"eig": {"nkpt": 6, "nband": 5, "occupations": True},
+          "fatband": {"nkpt": 6, "nband": 5},
+          "dos": {"nenergy": 20},
+          "dmft_eig": {"nkpt": 4, "nband": 3, "nspin": 2},
+          "dmft_projectors": {"nkpt": 2, "nband": 3},
+          "self_energy": {"nfrequency": 20}}
+EXTENSIONS = [".npz"]
+if h5py is not None:
+    EXTENSIONS.append(".h5")
+
+
+class BinaryMixinTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _assert_same_data(self, parser, loaded):
+        arrays, attributes, dimensions = parser._to_binary()
+        loaded_arrays, loaded_attributes, loaded_dimensions = (
+                loaded._to_binary())
+        self.assertEqual(set(arrays), set(loaded_arrays))
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(np.asarray(loaded_arrays[name]),
+                                          np.asarray(array))
+        self.assertEqual(loaded_attributes, attributes)
+        self.assertEqual(loaded.describe(), parser.describe())
+
+    def test_round_trip(self):
+        for kind in PARSERS:
+            path = os.path.join(self.tmpdir.name, kind)
+            write_synthetic_file(path, kind, **KWARGS[kind])
+            parser = load_file(path, kind=kind)
+            for extension in EXTENSIONS:
+                with self.subTest(kind=kind, extension=extension):
+                    parser.save(path + extension)
+                    loaded = type(parser).load(path + extension, lazy=False)
+                    self._assert_same_data(parser, loaded)
+
+    def test_polarized_eig(self):
+        path = os.path.join(self.tmpdir.name, "calc_o_EIG")
+        write_synthetic_file(path, "eig", nkpt=4, nband=3, polarized=True)
+        parser = EIGParser.from_file(path)
+        for extension in EXTENSIONS:
+            parser.save(path + extension)
+            loaded = EIGParser.load(path + extension, lazy=False)
+            self._assert_same_data(parser, loaded)
+
+    def test_wrong_kind(self):
+        path = os.path.join(self.tmpdir.name, "calc_o_EIG")
+        write_synthetic_file(path, "eig", nkpt=4, nband=3)
+        EIGParser.from_file(path).save(path + ".npz")
+        with self.assertRaises(TypeError):
+            DOSParser.load(path + ".npz")
+        # the kind is read from the file by the cli
+        self.assertIsInstance(load_file(path + ".npz"), EIGParser)
+
+    def test_no_binary_support(self):
+        # the files file has no array data to save
+        self.assertFalse(hasattr(FilesFileParser, "save"))
+        self.assertFalse(hasattr(FilesFileParser, "load"))
+
+    def test_binary_format(self):
+        self.assertEqual(get_binary_format("data.npz"), "npz")
+        with self.assertRaises(ValueError):
+            get_binary_format("data.txt")
@@ -0,0 +1,75 @@
+from abioutput.utils.calculation_dir import CalculationDir
+from abioutput.utils.status_cache import StatusCache
+from abioutput.unittests.synthetic import make_calculation_tree
+from unittest import mock
+import os
+import tempfile
+import unittest
+
+
+VARIABLES = ["ecut", "etotal", "natom"]
+
+
+class CalculationDirTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.paths = make_calculation_tree(
+                os.path.join(self.tmpdir.name, "tree"), 4)
+        self.cache = StatusCache(os.path.join(self.tmpdir.name,
+                                              "status.sqlite"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_attributes_not_finished(self):
+        for path in self.paths[:2]:
+            record = CalculationDir(path).get_attributes(VARIABLES,
+                                                         convergence=True)
+            self.assertFalse(record["status"]["calculation_finished"])
+            self.assertIsNone(record["convergence"])
+            self.assertEqual(record["variables"], {})
+
+    def test_attributes(self):
+        finished, unconverged = self.paths[2:]
+        record = CalculationDir(finished).get_attributes(VARIABLES,
+                                                         convergence=True)
+        self.assertIs(record["convergence"], True)
+        self.assertEqual(record["variables"]["natom"], 2)
+        self.assertEqual(set(record["variables"]), set(VARIABLES))
+        record = CalculationDir(unconverged).get_attributes(
+                VARIABLES, convergence=True)
+        self.assertIs(record["convergence"], False)
+
+    def test_attributes_in_one_pass(self):
+        # with a known status, the status is not computed again and the
+        # cache is written once for all the variables
+        calc = CalculationDir(self.paths[2], cache=self.cache)
+        status = calc.status
+        calc = CalculationDir(self.paths[2], cache=self.cache)
+        no_status = mock.PropertyMock(side_effect=AssertionError)
+        with mock.patch.object(CalculationDir, "status", no_status), \
+                mock.patch.object(self.cache, "set",
+                                  wraps=self.cache.set) as cache_set:
+            record = calc.get_attributes(VARIABLES, convergence=True,
+                                         status=status)
+            self.assertEqual(cache_set.call_count, 1)
+            # everything is cached now => nothing is written
+            self.assertEqual(calc.get_attributes(VARIABLES, convergence=True,
+                                                 status=status), record)
+            self.assertEqual(cache_set.call_count, 1)
+        cached = self.cache.get(calc.path, calc.fingerprint)
+        self.assertEqual(set(cached["variables"]), set(VARIABLES))
+        self.assertIs(cached["convergence"], True)
+
+    def test_synthetic_tree(self):
+        # each calculation has the ecut of its input file in its output
+        # and the unconverged ones are unconverged in their log too
+        paths = make_calculation_tree(os.path.join(self.tmpdir.name, "tree2"),
+                                      8, states=("finished", "unconverged"))
+        ecuts = [CalculationDir(path).get_attributes(["ecut"])["variables"]
+                 ["ecut"] for path in paths]
+        self.assertEqual(ecuts, [10 + index for index in range(8)])
+        for path in paths[1::2]:
+            with open(os.path.join(path, "run", "calc.log")) as f:
+                self.assertIn("not enough SCF cycles", f.read())
@@ -0,0 +1,154 @@
+from abioutput.cli import get_argument_parser, main
+from abioutput.unittests.synthetic import (make_calculation_tree,
+                                           write_synthetic_file)
+import contextlib
+import csv
+import io
+import json
+import numpy as np
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+def run(*argv):
+    # returns the exit code and the standard output of the cli
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        code = main(list(argv))
+    return code, stdout.getvalue()
+
+
+class StatusCommandTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.top = os.path.join(self.tmpdir.name, "tree")
+        # 2 not started, 2 running, 4 finished (2 unconverged)
+        make_calculation_tree(self.top, 8)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_status(self):
+        code, output = run("status", self.top, "-j", "2")
+        self.assertEqual(code, 0)
+        self.assertEqual(output.count("COMPLETED"), 4)
+        self.assertEqual(output.count("NOT STARTED"), 2)
+        self.assertEqual(output.count("NOT REACHED"), 2)
+
+    def test_delta(self):
+        code, output = run("status", self.top, "-a", "ecut", "etotal",
+                           "--sortby", "ecut", "--delta", "etotal",
+                           "--delta-type", "absolute")
+        self.assertEqual(code, 0)
+        self.assertIn("delta_etotal (abs)", output)
+
+    def test_jobs(self):
+        # the TreeBuilder chooses the number of threads unless given
+        args = get_argument_parser().parse_args(["status", self.top])
+        self.assertIsNone(args.jobs)
+        with mock.patch("abioutput.utils.builders.TreeBuilder.__init__",
+                        side_effect=RuntimeError) as init:
+            for argv, expected in (([], None), (["-j", "3"], 3)):
+                with self.assertRaises(RuntimeError):
+                    run("status", self.top, *argv)
+                self.assertEqual(init.call_args.kwargs.get("max_workers"),
+                                 expected)
+
+    def test_invalid_delta_type(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                run("status", self.top, "--sortby", "ecut", "--delta",
+                    "etotal", "--delta-type", "relative")
+
+    def test_export(self):
+        for extension in ("csv", "jsonl", "npz"):
+            path = os.path.join(self.tmpdir.name, "report." + extension)
+            code, output = run("status", self.top, "-a", "status", "ecut",
+                               "etotal", "--sortby", "ecut", "--delta",
+                               "etotal", "-o", path)
+            self.assertEqual(code, 0)
+            self.assertTrue(os.path.isfile(path))
+        with open(os.path.join(self.tmpdir.name, "report.csv")) as f:
+            rows = list(csv.DictReader(f))
+        ecuts = [float(row["ecut"]) for row in rows if row["ecut"]]
+        self.assertEqual(len(ecuts), 4)
+        self.assertEqual(ecuts, sorted(ecuts))
+        with np.load(os.path.join(self.tmpdir.name, "report.npz")) as data:
+            self.assertEqual(data["ecut_mask"].sum(), 4)
+            self.assertIn("delta_etotal (%)", data.files)
+
+    def test_export_stdout(self):
+        code, output = run("status", self.top, "-a", "status", "natom",
+                           "-o", "-", "--format", "jsonl")
+        self.assertEqual(code, 0)
+        rows = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(sorted(row["natom"] for row in rows
+                                if row["natom"] is not None), [2] * 4)
+
+
+class FilesCommandsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.eig = write_synthetic_file(
+                os.path.join(self.tmpdir.name, "calc_o_EIG"), "eig",
+                nkpt=5, nband=4)
+        self.output = write_synthetic_file(
+                os.path.join(self.tmpdir.name, "calc.out"), "output",
+                ecut=15.0)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_parse(self):
+        code, output = run("parse", self.eig, self.output, "--variables",
+                           "ecut", "natom")
+        self.assertEqual(code, 0)
+        eig, out = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(eig["kind"], "eig")
+        self.assertEqual(eig["path"], self.eig)
+        self.assertEqual(out["variables"]["ecut"][0], 15.0)
+        self.assertEqual(out["variables"]["natom"][0], 2)
+
+    def test_file_kinds(self):
+        self_energy = write_synthetic_file(
+                os.path.join(self.tmpdir.name,
+                             "calc_o_DS2Self-omega_iatom0001_isppol1"),
+                "self_energy", nfrequency=10)
+        code, output = run("parse", self_energy)
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(output)["kind"], "self_energy")
+        # projectors files are never detected: the kind must be given
+        projectors = write_synthetic_file(
+                os.path.join(self.tmpdir.name, "projectors"),
+                "dmft_projectors", nkpt=2, nband=3)
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            code, output = run("parse", projectors)
+        self.assertEqual(code, 1)
+        self.assertIn("dmft_projectors", stderr.getvalue())
+        code, output = run("parse", projectors, "-t", "dmft_projectors")
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(output)["kind"], "dmft_projectors")
+
+    def test_parse_error(self):
+        missing = os.path.join(self.tmpdir.name, "missing_EIG")
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            code, output = run("parse", missing, self.eig)
+        self.assertEqual(code, 1)
+        self.assertIn("missing_EIG", stderr.getvalue())
+        # the other files are parsed anyway
+        self.assertEqual(len(output.splitlines()), 1)
+
+    def test_convert(self):
+        code, output = run("convert", self.eig, "--binary-format", "npz",
+                           "-d", self.tmpdir.name)
+        self.assertEqual(code, 0)
+        binary_path = output.strip()
+        self.assertEqual(binary_path, self.eig + ".npz")
+        # the binary file is loaded by the parse command
+        code, output = run("parse", binary_path, "--data")
+        summary = json.loads(output)
+        self.assertEqual(summary["kind"], "eig")
+        self.assertEqual(np.shape(summary["data"]["eigenvalues"]), (5, 4))
@@ -0,0 +1,56 @@
+from abioutput.parsers.dmft import DMFTEigParser, DMFTProjectorsParser
+from abioutput.unittests.synthetic import (dmft_eig_text,
+                                           dmft_projectors_text)
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+class DMFTParsersTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "dmft")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, text):
+        with open(self.path, "w") as f:
+            f.write(text)
+
+    def test_eig(self):
+        text = dmft_eig_text(nkpt=3, nband=2, nspin=2, dmftbandi=4)
+        self._write(text)
+        parser = DMFTEigParser(self.path)
+        self.assertEqual(parser.data.shape, (2, 3, 2))
+        self.assertEqual((parser.dmftbandi, parser.dmftbandf), (4, 5))
+        # the values are written times 2 in the file
+        first = float(text.splitlines()[7].split()[-1])
+        self.assertEqual(parser.data[0, 0, 0], first / 2)
+
+    def test_eig_missing_band(self):
+        lines = dmft_eig_text(nkpt=3, nband=2).splitlines()
+        self._write("\n".join(lines[:-1]) + "\n")
+        with self.assertRaises(ValueError):
+            DMFTEigParser(self.path)
+
+    def test_projectors(self):
+        text = dmft_projectors_text(nkpt=2, nband=3, nspin=2, natom=1,
+                                    norb=2)
+        self._write(text)
+        parser = DMFTProjectorsParser(self.path)
+        self.assertEqual(parser.data.shape, (2, 3, 2, 1, 2))
+        self.assertEqual(parser.data.dtype, complex)
+        # last value: last kpt, band, spin and orbital
+        re, im = map(float, text.splitlines()[-1].split()[-2:])
+        self.assertEqual(parser.data[-1, -1, -1, -1, -1], re + 1j * im)
+        np.testing.assert_array_equal(parser.data.real[0, 0, 0, 0],
+                                      [float(line.split()[-2]) for line in
+                                       text.splitlines()[4:6]])
+
+    def test_projectors_missing_value(self):
+        lines = dmft_projectors_text(nkpt=2, nband=3).splitlines()
+        self._write("\n".join(lines[:-1]) + "\n")
+        with self.assertRaises(ValueError):
+            DMFTProjectorsParser(self.path)
@@ -0,0 +1,48 @@
+from abioutput.parsers.output_subparsers import EIGParser
+from abioutput.unittests.synthetic import eig_text, write_synthetic_file
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+class EIGParserTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "calc_o_EIG")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_varying_nband(self):
+        # remove the last eigenvalue of the second kpt
+        lines = eig_text(nkpt=3, nband=5, occupations=True).splitlines()
+        kpt = [i for i, line in enumerate(lines)
+               if line.startswith(" kpt#")][1]
+        lines[kpt + 1] = lines[kpt + 1][:-10]
+        lines[kpt + 3] = lines[kpt + 3][:-10]
+        with open(self.path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        with self.assertLogs("EIGParser", level="WARNING"):
+            parser = EIGParser.from_file(self.path)
+        self.assertEqual(parser.data["nbands"], 5)
+        for name in ("eigenvalues", "occupations"):
+            values = parser.data[name]
+            self.assertEqual(values.shape, (3, 5))
+            self.assertTrue(np.isnan(values[1, 4]))
+            self.assertFalse(np.isnan(np.delete(values.ravel(), 9)).any())
+
+    def test_float32_round_trip(self):
+        write_synthetic_file(self.path, "eig", nkpt=6, nband=5,
+                             occupations=True)
+        reference = EIGParser.from_file(self.path)
+        parser = EIGParser.from_file(self.path, dtype=np.float32)
+        parser.save(self.path + ".npz")
+        loaded = EIGParser.load(self.path + ".npz", lazy=False)
+        for name in ("eigenvalues", "occupations"):
+            self.assertEqual(parser.data[name].dtype, np.float32)
+            self.assertEqual(loaded.data[name].dtype, np.float32)
+            np.testing.assert_array_equal(loaded.data[name],
+                                          parser.data[name])
+            np.testing.assert_allclose(loaded.data[name],
+                                       reference.data[name], rtol=1e-6)
@@ -0,0 +1,105 @@
+from abioutput.bandstructure import Bandstructure
+from abioutput.parsers.binary import h5py
+from abioutput.parsers.eig_store import (EigenvalueStore,
+                                         EigenvalueStoreWriter)
+from abioutput.parsers.output_subparsers import EIGParser
+from abioutput.unittests.synthetic import write_synthetic_file
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+@unittest.skipIf(h5py is None, "h5py is not installed.")
+class EigenvalueStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "calc_o_EIG")
+        write_synthetic_file(self.path, "eig", nkpt=23, nband=6,
+                             occupations=True)
+        self.parser = EIGParser.from_file(self.path)
+        # chunks do not divide the number of kpts
+        self.store = EIGParser.to_store(self.path, self.path + ".h5",
+                                        chunk_nkpt=5)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_same_data_as_parser(self):
+        self.assertEqual((self.store.nkpt, self.store.nband), (23, 6))
+        self.assertEqual(self.store.chunk_nkpt, 5)
+        for name in ("eigenvalues", "coordinates", "occupations"):
+            np.testing.assert_array_equal(getattr(self.store, name)[()],
+                                          self.parser.data[name])
+        self.assertEqual(self.store.units, self.parser.data["units"])
+        # the store is a regular binary file
+        loaded = EIGParser.load(self.path + ".h5", lazy=False)
+        np.testing.assert_array_equal(loaded.data["eigenvalues"],
+                                      self.parser.data["eigenvalues"])
+
+    def test_chunks(self):
+        starts = [start for start, chunk in self.store.iter_chunks()]
+        self.assertEqual(starts, [0, 5, 10, 15, 20])
+        chunks = [chunk for start, chunk in
+                  self.store.iter_chunks("coordinates")]
+        np.testing.assert_array_equal(np.concatenate(chunks),
+                                      self.parser.data["coordinates"])
+
+    def test_reductions(self):
+        eigenvalues = self.parser.data["eigenvalues"]
+        minima, maxima = self.store.band_extrema()
+        np.testing.assert_array_equal(minima, eigenvalues.min(axis=0))
+        np.testing.assert_array_equal(maxima, eigenvalues.max(axis=0))
+        edges = self.store.band_edges(2)
+        self.assertEqual(edges["gap"], minima[3] - maxima[2])
+        counts, bin_edges = self.store.histogram(bins=10)
+        np.testing.assert_array_equal(
+                counts, np.histogram(eigenvalues, bins=bin_edges)[0])
+        energies, dos = self.store.dos(0.01)
+        # normalized per kpt: the integral is the number of bands
+        integral = dos.sum() * (energies[1] - energies[0])
+        self.assertAlmostEqual(integral, 6, places=2)
+
+    def test_from_store(self):
+        structure = Bandstructure.from_store(self.path + ".h5",
+                                             kpts=slice(5, 12),
+                                             conversion_factor=2)
+        np.testing.assert_allclose(
+                structure.eigenvalues,
+                2 * self.parser.data["eigenvalues"][5:12])
+        np.testing.assert_array_equal(
+                structure.kpts, self.parser.data["coordinates"][5:12])
+        structure = Bandstructure.from_store(self.path + ".h5",
+                                             dtype=np.float32)
+        self.assertEqual(structure.eigenvalues.dtype, np.float32)
+        self.assertEqual(structure.eigenvalues.shape, (23, 6))
+
+    def test_polarized(self):
+        path = os.path.join(self.tmpdir.name, "polarized_o_EIG")
+        write_synthetic_file(path, "eig", nkpt=7, nband=4, polarized=True)
+        parser = EIGParser.from_file(path)
+        EIGParser.to_store(path, path + ".h5", chunk_nkpt=3).close()
+        for spin in ("up", "down"):
+            with EigenvalueStore(path + ".h5", spin=spin) as store:
+                np.testing.assert_array_equal(
+                        store.eigenvalues[()],
+                        parser.data[spin]["eigenvalues"])
+        with self.assertRaises(ValueError):
+            EigenvalueStore(path + ".h5")
+
+    def test_writer_without_nkpt(self):
+        # the chunks have the default size when the number of kpts is not
+        # known in advance
+        path = os.path.join(self.tmpdir.name, "writer.h5")
+        with EigenvalueStoreWriter(path, chunk_nkpt=4) as writer:
+            writer.start_spin("hartree")
+            for ikpt in range(10):
+                writer.add_kpt([0, 0, ikpt], np.arange(3) + ikpt)
+            with self.assertRaises(ValueError):
+                writer.add_kpt([0, 0, 0], np.arange(2))
+        with EigenvalueStore(path) as store:
+            self.assertEqual(store.chunk_nkpt, 4)
+            self.assertEqual((store.nkpt, store.nband), (10, 3))
+            np.testing.assert_array_equal(store.eigenvalues[:, 0],
+                                          np.arange(10))
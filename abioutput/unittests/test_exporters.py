@@ -0,0 +1,107 @@
+from abioutput.utils.exporters import (CSVExporter, JSONLinesExporter,
+                                       NPZExporter, get_exporter)
+import csv
+import json
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+COLUMNS = ["calculations", "status", "convergence", "ecut", "etotal",
+           "kpt"]
+ROWS = [{"calculations": "calc1", "status": "COMPLETED",
+         "convergence": True, "ecut": np.int64(10), "etotal": -8.1,
+         "kpt": (0.0, 0.5, 0.0)},
+        {"calculations": "calc2", "status": "NOT FINISHED",
+         "convergence": None, "ecut": None, "etotal": np.nan,
+         "kpt": None},
+        {"calculations": "calc3", "status": "COMPLETED",
+         "convergence": False, "ecut": 20, "etotal": np.float64(-8.2),
+         "kpt": np.array([0.5, 0.5, 0.5])}]
+
+
+class ExportersTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _export(self, extension):
+        path = os.path.join(self.tmpdir.name, "report" + extension)
+        with get_exporter(path, COLUMNS) as exporter:
+            for row in ROWS:
+                exporter.write_row(row)
+        return path
+
+    def test_get_exporter(self):
+        for extension, cls in ((".csv", CSVExporter),
+                               (".jsonl", JSONLinesExporter),
+                               (".npz", NPZExporter)):
+            path = os.path.join(self.tmpdir.name, "report" + extension)
+            exporter = get_exporter(path, COLUMNS)
+            self.assertIsInstance(exporter, cls)
+            exporter.close()
+        exporter = get_exporter(os.path.join(self.tmpdir.name, "report"),
+                                COLUMNS, format="jsonl")
+        self.assertIsInstance(exporter, JSONLinesExporter)
+        exporter.close()
+        with self.assertRaises(ValueError):
+            get_exporter(os.path.join(self.tmpdir.name, "report.txt"),
+                         COLUMNS)
+
+    def test_csv(self):
+        with open(self._export(".csv"), newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], COLUMNS)
+        self.assertEqual(rows[1], ["calc1", "COMPLETED", "True", "10",
+                                   "-8.1", "[0.0, 0.5, 0.0]"])
+        # unavailable values are empty cells
+        self.assertEqual(rows[2], ["calc2", "NOT FINISHED", "", "", "", ""])
+        # sequences are JSON arrays as in the JSON lines files
+        self.assertEqual(json.loads(rows[3][5]), [0.5, 0.5, 0.5])
+        self.assertEqual(len(rows), 4)
+
+    def test_jsonl(self):
+        with open(self._export(".jsonl")) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0], {"calculations": "calc1",
+                                   "status": "COMPLETED",
+                                   "convergence": True, "ecut": 10,
+                                   "etotal": -8.1, "kpt": [0.0, 0.5, 0.0]})
+        self.assertEqual(rows[1]["etotal"], None)
+        self.assertEqual(rows[2]["etotal"], -8.2)
+
+    def test_npz(self):
+        with np.load(self._export(".npz")) as data:
+            self.assertEqual(set(data.files),
+                             set(COLUMNS) |
+                             {column + "_mask" for column in COLUMNS})
+            np.testing.assert_array_equal(data["calculations"],
+                                          ["calc1", "calc2", "calc3"])
+            self.assertEqual(data["ecut"].dtype, int)
+            np.testing.assert_array_equal(data["ecut_mask"],
+                                          [False, True, False])
+            np.testing.assert_array_equal(data["ecut"][[0, 2]], [10, 20])
+            self.assertEqual(data["etotal"].dtype, float)
+            np.testing.assert_array_equal(data["etotal_mask"],
+                                          [False, True, False])
+            self.assertEqual(data["convergence"].dtype, bool)
+            np.testing.assert_array_equal(data["convergence"][[0, 2]],
+                                          [True, False])
+            # lists are JSON encoded
+            self.assertEqual(json.loads(str(data["kpt"][2])),
+                             [0.5, 0.5, 0.5])
+
+    def test_npz_without_rows(self):
+        path = os.path.join(self.tmpdir.name, "report.npz")
+        with get_exporter(path, COLUMNS):
+            pass
+        with np.load(path) as data:
+            self.assertEqual(set(data.files),
+                             set(COLUMNS) |
+                             {column + "_mask" for column in COLUMNS})
+            for name in data.files:
+                self.assertEqual(data[name].shape, (0,))
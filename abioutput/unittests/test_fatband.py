@@ -0,0 +1,39 @@
+from abioutput.parsers.fatband_parser import FatbandParser
+from abioutput.unittests.synthetic import fatband_text
+import os
+import tempfile
+import unittest
+
+
+class FatbandParserTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "calc_o_FATBANDS")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, lines):
+        with open(self.path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def test_shape(self):
+        lines = fatband_text(nkpt=4, nband=3).splitlines()
+        self._write(lines)
+        parser = FatbandParser(self.path)
+        self.assertEqual(parser.data.shape, (3, 4, 2))
+        self.assertEqual((parser.nband, parser.nkpt), (3, 4))
+        # first kpt of the second band
+        eigenvalue, character = map(float, lines[9].split()[1:])
+        self.assertEqual(tuple(parser.data[1, 0]), (eigenvalue, character))
+
+    def test_different_nkpt(self):
+        # a kpt moved from the second band to the first one: the number of
+        # values still matches 2 bands of 4 kpts
+        lines = fatband_text(nkpt=4, nband=2).splitlines()
+        self._write(lines[:7] + lines[9:10] + lines[7:9] + lines[10:])
+        with self.assertRaises(LookupError):
+            FatbandParser(self.path)
+        self._write(lines[:2])
+        with self.assertRaises(LookupError):
+            FatbandParser(self.path)
@@ -0,0 +1,132 @@
+from abioutput.parsers.dmft import DMFTEigParser, DMFTProjectorsParser
+from abioutput.parsers.binary import h5py
+from abioutput.parsers.dos_parser import DOSParser
+from abioutput.parsers.eig_store import EigenvalueStore
+from abioutput.parsers.fatband_parser import FatbandParser
+from abioutput.parsers.output_subparsers import EIGParser
+from abioutput.parsers.self_energy_parser import SelfEnergyParser
+from abioutput.unittests.synthetic import write_synthetic_file
+from abioutput.utils.output_pool import get_memory_size
+import numpy as np
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+
+# maximal ratio between the peak memory allocated while parsing a file and
+# the size of the parsed arrays. Parsers reading the file line by line into
+# arrays stay under 3. The EIG parser keeps the (stripped) lines of the file
+# while parsing (lower a budget when a parser gets better, never raise it).
+MEMORY_BUDGETS = {"eig": 5, "fatband": 3, "dos": 3, "dmft_eig": 3,
+                  "dmft_projectors": 3, "self_energy": 3}
+# same for the output files, relative to the file size (abipy keeps copies
+# of the whole text while parsing)
+OUTPUT_MEMORY_BUDGET = 4
+# maximal relative difference between the memory held by a parsed output
+# file and the estimate of the output pool
+OUTPUT_MEMORY_TOLERANCE = 0.1
+# same for an EIG file streamed into an eigenvalue store, relative to the
+# size of the eigenvalues (20 chunks of kpts)
+STORE_MEMORY_BUDGET = 0.25
+
+
+def get_peak_memory(function, *args, **kwargs):
+    """Returns the result of a function and the peak memory (in bytes)
+    allocated while it was running.
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def get_held_memory(function, *args, **kwargs):
+    """Returns the result of a function and the memory (in bytes) still
+    allocated when it returns.
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args, **kwargs)
+        held = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, held
+
+
+class MemoryBudgetTest(unittest.TestCase):
+    # parse generated files of known size and compare the peak memory with
+    # the size of the parsed data
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _check_budget(self, kind, parse, **kwargs):
+        path = os.path.join(self.tmpdir.name, kind)
+        write_synthetic_file(path, kind, **kwargs)
+        parser, peak = get_peak_memory(parse, path)
+        arrays = parser._to_binary()[0]
+        nbytes = sum(np.asarray(array).nbytes for array in arrays.values())
+        self.assertLessEqual(peak, MEMORY_BUDGETS[kind] * nbytes,
+                             f"{kind}: peak memory is {peak / nbytes:.2f}"
+                             f" times the size of the parsed data.")
+
+    def test_eig_parser(self):
+        self._check_budget("eig", EIGParser.from_file, nkpt=200, nband=50)
+
+    def test_fatband_parser(self):
+        self._check_budget("fatband", FatbandParser, nkpt=200, nband=50)
+
+    def test_dos_parser(self):
+        self._check_budget("dos", DOSParser, nenergy=5000)
+
+    def test_dmft_eig_parser(self):
+        self._check_budget("dmft_eig", DMFTEigParser, nkpt=100, nband=20)
+
+    def test_dmft_projectors_parser(self):
+        self._check_budget("dmft_projectors", DMFTProjectorsParser, nkpt=20,
+                           nband=10)
+
+    def test_self_energy_parser(self):
+        self._check_budget("self_energy", SelfEnergyParser, nfrequency=5000)
+
+    @unittest.skipIf(h5py is None, "h5py is not installed.")
+    def test_eig_store(self):
+        path = os.path.join(self.tmpdir.name, "calc_o_EIG")
+        write_synthetic_file(path, "eig", nkpt=10000, nband=40)
+        store, peak = get_peak_memory(EIGParser.to_store, path, path + ".h5",
+                                      chunk_nkpt=500)
+        self.assertIsInstance(store, EigenvalueStore)
+        nbytes = store.nkpt * store.nband * 8
+        store.close()
+        self.assertLessEqual(peak, STORE_MEMORY_BUDGET * nbytes,
+                             f"store: peak memory is {peak / nbytes:.2f}"
+                             f" times the size of the eigenvalues.")
+
+    def test_output_parser(self):
+        try:
+            from abioutput.parsers.output_parser import OutputParser
+        except ImportError:  # pragma: no cover
+            self.skipTest("abipy is not installed.")
+        path = os.path.join(self.tmpdir.name, "calc.out")
+        write_synthetic_file(path, "output", ndtset=3, nkpt=50, nband=20)
+        parser, peak = get_peak_memory(OutputParser, path)
+        size = os.path.getsize(path)
+        self.assertLessEqual(peak, OUTPUT_MEMORY_BUDGET * size,
+                             f"output: peak memory is {peak / size:.2f}"
+                             f" times the size of the file.")
+        # the memory held once parsed is the one counted by the output pool
+        # (small parses, e.g. only 'outvars', are overestimated by the
+        # strings shared with other objects)
+        for sections in (None, ["eigenvalues"]):
+            parser, held = get_held_memory(OutputParser, path,
+                                           sections=sections)
+            self.assertAlmostEqual(get_memory_size(parser) / held, 1,
+                                   delta=OUTPUT_MEMORY_TOLERANCE,
+                                   msg=f"output {sections}: held memory is"
+                                       f" {held} bytes.")
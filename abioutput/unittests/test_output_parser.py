@@ -0,0 +1,100 @@
+from abioutput.parsers.output_parser import (ABIPY_PARSE_VERSION,
+                                             OutputParser)
+from abioutput.unittests.synthetic import output_text, write_synthetic_file
+import abipy
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+class SelectiveParsingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = write_synthetic_file(
+                os.path.join(self.tmpdir.name, "calc.out"), "output",
+                ndtset=3, nkpt=4, nband=6)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _assert_same_eigenvalues(self, parser, reference, datasets):
+        for index, (data, expected) in enumerate(
+                zip(parser.data_per_dtset, reference.data_per_dtset)):
+            if index + 1 not in datasets:
+                self.assertIsNone(data)
+                continue
+            np.testing.assert_array_equal(
+                    data["eigenvalues"]["eigenvalues"],
+                    expected["eigenvalues"]["eigenvalues"])
+
+    def test_same_as_abipy(self):
+        # selecting all the datasets goes through the selective parsing
+        # which must give the same results as abipy's parsing
+        if abipy.__version__ != ABIPY_PARSE_VERSION:
+            self.fail(f"The selective parsing was copied from abipy"
+                      f" {ABIPY_PARSE_VERSION}: compare it with the parsing"
+                      f" of abipy {abipy.__version__} and update"
+                      f" ABIPY_PARSE_VERSION.")
+        reference = OutputParser(self.path)
+        parser = OutputParser(self.path, datasets=[1, 2, 3])
+        for name in ("version", "run_completed", "overall_cputime",
+                     "overall_walltime", "proc0_cputime", "proc0_walltime",
+                     "header", "footer", "datasets", "ndtset",
+                     "dryrun_mode", "initial_vars_global",
+                     "initial_vars_dataset", "final_vars_global",
+                     "final_vars_dataset"):
+            with self.subTest(name=name):
+                self.assertEqual(getattr(parser, name),
+                                 getattr(reference, name))
+        self._assert_same_eigenvalues(parser, reference, [1, 2, 3])
+
+    def test_datasets(self):
+        reference = OutputParser(self.path)
+        for datasets in ([1], [2], [3], [1, 3]):
+            for sections in (None, ["eigenvalues"]):
+                with self.subTest(datasets=datasets, sections=sections):
+                    parser = OutputParser(self.path, datasets=datasets,
+                                          sections=sections)
+                    # the datasets after the last selected one are there
+                    self.assertEqual(parser.ndtset, reference.ndtset)
+                    self.assertEqual(list(parser.datasets),
+                                     list(reference.datasets))
+                    self.assertEqual(len(parser.data_per_dtset), 3)
+                    self._assert_same_eigenvalues(parser, reference,
+                                                  datasets)
+
+    def test_sections(self):
+        reference = OutputParser(self.path)
+        parser = OutputParser(self.path, sections=["outvars"])
+        self.assertEqual(parser.ndtset, reference.ndtset)
+        self.assertIs(parser.run_completed, True)
+        self.assertEqual(parser.extract_output_variable("ecut"),
+                         reference.extract_output_variable("ecut"))
+        self.assertEqual(parser.data_per_dtset, [None] * 3)
+        parser = OutputParser(self.path, sections=["eigenvalues"])
+        # the footer is not read
+        self.assertIsNone(parser.run_completed)
+        self._assert_same_eigenvalues(parser, reference, [1, 2, 3])
+        with self.assertRaises(ValueError):
+            parser.output_vars_global
+        with self.assertRaises(ValueError):
+            OutputParser(self.path, sections=["nothing"])
+
+    def test_running_calculation(self):
+        # no dataset written yet: an empty dataset as for abipy
+        text = output_text(ndtset=1, completed=False)
+        with open(self.path, "w") as f:
+            f.write(text[:text.index("== DATASET")])
+        reference = OutputParser(self.path)
+        for sections in (["outvars"], ["eigenvalues"]):
+            parser = OutputParser(self.path, sections=sections)
+            self.assertEqual(parser.ndtset, reference.ndtset)
+            self.assertEqual(parser.datasets, reference.datasets)
+            self.assertIs(parser.run_completed, reference.run_completed)
+        # a dataset started
+        write_synthetic_file(self.path, "output", ndtset=2, completed=False)
+        reference = OutputParser(self.path)
+        parser = OutputParser(self.path, sections=["outvars"])
+        self.assertEqual(parser.ndtset, reference.ndtset)
+        self.assertIs(parser.run_completed, False)
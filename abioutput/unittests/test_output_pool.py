@@ -0,0 +1,85 @@
+from abioutput.parsers.output_parser import OutputParser
+from abioutput.utils.output_pool import OutputParserPool, get_memory_size
+from abioutput.unittests.synthetic import write_synthetic_file
+import os
+import tempfile
+import unittest
+
+
+class OutputParserPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for index in range(3):
+            path = os.path.join(self.tmpdir.name, f"calc{index}.out")
+            self.paths.append(write_synthetic_file(path, "output",
+                                                   seed=index))
+        self.memories = [get_memory_size(OutputParser(path))
+                         for path in self.paths]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_hits_and_misses(self):
+        pool = OutputParserPool()
+        parser = pool.get(self.paths[0])
+        self.assertIs(pool.get(self.paths[0]), parser)
+        stats = pool.stats
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["memory"], self.memories[0])
+
+    def test_kwargs(self):
+        # a partial parse is never given for a full one (and vice versa)
+        pool = OutputParserPool()
+        full = pool.get(self.paths[0])
+        partial = pool.get(self.paths[0], sections=["outvars"])
+        self.assertIsNot(partial, full)
+        self.assertEqual(partial.sections, ("outvars", ))
+        self.assertIs(pool.get(self.paths[0]), full)
+        self.assertIs(pool.get(self.paths[0], sections=("outvars", ),
+                               datasets=None), partial)
+        self.assertIsNot(pool.get(self.paths[0], sections=["outvars"],
+                                  datasets=[1]), partial)
+        stats = pool.stats
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 3))
+        self.assertEqual(stats["size"], 3)
+        # the memory is the one of each parser
+        self.assertLess(get_memory_size(partial), get_memory_size(full))
+
+    def test_changed_file_parsed_again(self):
+        pool = OutputParserPool()
+        parser = pool.get(self.paths[0])
+        write_synthetic_file(self.paths[0], "output", ndtset=2)
+        self.assertIsNot(pool.get(self.paths[0]), parser)
+        self.assertEqual(pool.get(self.paths[0]).ndtset, 2)
+        self.assertEqual(len(pool), 1)
+        self.assertEqual(pool.stats["misses"], 2)
+
+    def test_eviction(self):
+        # room for 2 parsers: the least recently used one is evicted
+        pool = OutputParserPool(max_memory=self.memories[0] +
+                                max(self.memories[1:]))
+        first = pool.get(self.paths[0])
+        pool.get(self.paths[1])
+        self.assertIs(pool.get(self.paths[0]), first)
+        pool.get(self.paths[2])
+        stats = pool.stats
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["size"], 2)
+        self.assertLessEqual(stats["memory"], pool.max_memory)
+        # paths[1] was evicted, paths[0] was kept
+        self.assertIs(pool.get(self.paths[0]), first)
+        misses = pool.stats["misses"]
+        pool.get(self.paths[1])
+        self.assertEqual(pool.stats["misses"], misses + 1)
+
+    def test_last_parser_kept(self):
+        # a parser larger than the budget is kept until the next one
+        pool = OutputParserPool(max_memory=1)
+        pool.get(self.paths[0])
+        self.assertEqual(len(pool), 1)
+        pool.get(self.paths[1])
+        self.assertEqual(len(pool), 1)
+        pool.clear()
+        self.assertEqual((len(pool), pool.memory), (0, 0))
@@ -0,0 +1,51 @@
+from abioutput.plot import Plot, get_headless_figure
+from matplotlib.collections import LineCollection
+import numpy as np
+import unittest
+
+
+class CurveGroupsTest(unittest.TestCase):
+    def setUp(self):
+        self.plot = Plot()
+        xs = np.linspace(0, 1, 10)
+        for i in range(3):
+            self.plot.add_curve(xs, xs + i)
+        # another style and a labelled curve with the same style
+        self.plot.add_curve(xs, -xs, color="r")
+        self.plot.add_curve(xs, 2 * xs, label="label")
+        # another length in the same group as the red one
+        self.plot.add_curve([0, 1], [1, 0], color="r")
+
+    def test_groups(self):
+        groups = self.plot._get_curve_groups()
+        self.assertEqual([len(group) for group in groups], [3, 2, 1])
+        self.assertEqual([group[0].color for group in groups],
+                         ["k", "r", "k"])
+        self.assertEqual(groups[2][0].label, "label")
+
+    def test_line_collections(self):
+        fig = get_headless_figure()
+        self.plot._draw(fig)
+        ax = fig.axes[0]
+        collections = [x for x in ax.collections
+                       if isinstance(x, LineCollection)]
+        # one artist per group instead of one per curve
+        self.assertEqual(len(collections), 3)
+        self.assertEqual(len(ax.lines), 0)
+        segments = collections[0].get_segments()
+        self.assertEqual(len(segments), 3)
+        np.testing.assert_allclose(segments[2][:, 1],
+                                   np.linspace(0, 1, 10) + 2)
+        # curves of different lengths in one group
+        self.assertEqual([len(x) for x in collections[1].get_segments()],
+                         [10, 2])
+        np.testing.assert_allclose(collections[1].get_colors(),
+                                   [[1, 0, 0, 1]])
+        self.assertEqual(collections[2].get_label(), "label")
+        # the axes are scaled to the curves
+        self.assertLessEqual(ax.get_ylim()[0], -1)
+        self.assertGreaterEqual(ax.get_ylim()[1], 3)
+        # only the labelled curve is in the legend
+        legend = ax.get_legend()
+        self.assertEqual([x.get_text() for x in legend.get_texts()],
+                         ["label"])
@@ -0,0 +1,79 @@
+from abioutput.parsers.output_subparsers import EIGParser
+from abioutput.profiling import Profiler, is_profiling, phase, profile
+from abioutput.unittests.synthetic import write_synthetic_file
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+
+class ProfilingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = write_synthetic_file(
+                os.path.join(self.tmpdir.name, "calc_o_EIG"), "eig",
+                nkpt=10, nband=4)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_disabled(self):
+        self.assertFalse(is_profiling())
+        with phase(EIGParser, "read") as read:
+            # attributes are ignored
+            read.lines = 10
+            self.assertEqual(read.lines, 0)
+
+    def test_parser_phases(self):
+        records = []
+        with profile(callback=records.append) as profiler:
+            self.assertTrue(is_profiling())
+            EIGParser.from_file(self.path)
+            EIGParser.from_file(self.path)
+        self.assertFalse(is_profiling())
+        self.assertEqual(profiler.records, records)
+        summary = profiler.summary()
+        self.assertEqual(list(summary), ["EIGParser"])
+        read = summary["EIGParser"]["read"]
+        self.assertEqual(read["calls"], 2)
+        self.assertEqual(read["bytes"], 2 * os.path.getsize(self.path))
+        self.assertGreater(read["lines"], 20)
+        self.assertGreaterEqual(read["time"], 0)
+        # no memory recorded by default
+        self.assertIsNone(read["peak_memory"])
+
+    def test_records(self):
+        with profile() as profiler:
+            # instances are recorded with their class name
+            with phase(self, "tokenize", nbytes=5) as tokenize:
+                tokenize.lines = 3
+        record = profiler.records[-1]
+        self.assertEqual(record["parser"], "ProfilingTest")
+        self.assertEqual(record["phase"], "tokenize")
+        self.assertEqual((record["bytes"], record["lines"]), (5, 3))
+
+    def test_memory(self):
+        was_tracing = tracemalloc.is_tracing()
+        with profile(memory=True) as profiler:
+            with phase(EIGParser, "reshape"):
+                data = bytearray(1000000)
+            del data
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+        peak = profiler.summary()["EIGParser"]["reshape"]["peak_memory"]
+        self.assertGreaterEqual(peak, 1000000)
+
+    def test_nested_profilers(self):
+        outer = Profiler()
+        outer.enable()
+        try:
+            with profile() as inner:
+                with phase(EIGParser, "read"):
+                    pass
+            with phase(EIGParser, "reshape"):
+                pass
+        finally:
+            outer.disable()
+        self.assertFalse(is_profiling())
+        self.assertEqual([x["phase"] for x in inner.records], ["read"])
+        self.assertEqual([x["phase"] for x in outer.records],
+                         ["read", "reshape"])
@@ -0,0 +1,74 @@
+from abioutput.bandstructure import Bandstructure
+from abioutput.parsers import SelfEnergyParser
+from abioutput.plot import Plot, get_headless_figure
+from abioutput.render import render_figure, render_figures
+from abioutput.unittests.synthetic import write_synthetic_file
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import matplotlib.pyplot as plt
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+PNG_SIGNATURE = b"\x89PNG"
+
+
+class RenderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        kpts = np.linspace((0, 0, 0), (0.5, 0, 0), 20)
+        self.structure = Bandstructure(
+                kpts, np.random.default_rng(0).normal(size=(20, 4)))
+        self.plot = Plot()
+        self.plot.add_curve([0, 1, 2], [1, 0, 1])
+        path = os.path.join(self.tmpdir.name, "Self-omega")
+        write_synthetic_file(path, "self_energy", nfrequency=20)
+        self.self_energy = SelfEnergyParser(path)
+        plt.close("all")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _assert_png(self, path):
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(4), PNG_SIGNATURE)
+
+    def test_headless_figure(self):
+        fig = get_headless_figure(figsize=(2, 3))
+        self.assertIsInstance(fig.canvas, FigureCanvasAgg)
+        self.assertEqual(tuple(fig.get_size_inches()), (2, 3))
+        # not managed by pyplot
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_render_figure(self):
+        for name, plottable in (
+                ("bandstructure", self.structure), ("plot", self.plot),
+                ("self_energy", self.self_energy),
+                ("self_energies", [self.self_energy, self.self_energy])):
+            with self.subTest(name=name):
+                path = os.path.join(self.tmpdir.name, name + ".png")
+                self.assertEqual(render_figure(plottable, path), path)
+                self._assert_png(path)
+        # no figure is left open
+        self.assertEqual(plt.get_fignums(), [])
+        # kwargs are passed to the plot method
+        path = os.path.join(self.tmpdir.name, "index.png")
+        render_figure(self.structure, path, xaxis="index")
+        self._assert_png(path)
+        with self.assertRaises(TypeError):
+            render_figure(object(), path)
+
+    def test_render_figures(self):
+        jobs = [(self.structure, os.path.join(self.tmpdir.name, "1.png")),
+                (self.plot, os.path.join(self.tmpdir.name, "2.png")),
+                (self.structure, os.path.join(self.tmpdir.name, "3.png"),
+                 {"xaxis": "index"})]
+        for max_workers in (1, 2):
+            with self.subTest(max_workers=max_workers):
+                paths = render_figures(jobs, max_workers=max_workers)
+                # same order as the jobs
+                self.assertEqual(paths, [job[1] for job in jobs])
+                for path in paths:
+                    self._assert_png(path)
+                    os.remove(path)
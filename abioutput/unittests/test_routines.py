@@ -0,0 +1,130 @@
+from abioutput.utils.routines import aimap, imap_in_threads, map_in_threads
+from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor,
+                                TimeoutError)
+import asyncio
+import threading
+import time
+import unittest
+
+
+class ThreadMapTest(unittest.TestCase):
+    def setUp(self):
+        # released at the end of each test such that no thread hangs
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def _run(self, duration):
+        if duration is None:
+            self.release.wait()
+            return None
+        time.sleep(duration)
+        return duration
+
+    def test_map_order_and_errors(self):
+        def function(x):
+            if x == 3:
+                raise ValueError(x)
+            return 2 * x
+
+        results = map_in_threads(function, range(6), max_workers=3,
+                                 on_error=lambda item, error: "error")
+        self.assertEqual(results, [0, 2, 4, "error", 8, 10])
+        with self.assertRaises(ValueError):
+            map_in_threads(function, range(6), max_workers=3)
+
+    def test_timeout_per_item(self):
+        # the hung item and the slow one time out. The last item waited for
+        # a thread longer than the timeout but it is not timed out since it
+        # had the whole timeout once started.
+        items = [None, 0.8, 0.1]
+        results = map_in_threads(self._run, items, max_workers=2,
+                                 timeout=0.5,
+                                 on_error=lambda item, error: "timeout")
+        self.assertEqual(results, ["timeout", "timeout", 0.1])
+
+    def test_timeout_without_threads_left(self):
+        # all the threads hang => the queued items are timed out too
+        items = [None, None, 0.1]
+        start = time.monotonic()
+        results = dict(imap_in_threads(self._run, items, max_workers=2,
+                                       timeout=0.2,
+                                       on_error=lambda item, error: "timeout"))
+        self.assertEqual(results, {0: "timeout", 1: "timeout", 2: "timeout"})
+        self.assertLess(time.monotonic() - start, 2)
+
+    def test_timeout_raises(self):
+        with self.assertRaises(TimeoutError):
+            list(imap_in_threads(self._run, [None], max_workers=1,
+                                 timeout=0.1))
+
+
+class AsyncMapTest(unittest.TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def _run(self, duration):
+        # sleep and count the items running at the same time
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(duration)
+        with self.lock:
+            self.running -= 1
+        return duration
+
+    def _aimap(self, *args, **kwargs):
+        async def collect():
+            return [pair async for pair in aimap(*args, **kwargs)]
+        return asyncio.run(collect())
+
+    def test_results(self):
+        def function(x):
+            if x == 3:
+                raise ValueError(x)
+            return 2 * x
+
+        pairs = self._aimap(function, range(6),
+                            on_error=lambda item, error: "error")
+        self.assertEqual(sorted(pairs), [(0, 0), (1, 2), (2, 4),
+                                         (3, "error"), (4, 8), (5, 10)])
+        with self.assertRaises(ValueError):
+            self._aimap(function, range(6))
+        # yielded as soon as done
+        pairs = self._aimap(self._run, [0.3, 0.01])
+        self.assertEqual([index for index, result in pairs], [1, 0])
+
+    def test_processes(self):
+        with ProcessPoolExecutor(2) as executor:
+            pairs = self._aimap(abs, [-1, 2, -3], executor=executor,
+                                timeout=10)
+        self.assertEqual(sorted(pairs), [(0, 1), (1, 2), (2, 3)])
+
+    def test_max_concurrency(self):
+        with ThreadPoolExecutor(8) as executor:
+            self._aimap(self._run, [0.05] * 8, executor=executor,
+                        max_concurrency=3)
+        self.assertEqual(self.max_running, 3)
+
+    def test_timeout_per_item(self):
+        # the second item waits for the only worker longer than the timeout
+        # but it has the whole timeout once started
+        with ThreadPoolExecutor(1) as executor:
+            pairs = self._aimap(self._run, [0.5, 0.1], executor=executor,
+                                timeout=0.3,
+                                on_error=lambda item, error: "timeout")
+        self.assertEqual(dict(pairs), {0: "timeout", 1: 0.1})
+        with self.assertRaises(TimeoutError):
+            self._aimap(self._run, [0.5], timeout=0.1)
+
+    def test_timeout_keeps_slot(self):
+        # the item which timed out keeps running: the next one waits for it
+        with ThreadPoolExecutor(2) as executor:
+            pairs = self._aimap(self._run, [0.4, 0.1], executor=executor,
+                                max_concurrency=1, timeout=0.2,
+                                on_error=lambda item, error: "timeout")
+        self.assertEqual(dict(pairs), {0: "timeout", 1: 0.1})
+        self.assertEqual(self.max_running, 1)
@@ -0,0 +1,131 @@
+from abioutput.utils.calculation_dir import CalculationDir
+from abioutput.utils.status_cache import (CACHE_TABLE, StatusCache,
+                                          default_cache_path, get_fingerprint)
+from abioutput.unittests.synthetic import make_calculation_tree
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import os
+import sqlite3
+import tempfile
+import unittest
+
+
+STATUS = {"path": "calc", "name": "calc", "calculation_started": True,
+          "calculation_finished": True}
+
+
+class StatusCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = StatusCache(os.path.join(self.tmpdir.name, "cache",
+                                              "status.sqlite"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_set_get(self):
+        self.assertIsNone(self.cache.get("calc", "fp"))
+        self.cache.set("calc", "fp", status=STATUS, convergence=False,
+                       variables={"ecut": (10.0, "Ha"), "nkpt": None})
+        record = self.cache.get("calc", "fp")
+        self.assertEqual(record["status"], STATUS)
+        self.assertIs(record["convergence"], False)
+        # values are restored as (value, units) tuples
+        self.assertEqual(record["variables"], {"ecut": (10.0, "Ha"),
+                                               "nkpt": None})
+
+    def test_merge_same_fingerprint(self):
+        self.cache.set("calc", "fp", status=STATUS,
+                       variables={"ecut": (10.0, "Ha")})
+        self.cache.set("calc", "fp", convergence=True,
+                       variables={"natom": (2, None)})
+        record = self.cache.get("calc", "fp")
+        self.assertEqual(record["status"], STATUS)
+        self.assertIs(record["convergence"], True)
+        self.assertEqual(set(record["variables"]), {"ecut", "natom"})
+
+    def test_invalidation(self):
+        self.cache.set("calc", "fp", status=STATUS, convergence=True,
+                       variables={"ecut": (10.0, "Ha")})
+        self.assertIsNone(self.cache.get("calc", "other fp"))
+        # setting with a new fingerprint drops the old data
+        self.cache.set("calc", "other fp", variables={"natom": (2, None)})
+        record = self.cache.get("calc", "other fp")
+        self.assertIsNone(record["status"])
+        self.assertIsNone(record["convergence"])
+        self.assertEqual(list(record["variables"]), ["natom"])
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("calc", "other fp"))
+
+    def test_persistence(self):
+        self.cache.set("calc", "fp", status=STATUS)
+        self.cache.close()
+        self.cache = StatusCache(os.path.join(self.tmpdir.name, "cache",
+                                              "status.sqlite"))
+        self.assertEqual(self.cache.get("calc", "fp")["status"], STATUS)
+
+    def _count_committed(self):
+        # number of rows seen by another connection
+        with sqlite3.connect(self.cache.path) as connection:
+            return connection.execute(
+                    f"SELECT COUNT(*) FROM {CACHE_TABLE}").fetchone()[0]
+
+    def test_batch(self):
+        with self.cache.batch():
+            with self.cache.batch():
+                self.cache.set("calc1", "fp", status=STATUS)
+            self.cache.set("calc2", "fp", status=STATUS)
+            # not committed yet but visible to the cache itself
+            self.assertEqual(self._count_committed(), 0)
+            self.assertEqual(self.cache.get("calc1", "fp")["status"], STATUS)
+        self.assertEqual(self._count_committed(), 2)
+        self.cache.set("calc3", "fp", status=STATUS)
+        self.assertEqual(self._count_committed(), 3)
+
+    def test_concurrent_set(self):
+        # variables set by several threads for the same calculation are
+        # all kept
+        names = [f"var{i}" for i in range(50)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(
+                lambda name: self.cache.set("calc", "fp",
+                                            variables={name: (1, None)}),
+                names))
+        record = self.cache.get("calc", "fp")
+        self.assertEqual(set(record["variables"]), set(names))
+
+    def test_fingerprint(self):
+        path = os.path.join(self.tmpdir.name, "calc.log")
+        with open(path, "w") as f:
+            f.write("started\n")
+        fingerprint = get_fingerprint([path])
+        self.assertEqual(get_fingerprint([path]), fingerprint)
+        # missing files are skipped
+        self.assertEqual(get_fingerprint([path, path + "2"]), fingerprint)
+        with open(path, "a") as f:
+            f.write("completed\n")
+        self.assertNotEqual(get_fingerprint([path]), fingerprint)
+
+    def test_default_cache_path(self):
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/cachedir"}):
+            path = default_cache_path("calculations")
+            self.assertTrue(path.startswith("/cachedir/abioutput/status_"))
+            self.assertEqual(path, default_cache_path(
+                os.path.abspath("calculations")))
+            self.assertNotEqual(path, default_cache_path("others"))
+
+    def test_calculation_status_cached(self):
+        # the status is computed only once until the log file changes
+        running = make_calculation_tree(self.tmpdir.name, 2,
+                                        states=("running", ))[0]
+        calc = CalculationDir(running, cache=self.cache)
+        status = calc.status
+        self.assertFalse(status["calculation_finished"])
+        checker = "abioutput.utils.calculation_dir.StatusChecker"
+        with mock.patch(checker) as StatusChecker:
+            self.assertEqual(calc.status, status)
+            StatusChecker.assert_not_called()
+        with open(calc.files["log"][0], "a") as f:
+            f.write("\n Calculation completed.\n")
+        self.assertTrue(calc.status["calculation_finished"])
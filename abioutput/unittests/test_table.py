@@ -0,0 +1,76 @@
+from abioutput.utils.builders import Table, compute_deltas
+import numpy as np
+import unittest
+
+
+class TableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = Table(["name", "ecut", "etotal"])
+        for row in (["a", 20, -8.2], ["b", None, None], ["c", 10, -8.1],
+                    ["d", "?", -8.3], ["e", 15, None]):
+            self.table.add_row(row)
+
+    def test_columns(self):
+        self.assertEqual(len(self.table), 5)
+        self.assertEqual(self.table.get_column("ecut"),
+                         [20, None, 10, "?", 15])
+        self.assertEqual(self.table.get_column("etotal", indices=[0, 1]),
+                         [-8.2, None])
+        self.assertEqual(self.table.rows[1], ["b", None, None])
+        with self.assertRaises(KeyError):
+            self.table.get_column("natom")
+        with self.assertRaises(ValueError):
+            self.table.add_row(["f", 5])
+
+    def test_availability_masks(self):
+        values, sortable = self.table.get_array("ecut")
+        np.testing.assert_array_equal(sortable,
+                                      [True, False, True, False, True])
+        np.testing.assert_array_equal(values[sortable], [20, 10, 15])
+        self.assertTrue(np.isnan(values[~sortable]).all())
+        # numeric column with missing values
+        values, sortable = self.table.get_array("etotal")
+        np.testing.assert_array_equal(sortable,
+                                      [True, False, True, True, False])
+        self.assertFalse(self.table.is_column_sortable("name"))
+
+    def test_rows_added_after_merge(self):
+        self.table.get_column("etotal")  # rows merged in the columns
+        self.table.add_row(["f", 5, "?"])
+        self.assertEqual(len(self.table), 6)
+        self.assertEqual(self.table.get_column("etotal")[-2:], [None, "?"])
+        self.assertEqual(self.table.get_column("ecut")[-1], 5)
+
+    def test_sortby(self):
+        order = self.table.sortby("ecut")
+        # not available and not numeric rows at the end, in their order
+        np.testing.assert_array_equal(order, [2, 4, 0, 1, 3])
+        self.assertEqual(self.table.get_column("name"),
+                         ["c", "e", "a", "b", "d"])
+        self.assertEqual(self.table.get_column("etotal"),
+                         [-8.1, None, -8.2, None, -8.3])
+
+    def test_add_column(self):
+        self.table.add_column("natom", [2, 2, None, 2, 2], index=1)
+        self.assertEqual(self.table.column_names,
+                         ["name", "natom", "ecut", "etotal"])
+        self.assertEqual(self.table.rows[2], ["c", None, 10, -8.1])
+        with self.assertRaises(ValueError):
+            self.table.add_column("nkpt", [1, 2])
+
+
+class ComputeDeltasTest(unittest.TestCase):
+    def test_deltas(self):
+        values = np.array([-8.0, np.nan, -8.2, -8.3])
+        deltas, valid = compute_deltas(values, "absolute")
+        np.testing.assert_array_equal(valid, [True, False, True, True])
+        np.testing.assert_allclose(deltas, [np.nan, np.nan, -0.2, -0.1])
+        deltas, valid = compute_deltas(values, "percent")
+        np.testing.assert_allclose(deltas[2], -2.5)
+        natoms = np.array([2, 2, 2, np.nan])
+        deltas, valid = compute_deltas(values, "absolute_per_atom",
+                                       natoms=natoms)
+        np.testing.assert_array_equal(valid, [True, False, True, False])
+        np.testing.assert_allclose(deltas, [np.nan, np.nan, -0.1, np.nan])
+        with self.assertRaises(ValueError):
+            compute_deltas(values, "relative")
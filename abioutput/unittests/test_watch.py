@@ -0,0 +1,66 @@
+from abioutput.utils.builders import TreeBuilder
+from abioutput.unittests.synthetic import (make_calculation_tree,
+                                           write_synthetic_file)
+import asyncio
+import os
+import tempfile
+import unittest
+
+
+class WatchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.paths = make_calculation_tree(
+                self.tmpdir.name, 4, states=("not_started", "running",
+                                             "running", "finished"))
+        self.builder = TreeBuilder(self.tmpdir.name, max_workers=1)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _run(self, path, **kwargs):
+        # write the log and output files of a calculation
+        run = os.path.join(path, "run")
+        for kind, name in (("log", "calc.log"), ("output", "calc.out")):
+            write_synthetic_file(os.path.join(run, name), kind, **kwargs)
+
+    def _get_events(self, events):
+        return sorted((os.path.basename(event["path"]), event["event"])
+                      for event in events)
+
+    def test_events(self):
+        # the first poll only records the state of the tree
+        self.assertEqual(list(self.builder.iter_events(max_polls=1)), [])
+        self.assertEqual(list(self.builder.iter_events(interval=0,
+                                                       max_polls=1)), [])
+        self._run(self.paths[0], completed=False)
+        self._run(self.paths[1])
+        self._run(self.paths[2], converged=False)
+        events = []
+        self.builder.watch(events.append, interval=0, max_polls=1)
+        self.assertEqual(self._get_events(events),
+                         [("calc000000", "started"),
+                          ("calc000001", "converged"),
+                          ("calc000001", "finished"),
+                          ("calc000002", "failed"),
+                          ("calc000002", "finished")])
+        new = events[0]["status"]
+        self.assertTrue(new["calculation_started"])
+        # the status is up to date and nothing changed since the last poll
+        self.assertTrue(all(status["calculation_finished"] for status in
+                            self.builder._status[1:]))
+        self.assertEqual(list(self.builder.iter_events(max_polls=1)), [])
+
+    def test_awatch(self):
+        async def watch():
+            events = []
+            async for event in self.builder.awatch(interval=0, max_polls=1):
+                events.append(event)
+            self._run(self.paths[0], completed=False)
+            async for event in self.builder.awatch(interval=0, max_polls=1):
+                events.append(event)
+            return events
+
+        events = asyncio.run(watch())
+        self.assertEqual(self._get_events(events),
+                         [("calc000000", "started")])
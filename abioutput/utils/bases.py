@@ -6,10 +6,10 @@ import os
 class BaseBuilder(BaseUtility):
     """Base class for all status checkers.
     """
-    def __init__(self, directory, **kwargs):
+    def __init__(self, directory, check_directory=True, **kwargs):
         super().__init__(**kwargs)
         directory = os.path.abspath(os.path.expanduser(directory))
-        if not os.path.exists(directory) or not os.path.isdir(directory):
+        if check_directory and not os.path.isdir(directory):
             raise NotADirectoryError(f"{directory} is not a valid path.")
         self._set_main_directory(directory)
 
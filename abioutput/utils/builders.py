@@ -1,19 +1,40 @@
 from ..bases import BaseUtility
 from .bases import BaseBuilder
 from .calculation_dir import CalculationDir
-from .routines import styled_text
+from .exporters import get_exporter
+from .routines import (aimap, find_calculation_dirs, imap_in_threads,
+                       map_in_threads, styled_text)
+from .status_cache import StatusCache, default_cache_path
 from tabulate import tabulate
 from colorama import Fore, Style
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+import asyncio
+import contextlib
 import numpy as np
 import os
 import time
 
 
 TIME_BETWEEN_UPDATES = 300  # seconds
+MAX_WORKERS = 16  # threads used to collect the calculations status
+WATCH_INTERVAL = 10  # seconds between two checks of the calculation files
+STATUS_COLORS = {"NOT STARTED": Fore.RED,
+                 "NOT FINISHED": Fore.YELLOW,
+                 "COMPLETED": Fore.GREEN,
+                 "UNKNOWN": Fore.MAGENTA}
+# delta types with their units
+DELTA_TYPES = {"percent": "%",
+               "absolute": "abs",
+               "absolute_per_atom": "abs/atom"}
 
 
 class Table(BaseUtility):
     """Class that serves as template to print a table in terminal.
+
+    Data is stored by columns. Numeric columns are numpy arrays of ints or
+    floats while other columns are arrays of objects. Unavailable cells
+    (given as None) are tracked in a mask and printed as 'NOT AVAILABLE'.
     """
     _loggername = "Table"
 
@@ -27,8 +48,22 @@ class Table(BaseUtility):
                        dictates the number of columns.
         """
         super().__init__(**kwargs)
-        self.column_names = column_names
-        self.rows = []
+        self.column_names = list(column_names)
+        self._columns = [np.empty(0, dtype=object) for x in column_names]
+        self._masks = [np.empty(0, dtype=bool) for x in column_names]
+        # rows added one by one are kept here until the columns are needed
+        self._new_rows = []
+
+    def __len__(self):
+        if not self._masks:
+            return len(self._new_rows)
+        return len(self._masks[0]) + len(self._new_rows)
+
+    @property
+    def rows(self):
+        self._merge_new_rows()
+        columns = [self.get_column(name) for name in self.column_names]
+        return [list(row) for row in zip(*columns)]
 
     def add_column(self, column_header, column, index=None):
         """Add a column to the table.
@@ -39,17 +74,19 @@ class Table(BaseUtility):
                         The title of the column.
         column : list
                  The data list of the column. Must match the
-                 number of rows.
+                 number of rows. None values are not available.
         index : int, optional
                 If not None, insert column before that index.
         """
-        self.column_names.append(column_header)
-        if len(column) != len(self.rows) and len(self.rows) > 0:
+        self._merge_new_rows()
+        if len(column) != len(self):
             raise ValueError("Column length does not match number of rows.")
         if index is None:
-            index = len(self.rows[0])  # append at the end
-        for i, data in enumerate(column):
-            self.rows[i].insert(index, data)
+            index = len(self.column_names)  # append at the end
+        data, mask = self._to_column(column)
+        self.column_names.insert(index, column_header)
+        self._columns.insert(index, data)
+        self._masks.insert(index, mask)
 
     def add_row(self, row):
         """Add a row to the table.
@@ -63,7 +100,44 @@ class Table(BaseUtility):
         if len(row) != len(self.column_names):
             raise ValueError("Row to add is not the same length"
                              " as the others.")
-        self.rows.append(row)
+        self._new_rows.append(row)
+
+    def _merge_new_rows(self):
+        # append the rows added one by one to the columns
+        if not self._new_rows:
+            return
+        for i, column in enumerate(zip(*self._new_rows)):
+            data, mask = self._to_column(column)
+            if not len(self._columns[i]):
+                self._columns[i] = data
+            else:
+                if object in (data.dtype, self._columns[i].dtype):
+                    # not numeric anymore
+                    data = data.astype(object)
+                    self._columns[i] = self._columns[i].astype(object)
+                self._columns[i] = np.concatenate((self._columns[i], data))
+            self._masks[i] = np.concatenate((self._masks[i], mask))
+        self._new_rows = []
+
+    @staticmethod
+    def _to_column(values):
+        # convert a list of values to a (data, mask) pair of arrays.
+        # mask is True where the value is not available.
+        mask = np.fromiter((x is None for x in values), dtype=bool,
+                           count=len(values))
+        available = [x for x in values if x is not None]
+        if available and all(_is_number(x) for x in available):
+            dtype = int
+            if not all(isinstance(x, (int, np.integer)) for x in available):
+                dtype = float
+            data = np.zeros(len(values), dtype=dtype)
+            data[~mask] = available
+            return data, mask
+        data = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            # one by one such that lists are not broadcasted
+            data[i] = value
+        return data, mask
 
     def _check_column_exists(self, column_title):
         if column_title not in self.column_names:
@@ -82,47 +156,61 @@ class Table(BaseUtility):
         bool : True if the column is (at least partially) sortable.
         """
         self._check_column_exists(column_title)
-        sortable_rows = self._sortable_rows_indices(column_title)
-        if len(sortable_rows) == 0:
-            return False
-        return True
-
-    def _sortable_rows_indices(self, column_title):
-        # find sortable values rows by checking value in the column
-        # if value is not a float nor an int, row is not sortable
-        column_index = self.get_column_index(column_title)
-        sortable_rows = [i for i, x in enumerate(self.rows)
-                         if type(x[column_index]) in (int, float)]
-        return sortable_rows
+        values, sortable = self.get_array(column_title)
+        return bool(sortable.any())
+
+    def get_array(self, column_title):
+        """Returns the numeric values of a column as an array of floats.
+
+        Parameters
+        ----------
+        column_title : str
+                       The column header.
+
+        Returns
+        -------
+        values : The float array of the values (nan if not numeric).
+        sortable : The boolean array telling which values are numeric.
+        """
+        index = self.get_column_index(column_title)
+        self._merge_new_rows()
+        data, mask = self._columns[index], self._masks[index]
+        if data.dtype != object:
+            values = data.astype(float)
+            values[mask] = np.nan
+            return values, ~mask
+        sortable = np.fromiter((_is_number(x) for x in data), dtype=bool,
+                               count=len(data))
+        values = np.full(len(data), np.nan)
+        values[sortable] = data[sortable].astype(float)
+        return values, sortable
 
     def sortby(self, column_title):
-        """Sort the table.
+        """Sort the table (stable sort). Rows that cannot be sorted
+        (not available or not numeric) are put at the end.
 
         Parameters
         ----------
         column_title : str
                        Sort in increasing order according to this column.
+
+        Returns
+        -------
+        array : The former index of each row in the sorted table.
         """
         self._check_column_exists(column_title)
         if not self.is_column_sortable(column_title):
             self._logger.warning(f"{column_title} not sortable...")
         self._logger.info(f"Sorting table according to {column_title}.")
-        sortable_rows = self._sortable_rows_indices(column_title)
-        non_sortable_rows = [i for i in range(len(self.rows))
-                             if i not in sortable_rows]
-        # sort the sortable rows
-        sort_indices = np.argsort(self.get_column(column_title,
-                                                  indices=sortable_rows))
-        newrows = [self.rows[x] for x in sort_indices]
-        # add non sortable rows at the end
-        for i in non_sortable_rows:
-            newrows.append(self.rows[i])
-        # just a little checkup that everything went well
-        assert len(newrows) == len(self.rows)
-        self.rows = newrows
+        values, sortable = self.get_array(column_title)
+        # last key is the primary one: sortable rows first then by value
+        order = np.lexsort((values, ~sortable))
+        self._columns = [column[order] for column in self._columns]
+        self._masks = [mask[order] for mask in self._masks]
+        return order
 
     def get_column(self, column_title, indices=None):
-        """Returns the data of a column.
+        """Returns the data of a column (None where not available).
 
         Parameters
         ----------
@@ -131,15 +219,15 @@ class Table(BaseUtility):
         indices : list, optional
                   The list if index to keep.
         """
-        self._check_column_exists(column_title)
-        column_index = self.column_names.index(column_title)
-        toreturn = [row[column_index] for row in self.rows]
-        # remove indices if needed
+        column_index = self.get_column_index(column_title)
+        self._merge_new_rows()
+        data = self._columns[column_index]
+        mask = self._masks[column_index]
         if indices is not None:
-            toret = []
-            for i in indices:
-                toret.append(toreturn[i])
-            toreturn = toret
+            data, mask = data[indices], mask[indices]
+        toreturn = data.tolist()
+        for i in np.flatnonzero(mask):
+            toreturn[i] = None
         return toreturn
 
     def get_column_index(self, column_title):
@@ -154,7 +242,25 @@ class Table(BaseUtility):
         return self.column_names.index(column_title)
 
     def print(self):
-        print(tabulate(self.rows, headers=self.column_names))
+        # cells are converted to str here such that tabulate does not
+        # have to guess the type of each of them.
+        not_available = styled_text("NOT AVAILABLE", style=Style.BRIGHT)
+        columns = []
+        alignments = []
+        for name in self.column_names:
+            column = self.get_column(name)
+            columns.append([not_available if x is None else str(x)
+                            for x in column])
+            numeric = self._columns[self.get_column_index(name)].dtype
+            alignments.append("left" if numeric == object else "right")
+        print(tabulate(list(zip(*columns)), headers=self.column_names,
+                       disable_numparse=True, colalign=alignments))
+
+
+def _is_number(value):
+    # bools are not considered as numbers
+    return (isinstance(value, (int, float, np.integer, np.floating)) and
+            not isinstance(value, (bool, np.bool_)))
 
 
 class TreeBuilder(BaseBuilder):
@@ -171,7 +277,9 @@ class TreeBuilder(BaseBuilder):
 
     def __init__(self, top_directory,
                  ignore=None,
-                 time_between_updates=TIME_BETWEEN_UPDATES, **kwargs):
+                 time_between_updates=TIME_BETWEEN_UPDATES,
+                 max_workers=MAX_WORKERS, timeout=None, cache=None,
+                 **kwargs):
         """TreeBuilder init method.
 
         Parameters
@@ -183,6 +291,21 @@ class TreeBuilder(BaseBuilder):
         time_between_updates : float, optional
                                Gives the minimal time before updating
                                the status tree.
+        max_workers : int, optional
+                      Number of threads used to find the calculations and
+                      to get their status. If 1, everything is done
+                      sequentially.
+        timeout : float, optional
+                  If not None, maximal time (in seconds) to wait for the
+                  status of a single calculation. Calculations that take
+                  too long are reported with an unknown status.
+        cache : bool or str, optional
+                If not None, the status, convergence and output variables of
+                each calculation are kept in a persistent SQLite cache and
+                only computed again when its log or output files change.
+                If True, the cache is stored in the user cache directory.
+                If a str, it is the path of the cache file (e.g. a file at
+                the top of the calculation tree).
         """
         super().__init__(top_directory, **kwargs)
         self._logger.info(f"Computing calculation tree status from"
@@ -192,48 +315,214 @@ class TreeBuilder(BaseBuilder):
         if isinstance(ignore, str):
             ignore = [ignore, ]
         self._logger.debug(f"Ignore these directories: {ignore}.")
+        if cache is True:
+            cache = default_cache_path(self._top_directory)
+        if cache:
+            cache = StatusCache(cache, loglevel=self._logger.level)
+        else:
+            cache = None
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout
         self.tree = self._get_tree(self._top_directory, ignore)
         self._status = None
         self._last_update = time.time() - time_between_updates
         self.time_between_updates = time_between_updates
+        self._fingerprints = None  # used when watching the tree
 
     def _set_main_directory(self, directory_name):
         self._top_directory = directory_name
 
     def _get_tree(self, top_directory, ignore):
-        # check if current dir is a calculation directory
-        if CalculationDir.is_calculation_dir(top_directory):
-            self._logger.debug(f"Found a calculation directory:"
-                               f" {top_directory}")
-            return [CalculationDir(top_directory,
-                                   ignore=ignore,
-                                   loglevel=self._logger.level)]
-        # if not, look in all subdirectories
-        subentries = os.listdir(top_directory)
-        subdirs = [os.path.join(top_directory, x)
-                   for x in subentries if os.path.isdir(x)]
-        # remove directories to ignore
-        subdirs = [x for x in subdirs if os.path.basename(x) not in ignore]
-        status = []
-        for subdir in subdirs:
-            status += self._get_tree(os.path.join(top_directory,
-                                                  subdir),
-                                     ignore)
-        return status
+        # the calculation directories are only found here, they are
+        # read on demand.
+        paths = find_calculation_dirs(top_directory, ignore=ignore,
+                                      max_workers=self.max_workers)
+        self._logger.debug(f"Found {len(paths)} calculation directories.")
+        return [CalculationDir(path, ignore=ignore, cache=self.cache,
+                               check=False, loglevel=self._logger.level)
+                for path in paths]
 
     @property
     def status(self):
         if time.time() - self._last_update < self.time_between_updates:
             self._logger.debug("Don't need to reupdate tree: too soon.")
             return self._status
-        status = []
         self._logger.info("Computing status of calculation tree.")
-        for calc in self.tree:
-            status.append(calc.status)
-        self._status = status
+        self._status = self._get_status(self.tree)
         self._last_update = time.time()
         return self._status
 
+    def _get_status(self, calcs):
+        with self._cache_batch():
+            return map_in_threads(lambda calc: calc.status, calcs,
+                                  max_workers=self.max_workers,
+                                  timeout=self.timeout,
+                                  on_error=self._unknown_status)
+
+    def _cache_batch(self):
+        # the cache (if any) is committed once per status refresh
+        if self.cache is None:
+            return contextlib.nullcontext()
+        return self.cache.batch()
+
+    async def astatus(self, executor=None, max_concurrency=None):
+        """Async counterpart of the status property: the status of each
+        calculation is computed in an executor without blocking the event
+        loop and yielded as soon as it is known (not in the tree order).
+        Once all calculations are done, the status property is updated.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.ThreadPoolExecutor, optional
+                   The threads getting the status. If None, the default
+                   executor of the event loop (threads) is used. Processes
+                   cannot be used: the calculations (and their cache) are
+                   shared with the builder.
+        max_concurrency : int, optional
+                          The maximal number of calculations checked at the
+                          same time. If None, it is max_workers.
+        """
+        if (executor is not None and
+                not isinstance(executor, ThreadPoolExecutor)):
+            raise TypeError("The status can only be computed in threads"
+                            " (a ThreadPoolExecutor).")
+        if time.time() - self._last_update < self.time_between_updates:
+            self._logger.debug("Don't need to reupdate tree: too soon.")
+            for status in self._status:
+                yield status
+            return
+        if max_concurrency is None:
+            max_concurrency = self.max_workers
+        self._logger.info("Computing status of calculation tree.")
+        statuses = [None] * len(self.tree)
+        with self._cache_batch():
+            async for index, status in aimap(
+                    attrgetter("status"), self.tree, executor=executor,
+                    max_concurrency=max_concurrency, timeout=self.timeout,
+                    on_error=self._unknown_status):
+                statuses[index] = status
+                yield status
+        self._status = statuses
+        self._last_update = time.time()
+
+    def _unknown_status(self, calc, error):
+        # status returned when it could not be computed in time (or at all)
+        self._logger.error(f"Could not get status of {calc.path}:"
+                           f" {error!r}.")
+        return {"path": calc.path,
+                "name": os.path.basename(calc.path),
+                "calculation_started": None,
+                "calculation_finished": None,
+                "error": error}
+
+    def watch(self, callback, interval=WATCH_INTERVAL, max_polls=None):
+        """Watch the calculation tree and call a function each time a
+        calculation changes state. Only the size and modification time of
+        the log and output files are checked at each poll; the status of a
+        calculation is computed again only if these files changed.
+
+        Parameters
+        ----------
+        callback : callable
+                   Called with each event (see the iter_events method).
+        interval : float, optional
+                   Time (in seconds) between two polls.
+        max_polls : int, optional
+                    If not None, stop watching after this number of polls.
+                    Otherwise, watch forever.
+        """
+        for event in self.iter_events(interval=interval, max_polls=max_polls):
+            callback(event)
+
+    def iter_events(self, interval=WATCH_INTERVAL, max_polls=None):
+        """Watch the calculation tree and yield an event each time a
+        calculation changes state (see the watch method).
+
+        Events are dicts with the keys:
+        - 'event': one of 'started', 'finished', 'converged' and 'failed'.
+                   'failed' is for calculations that finished without
+                   reaching convergence or whose status cannot be found.
+        - 'path': the calculation directory.
+        - 'status': the new status of the calculation.
+        """
+        npolls = 0
+        while max_polls is None or npolls < max_polls:
+            if npolls:
+                time.sleep(interval)
+            yield from self._poll()
+            npolls += 1
+
+    async def awatch(self, interval=WATCH_INTERVAL, max_polls=None):
+        """Same as iter_events but as an async iterator. Polls are done in
+        a thread not to block the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        npolls = 0
+        while max_polls is None or npolls < max_polls:
+            if npolls:
+                await asyncio.sleep(interval)
+            for event in await loop.run_in_executor(None, self._poll):
+                yield event
+            npolls += 1
+
+    def _poll(self):
+        # returns the events of the calculations whose files changed since
+        # the last poll. The first poll only records the state of the tree.
+        fingerprints = [self._get_fingerprint(calc) for calc in self.tree]
+        if self._fingerprints is None:
+            self._logger.info("Recording initial state of the tree.")
+            self._status = self._get_status(self.tree)
+            self._fingerprints = fingerprints
+            self._last_update = time.time()
+            return []
+        changed = [i for i, (old, new) in
+                   enumerate(zip(self._fingerprints, fingerprints))
+                   if old != new]
+        self._logger.debug(f"{len(changed)} calculations changed.")
+        self._fingerprints = fingerprints
+        new_statuses = self._get_status([self.tree[i] for i in changed])
+        events = []
+        for i, new in zip(changed, new_statuses):
+            events += self._get_events(self.tree[i], self._status[i], new)
+            self._status[i] = new
+        self._last_update = time.time()
+        return events
+
+    def _get_fingerprint(self, calc):
+        if not calc.files["log"] and not calc.files["output"]:
+            # not started => look for new files
+            calc.refresh_files()
+        return calc.fingerprint
+
+    def _get_events(self, calc, old, new):
+        # compare old and new status of a calculation to get its events
+        kinds = []
+        if "error" in new:
+            if "error" not in old:
+                kinds.append("failed")
+        else:
+            if new["calculation_started"] and not old["calculation_started"]:
+                kinds.append("started")
+            if (new["calculation_finished"] and
+                    not old["calculation_finished"]):
+                kinds.append("finished")
+                try:
+                    converged = calc.is_calculation_converged
+                except (ValueError, OSError) as e:
+                    # cannot tell for non scf calculations or without output
+                    self._logger.error(f"No convergence for {calc.path}:"
+                                       f" {e!r}.")
+                    converged = None
+                if converged is True:
+                    kinds.append("converged")
+                elif converged is False:
+                    kinds.append("failed")
+        for kind in kinds:
+            self._logger.info(f"{calc.path}: {kind}.")
+        return [{"event": kind, "path": calc.path, "status": new}
+                for kind in kinds]
+
     def print_attributes(self, *args, shortpath=True, delta=None, sortby=None,
                          delta_type="percent",
                          precision=2):
@@ -251,10 +540,10 @@ class TreeBuilder(BaseBuilder):
                Anything else will print the value of the output variable.
         shortpath : bool, optional
                     If False, the full path to the calculation is shown.
-        delta : str, optional
-                A column will be added
-                to show the variations of the parameter. It should be
-                an abinit output variable (like 'etotal').
+        delta : str or list, optional
+                A column will be added for each of these parameters
+                to show their variations. They should be
+                abinit output variables (like 'etotal').
         delta_type : str, optional {'percent', 'absolute', 'absolute_per_atom'}
                      Gives the 'units' of the deltas;
                      - percent: delta is given in percentage of difference
@@ -269,108 +558,190 @@ class TreeBuilder(BaseBuilder):
         precision : int, optional
                     Number of decimals for delta columns.
         """
+        table = self._get_attributes_table(args, shortpath, delta, sortby,
+                                           delta_type, precision, styled=True)
+        table.print()
+
+    def export_attributes(self, path, *args, format=None, shortpath=True,
+                          delta=None, sortby=None, delta_type="percent"):
+        """Write the arguments from each calculation in the tree to a machine
+        readable file. Values are typed (no colors) and unavailable values
+        are null.
+
+        If sortby is None, each row is written as soon as its calculation
+        is done. Otherwise, all rows are written at the end, once sorted.
+
+        Parameters
+        ----------
+        path : str
+               The path of the file to write ('-' for the standard output,
+               the format must then be given).
+        format : str, optional {'csv', 'jsonl', 'npz'}
+                 The file format. If None, it is given by the file
+                 extension.
+        All other arguments are the same as for the print_attributes method.
+        """
+        self._check_delta(delta, sortby, delta_type)
+        if sortby is not None:
+            table = self._get_attributes_table(args, shortpath, delta, sortby,
+                                               delta_type, None, styled=False)
+            with get_exporter(path, table.column_names,
+                              format=format) as exporter:
+                for row in table.rows:
+                    exporter.write_row(dict(zip(table.column_names, row)))
+            return
+        columns, variables, convergence = self._get_columns(args, delta,
+                                                            delta_type)
+        paths = self._get_calculations(shortpath=shortpath)
+        with get_exporter(path, columns, format=format) as exporter:
+            for index, record in self._iter_records(variables,
+                                                    convergence=convergence):
+                row = self._get_row(paths[index], record, columns,
+                                    styled=False)
+                exporter.write_row(dict(zip(columns, row)))
+
+    def _check_delta(self, delta, sortby, delta_type):
         if delta is not None and sortby is None:
             raise ValueError("Delta is not None but values need to be compared"
                              " to something. Use the sortby argument to tell"
                              " which value to compare to.")
+        if delta_type not in DELTA_TYPES:
+            raise ValueError(f"Invalid delta type: {delta_type}.")
+
+    def _get_columns(self, args, delta, delta_type):
+        # returns the column names, the output variables to get and if the
+        # convergence is needed.
         args = list(args)
         self._logger.info(f"Getting tree attributes for {args}.")
-        # create first column which tells the calculation title
-        table = Table(["calculations"])
-        calcs = self._get_calculations()
-        for calc in calcs:
-            table.add_row([calc])
-
-        # print calculation status if needed
+        columns = ["calculations"]
         if "status" in args:
             args.remove("status")
-            table.add_column("status",
-                             self._get_calculation_status())
-        # print convergence status if needed
-        if "convergence_reached" in args:
+            columns.append("status")
+        convergence = "convergence_reached" in args
+        if convergence:
             args.remove("convergence_reached")
-            table.add_column("convergence", self._get_convergence())
-        # print each attribute column
-        for arg in args:
-            table.add_column(arg, self._get_attribute(arg))
+            columns.append("convergence")
+        columns += args
+        variables = list(args)
+        if delta is not None and delta_type == "absolute_per_atom":
+            if "natom" not in variables:
+                variables.append("natom")
+        return columns, variables, convergence
+
+    def _get_attributes_table(self, args, shortpath, delta, sortby,
+                              delta_type, precision, styled=True):
+        # build the table of the attributes. Sorted and with deltas if needed.
+        self._check_delta(delta, sortby, delta_type)
+        if isinstance(delta, str):
+            delta = [delta, ]
+        columns, variables, convergence = self._get_columns(args, delta,
+                                                            delta_type)
+        # get everything from each calculation at once
+        records = self._get_records(variables, convergence=convergence)
+        table = Table(columns)
+        paths = self._get_calculations(shortpath=shortpath)
+        for path, record in zip(paths, records):
+            table.add_row(self._get_row(path, record, columns, styled=styled))
+        natoms = np.array([record["variables"].get("natom") for record in
+                           records], dtype=float)
 
         # sort table if needed
         if sortby is not None:
-            table.sortby(sortby)
-        # finish the first loop to make sure the sorted value is retrieved
-        # and table has been sorted already.
+            natoms = natoms[table.sortby(sortby)]
+        # deltas are computed once the table is sorted
         if delta is not None:
-            for d in delta:
-                if not table.is_column_sortable(d):
-                    # column cannot be sorted, do not compute deltas
-                    self._logger.error(f"{d} is not sortable => cannot compute"
-                                       f" its delta.")
-                    continue
-                data = table.get_column(d)
-                index = table.get_column_index(d) + 1
+            if delta_type != "absolute_per_atom":
                 natoms = None
-                if delta_type == "absolute_per_atom":
-                    natoms = []
-                    for c in self.tree:
-                        try:
-                            natom = c.get_output_var("natom")[0]
-                        except LookupError:
-                            # calculation not finished => return none
-                            natom = None
-                        natoms.append(natom)
-                name, values = self._get_delta_attribute(d, data, precision,
-                                                         delta_type,
-                                                         natoms=natoms)
-                table.add_column(name, values, index=index)
-        table.print()
-
-    def _get_delta_attribute(self, delta, data, precision, delta_type,
-                             natoms=None):
-        # compute delta column from data. Print result with 'precision'
-        # decimals
-        # WE ASSUME HERE THE TABLE HAS ALREADY BEEN SORTED
-        # check that name is ok
-        name = "delta_" + delta
-        if delta_type == "percent":
-            name += " (%)"
-        elif delta_type == "absolute":
-            name += " (abs)"
-        elif delta_type == "absolute_per_atom":
-            name += " (abs/atom)"
-        else:
-            ValueError(f"Invalid delta type: {delta_type}.")
-        deltas = []  # delta column values
-        # if column is sortable => at least one value is an int or a float
-        # indices of values which we can extract a delta
-        can_work_with_indices = [i for i, x in enumerate(data)
-                                 if type(x) in (int, float)
-                                 and natoms[i] is not None]
-        last_can_work = 0
-        for i, x in enumerate(data):
-            if i in can_work_with_indices:
-                # can compute a delta
-                if last_can_work == 0:
-                    # first value => no delta to compute
-                    deltas.append("--")
-                    last_can_work += 1
-                    continue
-                lastval = data[can_work_with_indices[last_can_work - 1]]
-                if delta_type == "percent":
-                    delta_val = (x - lastval) / abs(lastval) * 100
-                elif (delta_type == "absolute" or
-                      delta_type == "absolute_per_atom"):
-                    delta_val = x - lastval
-                    if delta_type == "absolute_per_atom":
-                        delta_val /= natoms[i]
-                delta_val = round(delta_val, precision)
-                deltas.append(delta_val)
-                last_can_work += 1
+            for d in delta:
+                self._add_delta_column(table, d, delta_type, natoms,
+                                       precision)
+        return table
+
+    def _get_row(self, path, record, columns, styled=True):
+        # get the row of a calculation from its record
+        row = [path]
+        for column in columns[1:]:
+            if column == "status":
+                value = self._get_status_text(record["status"])
+                if styled:
+                    value = styled_text(value, color=STATUS_COLORS[value],
+                                        style=Style.BRIGHT)
+            elif column == "convergence":
+                value = record["convergence"]
+                if styled and value is not None:
+                    value = self._get_convergence_text(value)
+            else:
+                # if computation not finished; attribute is not available
+                value = record["variables"].get(column)
+            row.append(value)
+        return row
+
+    def _iter_records(self, variables, convergence=False):
+        # get the status, the convergence (if needed) and the output
+        # variables of each calculation. The output file of a calculation
+        # is parsed only once and calculations are processed in parallel.
+        # Yields the (index, record) pairs as soon as each one is done.
+        statuses = None
+        if time.time() - self._last_update < self.time_between_updates:
+            statuses = self._status
+
+        def get_record(index):
+            status = None
+            if statuses is not None:
+                status = statuses[index]
+            return self.tree[index].get_attributes(
+                    variables, convergence=convergence, status=status)
+
+        def on_error(index, error):
+            calc = self.tree[index]
+            if statuses is not None:
+                status = statuses[index]
             else:
-                # cannot work with this value
-                deltas.append(styled_text("NOT AVAILABLE",
-                                          style=Style.BRIGHT))
-        self._logger.debug(f"deltas to add {delta}: {deltas}.")
-        return name, deltas
+                status = self._unknown_status(calc, error)
+            self._logger.error(f"Could not get attributes of {calc.path}:"
+                               f" {error!r}.")
+            return {"status": status, "convergence": None, "variables": {}}
+
+        new_statuses = [None] * len(self.tree)
+        with self._cache_batch():
+            for index, record in imap_in_threads(
+                    get_record, range(len(self.tree)),
+                    max_workers=self.max_workers, timeout=self.timeout,
+                    on_error=on_error):
+                new_statuses[index] = record["status"]
+                yield index, record
+        if statuses is None:
+            self._status = new_statuses
+            self._last_update = time.time()
+
+    def _get_records(self, variables, convergence=False):
+        # same as _iter_records but the records are in the tree order
+        records = [None] * len(self.tree)
+        for index, record in self._iter_records(variables,
+                                                convergence=convergence):
+            records[index] = record
+        return records
+
+    def _add_delta_column(self, table, delta, delta_type, natoms, precision):
+        # add the delta column of 'delta' right after it.
+        # WE ASSUME HERE THE TABLE HAS ALREADY BEEN SORTED
+        if not table.is_column_sortable(delta):
+            # column cannot be sorted, do not compute deltas
+            self._logger.error(f"{delta} is not sortable => cannot compute"
+                               f" its delta.")
+            return
+        values, sortable = table.get_array(delta)
+        deltas, valid = compute_deltas(values, delta_type, natoms=natoms)
+        if precision is not None:
+            deltas = np.round(deltas, precision)
+        column = [None if np.isnan(x) else x for x in deltas.tolist()]
+        if precision is not None and valid.any():
+            # first value => no delta to compute
+            column[np.argmax(valid)] = "--"
+        self._logger.debug(f"deltas to add {delta}: {column}.")
+        name = f"delta_{delta} ({DELTA_TYPES[delta_type]})"
+        table.add_column(name, column,
+                         index=table.get_column_index(delta) + 1)
 
     def print_status(self, shortpath=True):
         """Prints the status of each calculation in the calculation tree.
@@ -386,20 +757,6 @@ class TreeBuilder(BaseBuilder):
         self.print_attributes("status", "convergence_reached",
                               shortpath=shortpath)
 
-    def _get_attribute(self, attribute):
-        values = []
-        for i, calc in enumerate(self.tree):
-            status = self.status[i]
-            # if computation not finished; attribute is not available
-            if not status["calculation_finished"]:
-                values.append(styled_text("NOT AVAILABLE",
-                                          style=Style.BRIGHT))
-                continue
-            # use element 0 here cause values are tuples (val, units)
-            values.append(calc.get_output_var(attribute)[0])
-        self._logger.debug(f"Values for {attribute} found are: {values}.")
-        return values
-
     def _get_calculations(self, shortpath=True):
         paths = []
         for calc in self.tree:
@@ -409,47 +766,60 @@ class TreeBuilder(BaseBuilder):
             paths.append(path)
         return paths
 
-    def _get_calculation_status(self):
-        # get calculation status for each calculation.
-        statuses = []
-        for calculation in self.status:
-            started = calculation["calculation_started"]
-            finished = calculation["calculation_finished"]
-            if not started:
-                status = styled_text("NOT STARTED",
-                                     color=Fore.RED,
-                                     style=Style.BRIGHT)
-            elif started and not finished:
-                status = styled_text("NOT FINISHED",
-                                     color=Fore.YELLOW,
-                                     style=Style.BRIGHT)
-            elif started and finished:
-                status = styled_text("COMPLETED",
-                                     color=Fore.GREEN,
-                                     style=Style.BRIGHT)
-            statuses.append(status)
-        return statuses
-
-    def _get_convergence(self):
+    @staticmethod
+    def _get_status_text(status):
+        # get the status of a calculation as a text
+        started = status["calculation_started"]
+        finished = status["calculation_finished"]
+        if "error" in status:
+            return "UNKNOWN"
+        if not started:
+            return "NOT STARTED"
+        if not finished:
+            return "NOT FINISHED"
+        return "COMPLETED"
+
+    @staticmethod
+    def _get_convergence_text(convergence):
         # we assume here a SCF calculation
-        statuses = []
-        for output, calculation in zip(self.tree, self.status):
-            started = calculation["calculation_started"]
-            finished = calculation["calculation_finished"]
-            conv = output.is_calculation_converged
-            if not started and not finished:
-                status = styled_text("NOT AVAILABLE",
-                                     style=Style.BRIGHT)
-            if started and not finished:
-                status = styled_text("NOT AVAILABLE",
-                                     style=Style.BRIGHT)
-            elif conv is False and finished:
-                status = styled_text("NOT REACHED",
-                                     color=Fore.RED,
-                                     style=Style.BRIGHT)
-            elif conv is True and finished:
-                status = styled_text("REACHED",
-                                     color=Fore.GREEN,
-                                     style=Style.BRIGHT)
-            statuses.append(status)
-        return statuses
+        if convergence:
+            return styled_text("REACHED", color=Fore.GREEN, style=Style.BRIGHT)
+        return styled_text("NOT REACHED", color=Fore.RED, style=Style.BRIGHT)
+
+
+def compute_deltas(values, delta_type, natoms=None):
+    """Compute the variation of each value from the previous available one.
+
+    Parameters
+    ----------
+    values : array
+             The values (nan where not available).
+    delta_type : str {'percent', 'absolute', 'absolute_per_atom'}
+                 The 'units' of the deltas (see TreeBuilder.print_attributes).
+    natoms : array, optional
+             The number of atoms for each value (nan where not available).
+             Needed for 'absolute_per_atom' deltas.
+
+    Returns
+    -------
+    deltas : The array of deltas (nan where not available and for the first
+             available value).
+    valid : The boolean array of the values used to compute deltas.
+    """
+    if delta_type not in DELTA_TYPES:
+        raise ValueError(f"Invalid delta type: {delta_type}.")
+    values = np.asarray(values, dtype=float)
+    if natoms is None:
+        natoms = np.ones(len(values))
+    natoms = np.asarray(natoms, dtype=float)
+    valid = np.isfinite(values) & np.isfinite(natoms)
+    indices = np.flatnonzero(valid)
+    previous = values[indices[:-1]]
+    variations = values[indices[1:]] - previous
+    if delta_type == "percent":
+        variations = variations / np.abs(previous) * 100
+    elif delta_type == "absolute_per_atom":
+        variations /= natoms[indices[1:]]
+    deltas = np.full(len(values), np.nan)
+    deltas[indices[1:]] = variations
+    return deltas, valid
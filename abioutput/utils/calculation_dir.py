@@ -1,16 +1,24 @@
 from .bases import BaseBuilder
-from .routines import search_in_all_subdirs
+from .routines import classify_files
 from .checkers import StatusChecker
-from abioutput.parsers import FilesFileParser, OutputParser
+from .output_pool import OUTPUT_POOL
+from .status_cache import get_fingerprint
+from abioutput.parsers import FilesFileParser
+from operator import attrgetter
+import asyncio
 import os
 
 
 class CalculationDir(BaseBuilder):
     """Class that represents a calculation directory.
+
+    Nothing is read from the directory until needed: the files are found
+    and the files file is parsed on first access.
     """
     _loggername = "CalculationDir"
 
-    def __init__(self, directory, ignore=None, **kwargs):
+    def __init__(self, directory, ignore=None, cache=None, check=True,
+                 **kwargs):
         """CalculationDir init method.
 
         Parameters
@@ -20,28 +28,57 @@ class CalculationDir(BaseBuilder):
         ignore : list, optional
                  If not None, this list of directories will be ignored while
                  searching for the corresponding calculation files.
+        cache : StatusCache instance, optional
+                If not None, the status, convergence and output variables
+                are taken from this cache as long as the log and output
+                files do not change.
+        check : bool, optional
+                If False, the directory is assumed to be a calculation
+                directory (e.g.: when it was already found by
+                routines.find_calculation_dirs).
         """
-        super().__init__(directory, **kwargs)
-        if not self.is_calculation_dir(directory):
+        super().__init__(directory, check_directory=check, **kwargs)
+        if check and not self.is_calculation_dir(directory):
             raise FileNotFoundError(f"No input file found in {directory}.")
         self._ignore = ignore
-        self.filesfile = FilesFileParser(self._get_files_file(ignore=ignore),
-                                         loglevel=self._logger.level)
-        self.inputfile = self._get_input_file(ignore=ignore)
-        self._outputfile = None
+        self._cache = cache
+        self._files = None
+        self._filesfile = None
+        self._output_path = None  # set once calculation is finished
+
+    @property
+    def files(self):
+        if self._files is None:
+            self.refresh_files()
+        return self._files
+
+    @property
+    def filesfile(self):
+        if self._filesfile is None:
+            self._filesfile = FilesFileParser(self._get_files_file(),
+                                              loglevel=self._logger.level)
+        return self._filesfile
+
+    @property
+    def inputfile(self):
+        return self._get_input_file()
 
     @property
     def outputfile(self):
-        if self._outputfile is not None:
-            return self._outputfile
-        if not self.status["calculation_finished"]:
-            raise LookupError("Calculation is not finished,"
-                              " cannot analyse output file.")
-        self._outputfile = OutputParser(self.filesfile["output_path"])
-        return self._outputfile
+        # parsed outputs are kept in a pool shared by all calculations
+        # with a memory budget: they are not held here.
+        if self._output_path is None:
+            if not self.status["calculation_finished"]:
+                raise LookupError("Calculation is not finished,"
+                                  " cannot analyse output file.")
+            self._output_path = self.filesfile["output_path"]
+        return OUTPUT_POOL.get(self._output_path)
 
     @property
     def is_calculation_converged(self):
+        cached = self._get_cached("convergence")
+        if cached is not None:
+            return cached
         # check if computation is finished
         try:
             self.outputfile
@@ -49,11 +86,18 @@ class CalculationDir(BaseBuilder):
             self._logger.error("Cannot read convergence if computation"
                                " is not finished.")
             return False
-        iscf = self.get_output_var("iscf")[0]
+        converged = self._get_convergence_from_output()
+        self._set_cached(convergence=converged)
+        return converged
+
+    def _get_convergence_from_output(self):
+        # variables read from the output directly (not through the cache)
+        output = self.outputfile
+        iscf = output.extract_output_variable("iscf")[0]
         if iscf < 0:
             # NON SCF CALCULATION => cannot tell if convergence is reached
             raise ValueError(f"iscf={iscf}<0 => cannot tell if conv. is reach")
-        ionmov = self.get_output_var("ionmov")
+        ionmov = output.extract_output_variable("ionmov")
         if ionmov is not None:
             ionmov = ionmov[0]
         else:
@@ -70,13 +114,17 @@ class CalculationDir(BaseBuilder):
 
     def _dig_output_for_convergence(self, converged_keywords,
                                     nonconverged_keywords):
-        with open(self.filesfile["output_path"]) as f:
-            lines = f.readlines()
-        for line in lines[::-1]:
-            if converged_keywords in line:
-                return True
-            elif nonconverged_keywords in line:
-                return False
+        # the output file is already in memory => look into it instead of
+        # reading the file again. Look from the end of the file.
+        output = self.outputfile
+        sections = ([output.header] + list(output.datasets.values()) +
+                    [output.footer])
+        for section in sections[::-1]:
+            for line in section.splitlines()[::-1]:
+                if converged_keywords in line:
+                    return True
+                elif nonconverged_keywords in line:
+                    return False
         # if we are here, computation is not finished => return False
         self._logger.warning("Could not find the convergence status...")
         return False
@@ -89,25 +137,142 @@ class CalculationDir(BaseBuilder):
         outputvar : str
                     The name of the output variable.
         """
+        cached = self._get_cached("variables")
+        if cached is not None and outputvar in cached:
+            return cached[outputvar]
         self._logger.debug(f"Extracting {outputvar} from output file.")
-        return self.outputfile.extract_output_variable(outputvar)
+        value = self.outputfile.extract_output_variable(outputvar)
+        self._set_cached(variables={outputvar: value})
+        return value
+
+    def get_attributes(self, variables, convergence=False, status=None):
+        """Returns the status, the convergence and the output variables of
+        this calculation at once. The output file is parsed at most once
+        and the cache (if any) is read once and written at most once.
+
+        Parameters
+        ----------
+        variables : list
+                    The names of the output variables.
+        convergence : bool, optional
+                      If True, the convergence status is given too.
+        status : dict, optional
+                 The status if already known (it is not computed again).
 
-    def _get_files_file(self, **kwargs):
-        return search_in_all_subdirs(self.path, fileending=".files",
-                                     expected=1, **kwargs)[0]
+        Returns
+        -------
+        dict : The 'status', the 'convergence' (None if not asked for or if
+               it cannot be told) and the 'variables' (name: value). Nothing
+               but the status is available if the calculation is not
+               finished.
+        """
+        if status is None:
+            status = self.status
+        record = {"status": status, "convergence": None, "variables": {}}
+        if not status["calculation_finished"]:
+            return record
+        if self._output_path is None:
+            # the status is known => don't compute it again to find the output
+            self._output_path = self.filesfile["output_path"]
+        fingerprint = cached = None
+        if self._cache is not None:
+            fingerprint = self.fingerprint
+            cached = self._cache.get(self.path, fingerprint)
+        if cached is None:
+            cached = {"convergence": None, "variables": {}}
+        new = {}
+        if convergence:
+            record["convergence"] = cached["convergence"]
+            if record["convergence"] is None:
+                try:
+                    record["convergence"] = (
+                            self._get_convergence_from_output())
+                    new["convergence"] = record["convergence"]
+                except ValueError as e:
+                    # non scf calculation
+                    self._logger.error(str(e))
+        new_variables = {}
+        for variable in variables:
+            if variable in cached["variables"]:
+                value = cached["variables"][variable]
+            else:
+                self._logger.debug(f"Extracting {variable} from output"
+                                   f" file.")
+                value = self.outputfile.extract_output_variable(variable)
+                new_variables[variable] = value
+            if value is not None:
+                # use element 0 here cause values are tuples (val, units)
+                value = value[0]
+            record["variables"][variable] = value
+        if new_variables:
+            new["variables"] = new_variables
+        if new and self._cache is not None:
+            self._cache.set(self.path, fingerprint, **new)
+        return record
+
+    @property
+    def fingerprint(self):
+        """The fingerprint (sizes and modification times) of the log and
+        output files as last found in the calculation directory.
+        """
+        return get_fingerprint(self.files["log"] + self.files["output"])
+
+    def _get_cached(self, key):
+        if self._cache is None:
+            return None
+        record = self._cache.get(self.path, self.fingerprint)
+        if record is None:
+            return None
+        return record[key]
+
+    def _set_cached(self, **kwargs):
+        if self._cache is not None:
+            self._cache.set(self.path, self.fingerprint, **kwargs)
 
-    def _get_input_file(self, **kwargs):
-        return search_in_all_subdirs(self.path, fileending=".in",
-                                     expected=1, **kwargs)[0]
+    def _get_files_file(self):
+        return self._get_unique_file("files_file")
+
+    def _get_input_file(self):
+        return self._get_unique_file("input")
+
+    def _get_unique_file(self, role):
+        found = self.files[role]
+        if len(found) != 1:
+            raise ValueError("Found more or less files as expected.")
+        return found[0]
 
     def _set_main_directory(self, directory_name):
         self.path = directory_name
 
+    def refresh_files(self):
+        """Walk the calculation directory again to update the list of files
+        (e.g.: when the calculation has produced new files).
+        """
+        self._files = classify_files(self.path, ignore=self._ignore)
+        return self._files
+
     @property
     def status(self):
-        checker = StatusChecker(self.path, self._ignore)
+        # log and output files appear while the calculation runs => the
+        # directory is walked again (only once) to catch them.
+        self.refresh_files()
+        cached = self._get_cached("status")
+        if cached is not None:
+            return cached
+        checker = StatusChecker(self.path, files=self.files,
+                                loglevel=self._logger.level)
+        self._set_cached(status=checker.status)
         return checker.status
 
+    async def astatus(self, executor=None):
+        """Async counterpart of the status property: the files are read in
+        an executor (the default one of the event loop if None) without
+        blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, attrgetter("status"),
+                                          self)
+
     @staticmethod
     def is_calculation_dir(directory):
         # check if this directory is a calculation directory
@@ -115,11 +280,9 @@ class CalculationDir(BaseBuilder):
         # in the directory. If yes, than it is considered a calculation dir
         if not os.path.isdir(directory):
             raise NotADirectoryError(f"{directory} is not a directory.")
-        entries = os.listdir(directory)
-        files = [x for x in entries if
-                 os.path.isfile(os.path.join(directory, x))]
-        for f in files:
-            if f.endswith(".in"):
-                # found an input file
-                return True
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".in") and entry.is_file():
+                    # found an input file
+                    return True
         return False
@@ -1,5 +1,5 @@
 from ..bases import BaseUtility
-from .routines import search_in_all_subdirs
+from .routines import classify_files
 import os
 
 
@@ -8,7 +8,7 @@ class StatusChecker(BaseUtility):
     """
     _loggername = "StatusChecker"
 
-    def __init__(self, directory, ignore=None, **kwargs):
+    def __init__(self, directory, ignore=None, files=None, **kwargs):
         """Status checker init method.
 
         Parameters
@@ -17,18 +17,24 @@ class StatusChecker(BaseUtility):
                     The calculation directory.
         ignore : list, optional
                  Ignore these subdirectories when looking for files.
+        files : dict, optional
+                The files of the directory already sorted by role
+                (see routines.classify_files). If None, the directory is
+                walked to find them.
         """
         super().__init__(**kwargs)
-        self.status = self._get_status(directory, ignore=ignore)
+        if files is None:
+            files = classify_files(directory, ignore=ignore)
+        self.status = self._get_status(directory, files)
 
-    def _get_status(self, directory, **kwargs):
+    def _get_status(self, directory, files):
         # check first if this is really a calculation direcectory
         self._logger.debug(f"Looking for {directory}'s status.")
         status = {"path": directory,
                   "name": os.path.basename(directory)}
         # look for log and output files
-        log = search_in_all_subdirs(directory, fileending="log", **kwargs)
-        out = search_in_all_subdirs(directory, infilename=".out", **kwargs)
+        log = files["log"]
+        out = files["output"]
         if len(log) == 0 and len(out) == 0:
             # no log and output file found.
             # this means that computation has not started or that files were
@@ -0,0 +1,205 @@
+import abc
+import csv
+import json
+import numpy as np
+import os
+import sys
+
+
+class BaseExporter(abc.ABC):
+    """Base class for the machine readable exports of a table of data.
+    Rows are written as soon as they are given (unless the format
+    cannot be streamed). Unavailable values are None.
+
+    Exporters are context managers closing the file at exit.
+    """
+    extension = None
+
+    def __init__(self, path, columns):
+        """Exporter init method.
+
+        Parameters
+        ----------
+        path : str
+               The path of the file to write. If '-', the standard output
+               is used.
+        columns : list
+                  The names of the columns.
+        """
+        self.path = path
+        self.columns = list(columns)
+
+    def _open(self, binary=False):
+        if self.path == "-":
+            return sys.stdout.buffer if binary else sys.stdout
+        if binary:
+            return open(self.path, "wb")
+        # the csv module writes its own line endings
+        return open(self.path, "w", newline="")
+
+    def _close(self, f):
+        if self.path == "-":
+            f.flush()
+        else:
+            f.close()
+
+    @abc.abstractmethod
+    def write_row(self, row):
+        """Write a row.
+
+        Parameters
+        ----------
+        row : dict
+              The value of each column.
+        """
+        pass
+
+    @abc.abstractmethod
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class CSVExporter(BaseExporter):
+    """Writes rows to a CSV file. Unavailable values are empty cells and
+    list values (and tuples or arrays) are written as JSON arrays.
+    """
+    extension = ".csv"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._file = self._open()
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+        self._file.flush()
+
+    def write_row(self, row):
+        cells = []
+        for column in self.columns:
+            value = _to_builtin(row.get(column))
+            if value is None:
+                value = ""
+            elif isinstance(value, (list, tuple, dict)):
+                value = json.dumps(value)
+            cells.append(value)
+        self._writer.writerow(cells)
+        self._file.flush()
+
+    def close(self):
+        self._close(self._file)
+
+
+class JSONLinesExporter(BaseExporter):
+    """Writes each row as a JSON object on its own line. Unavailable values
+    are null.
+    """
+    extension = ".jsonl"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._file = self._open()
+
+    def write_row(self, row):
+        line = {column: _to_builtin(row.get(column))
+                for column in self.columns}
+        self._file.write(json.dumps(line) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._close(self._file)
+
+
+class NPZExporter(BaseExporter):
+    """Writes all rows in a numpy .npz archive with one array per column.
+    Numeric and boolean columns are typed arrays, other columns are
+    arrays of str (lists are JSON encoded). For each column, a
+    '<column>_mask' array tells which values are not available.
+
+    This format cannot be streamed: the archive is written when closed.
+    """
+    extension = ".npz"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._rows = []
+
+    def write_row(self, row):
+        self._rows.append([_to_builtin(row.get(column))
+                           for column in self.columns])
+
+    def close(self):
+        arrays = {}
+        # without rows, each column is a zero-length array
+        columns = zip(*self._rows) if self._rows else [()] * len(self.columns)
+        for column, values in zip(self.columns, columns):
+            data, mask = _to_array(values)
+            arrays[column] = data
+            arrays[column + "_mask"] = mask
+        f = self._open(binary=True)
+        np.savez(f, **arrays)
+        self._close(f)
+
+
+EXPORTERS = {exporter.extension[1:]: exporter for exporter in
+             (CSVExporter, JSONLinesExporter, NPZExporter)}
+
+
+def get_exporter(path, columns, format=None):
+    """Returns the exporter to write a file.
+
+    Parameters
+    ----------
+    path : str
+           The path of the file to write ('-' for the standard output).
+    columns : list
+              The names of the columns.
+    format : str, optional {'csv', 'jsonl', 'npz'}
+             The format of the file. If None, it is given by the file
+             extension.
+    """
+    if format is None:
+        format = os.path.splitext(path)[1][1:]
+    if format not in EXPORTERS:
+        raise ValueError(f"Invalid export format: '{format}'. Valid ones"
+                         f" are: {list(EXPORTERS)}.")
+    return EXPORTERS[format](path, columns)
+
+
+def _to_builtin(value):
+    # convert numpy values to python ones (nan is not available) and
+    # sequences to lists (as they are written in JSON)
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(x) for x in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def _to_array(values):
+    # convert a column of values to a (data, mask) pair of arrays
+    mask = np.array([x is None for x in values], dtype=bool)
+    available = [x for x in values if x is not None]
+    numbers = [isinstance(x, (int, float)) and not isinstance(x, bool)
+               for x in available]
+    if available and all(isinstance(x, bool) for x in available):
+        data = np.zeros(len(values), dtype=bool)
+    elif available and all(numbers):
+        dtype = int
+        if not all(isinstance(x, int) for x in available):
+            dtype = float
+        data = np.zeros(len(values), dtype=dtype)
+    else:
+        available = [x if isinstance(x, str) else json.dumps(x)
+                     for x in available]
+        data = np.zeros(len(values), dtype=np.array(available + [""]).dtype)
+    data[~mask] = available
+    return data, mask
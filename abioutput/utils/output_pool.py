@@ -0,0 +1,162 @@
+from ..bases import BaseUtility
+from collections import OrderedDict
+import numpy as np
+import os
+import sys
+import threading
+
+
+MAX_MEMORY = 1024 ** 3  # bytes
+
+
+class OutputParserPool(BaseUtility):
+    """Pool of parsed output files shared by all the calculation directories.
+
+    The pool keeps the most recently used OutputParser objects until their
+    estimated memory exceeds a budget. The least recently used are then
+    dropped and will be parsed again if needed. An output file that changed
+    on disk is always parsed again.
+    """
+    _loggername = "OutputParserPool"
+
+    def __init__(self, max_memory=MAX_MEMORY, **kwargs):
+        """OutputParserPool init method.
+
+        Parameters
+        ----------
+        max_memory : int, optional
+                     The memory budget (in bytes) of the parsed outputs.
+        """
+        super().__init__(**kwargs)
+        self.max_memory = max_memory
+        # (path, kwargs): (key, parser, memory)
+        self._parsers = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path, **kwargs):
+        """Returns the parsed output file.
+
+        Parameters
+        ----------
+        path : str
+               The path to the output file.
+        Other kwargs are passed to the OutputParser if it is parsed. A file
+        parsed with other kwargs (e.g.: only some sections) is parsed
+        again.
+        """
+        path = os.path.abspath(path)
+        # None is the default of all the OutputParser kwargs
+        options = tuple(sorted((name, _get_hashable(value))
+                               for name, value in kwargs.items()
+                               if value is not None))
+        stat = os.stat(path)
+        key = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            entry = self._parsers.get((path, options))
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                self._parsers.move_to_end((path, options))
+                return entry[1]
+            self.misses += 1
+        # parse outside of the lock such that other outputs can be parsed
+        # at the same time
+        self._logger.debug(f"Parsing {path}.")
+        # imported here since importing abipy is slow
+        from abioutput.parsers import OutputParser
+        parser = OutputParser(path, **kwargs)
+        memory = get_memory_size(parser)
+        with self._lock:
+            if (path, options) in self._parsers:
+                self.memory -= self._parsers.pop((path, options))[2]
+            self._parsers[(path, options)] = (key, parser, memory)
+            self.memory += memory
+            self._evict()
+        return parser
+
+    def _evict(self):
+        # remove least recently used parsers until memory is below budget
+        # (the last one added is always kept)
+        while self.memory > self.max_memory and len(self._parsers) > 1:
+            (path, options), (key, parser, memory) = self._parsers.popitem(
+                    last=False)
+            self._logger.debug(f"Evicting {path} from the pool.")
+            self.memory -= memory
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all parsed outputs from the pool.
+        """
+        with self._lock:
+            self._parsers.clear()
+            self.memory = 0
+
+    @property
+    def stats(self):
+        """The pool statistics: number of hits, misses, evictions,
+        parsed outputs held and their estimated memory.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions,
+                    "size": len(self._parsers),
+                    "memory": self.memory,
+                    "max_memory": self.max_memory}
+
+    def __len__(self):
+        return len(self._parsers)
+
+
+def get_memory_size(parser):
+    """Returns the memory (in bytes) held by a parsed output file: its text
+    (header, datasets and footer), variables and data arrays.
+
+    Parameters
+    ----------
+    parser : OutputParser instance
+             The parsed output file.
+    """
+    return _get_size(vars(parser), set())
+
+
+def _get_size(obj, seen):
+    # size of the strings, numbers and arrays in nested containers (other
+    # objects, e.g.: loggers, are not counted)
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        # the data is counted once for all the views of the same array
+        base = obj
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        size = sys.getsizeof(obj) - (obj.nbytes if obj.flags.owndata else 0)
+        if ("data", id(base)) not in seen:
+            seen.add(("data", id(base)))
+            size += base.nbytes
+        return size
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_get_size(key, seen) +
+                                        _get_size(value, seen)
+                                        for key, value in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(_get_size(x, seen) for x in obj)
+    if isinstance(obj, (str, bytes, int, float, complex)):
+        return sys.getsizeof(obj)
+    return 0
+
+
+def _get_hashable(value):
+    # kwargs values used in the keys of the pool (lists become tuples)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return value
+
+
+# process wide pool used by all CalculationDir objects
+OUTPUT_POOL = OutputParserPool()
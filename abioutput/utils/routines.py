@@ -1,5 +1,15 @@
+from concurrent.futures import (ThreadPoolExecutor, TimeoutError,
+                                FIRST_COMPLETED, wait)
+import asyncio
 import colorama
 import os
+import time
+
+
+MAX_CONCURRENCY = 16  # items processed at the same time by aimap
+# time (in seconds) between two checks that an item submitted to a process
+# pool started running (aimap)
+START_POLL_INTERVAL = 0.01
 
 
 def search_in_all_subdirs(top_directory, filename=None,
@@ -35,22 +45,375 @@ def search_in_all_subdirs(top_directory, filename=None,
 def get_all_subfiles(top_directory, ignore=None):
     # return a list of the path of all files and subfiles in this dir.
     # ignore removes undesired subdirectories
-    entries = list(os.listdir(top_directory))
+    files = []
+    for entry in _walk_files(top_directory, ignore=ignore):
+        files.append(entry.path)
+    return files
+
+
+# roles of the files found in a calculation directory. Each role is tested
+# against the file name only. A file can have more than one role.
+FILE_ROLES = {"files_file": lambda name: name.endswith(".files"),
+              "input": lambda name: name.endswith(".in"),
+              "log": lambda name: name.endswith("log"),
+              "output": lambda name: ".out" in name,
+              "eig": lambda name: name.endswith("_EIG"),
+              "fatband": lambda name: "_FATBAND" in name,
+              "dos": lambda name: "_DOS" in name,
+              "dmft": lambda name: (name.endswith(".eig") or
+                                    "DMFT" in name)}
+
+
+def classify_files(top_directory, ignore=None):
+    """Walk a calculation directory once and sort its files by role.
+
+    Parameters
+    ----------
+    top_directory : str
+                    The directory to walk (subdirectories included).
+    ignore : list, optional
+             Names of the subdirectories to skip (at any depth).
+
+    Returns
+    -------
+    dict : The list of file paths for each role of FILE_ROLES.
+    """
+    files = {role: [] for role in FILE_ROLES}
+    for entry in _walk_files(top_directory, ignore=ignore):
+        for role, matches in FILE_ROLES.items():
+            if matches(entry.name):
+                files[role].append(entry.path)
+    return files
+
+
+def _walk_files(top_directory, ignore=None):
+    # yield the DirEntry of every file under top_directory using a single
+    # scandir per directory. The DirEntry caches the file type such that
+    # no additional stat is needed to separate files from directories.
     if isinstance(ignore, str):
         ignore = [ignore, ]
-    if ignore is not None:
-        for ign in ignore:
-            if ign in entries:
-                entries.remove(ign)
-    files_here = [os.path.join(top_directory, x)
-                  for x in entries
-                  if os.path.isfile(os.path.join(top_directory, x))]
-    files = files_here
-    for subdir in [os.path.join(top_directory, x)
-                   for x in entries
-                   if os.path.isdir(os.path.join(top_directory, x))]:
-        files += get_all_subfiles(subdir)
-    return files
+    if ignore is None:
+        ignore = []
+    subdirs = [top_directory]
+    while subdirs:
+        directory = subdirs.pop(0)
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda x: x.name):
+                if entry.name in ignore:
+                    continue
+                if entry.is_file():
+                    yield entry
+                elif entry.is_dir():
+                    subdirs.append(entry.path)
+
+
+def find_calculation_dirs(top_directory, ignore=None, max_workers=1):
+    """Find all the calculation directories (directories containing an input
+    file) under a directory. The subdirectories of a calculation directory
+    are not searched. Each directory is listed only once and the
+    calculation directories are found from the names of their entries only.
+
+    Parameters
+    ----------
+    top_directory : str
+                    The directory to search.
+    ignore : list, optional
+             Names of the directories to skip (at any depth).
+    max_workers : int, optional
+                  If not 1, the subdirectories of top_directory are searched
+                  in parallel by this number of threads.
+
+    Returns
+    -------
+    list : The sorted paths of the calculation directories.
+    """
+    if isinstance(ignore, str):
+        ignore = [ignore, ]
+    if ignore is None:
+        ignore = []
+    is_calculation_dir, subdirs = _scan_for_input_file(top_directory, ignore)
+    if is_calculation_dir:
+        return [top_directory]
+    if max_workers == 1:
+        found = [_find_calculation_dirs(subdir, ignore)
+                 for subdir in subdirs]
+    else:
+        found = map_in_threads(lambda subdir: _find_calculation_dirs(subdir,
+                                                                     ignore),
+                               subdirs, max_workers=max_workers)
+    return [path for paths in found for path in paths]
+
+
+def _find_calculation_dirs(top_directory, ignore):
+    found = []
+    subdirs = [top_directory]
+    while subdirs:
+        directory = subdirs.pop()
+        is_calculation_dir, subsubdirs = _scan_for_input_file(directory,
+                                                              ignore)
+        if is_calculation_dir:
+            found.append(directory)
+        else:
+            # reversed to pop them in sorted order
+            subdirs += subsubdirs[::-1]
+    return found
+
+
+def _scan_for_input_file(directory, ignore):
+    # list a directory once to tell if it contains an input file
+    # and to get its subdirectories (sorted).
+    is_calculation_dir = False
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name in ignore:
+                continue
+            if entry.is_dir():
+                subdirs.append(entry.path)
+            elif entry.name.endswith(".in") and entry.is_file():
+                is_calculation_dir = True
+    return is_calculation_dir, sorted(subdirs)
+
+
+def map_in_threads(function, items, max_workers=None, timeout=None,
+                   on_error=None):
+    """Apply a function on each item using a pool of threads.
+
+    Parameters
+    ----------
+    function : callable
+               The function to apply on each item.
+    items : list
+            The items to process.
+    max_workers : int, optional
+                  The maximal number of threads. If 1 (and no timeout), no
+                  thread is used. If None, the ThreadPoolExecutor default is
+                  used.
+    timeout : float, optional
+              If not None, the maximal time (in seconds) given to each item
+              once it started running. Items queued behind others are not
+              timed out while waiting for a thread.
+    on_error : callable, optional
+               If not None, called as on_error(item, exception) when an item
+               fails or times out and its return value is used as result.
+               Otherwise, the exception is raised.
+
+    Returns
+    -------
+    list : The results in the same order as the items.
+
+    Notes
+    -----
+    Python threads cannot be stopped: an item which timed out keeps running
+    in its thread (only the items not started yet are cancelled). A hung
+    item (e.g. a read on a dead network file system) keeps its thread
+    forever and blocks the exit of the interpreter, which joins the pool
+    threads at exit.
+    """
+    items = list(items)
+    if max_workers == 1 and timeout is None:
+        results = []
+        for item in items:
+            try:
+                results.append(function(item))
+            except Exception as e:
+                if on_error is None:
+                    raise
+                results.append(on_error(item, e))
+        return results
+    results = [None] * len(items)
+    for index, result in imap_in_threads(function, items,
+                                         max_workers=max_workers,
+                                         timeout=timeout, on_error=on_error):
+        results[index] = result
+    return results
+
+
+def imap_in_threads(function, items, max_workers=None, timeout=None,
+                    on_error=None):
+    """Same as map_in_threads but yields the (index, result) pairs as soon
+    as each item is done (not in the order of the items).
+
+    Each item has its own deadline, 'timeout' seconds after it started
+    running. If all the threads are taken by items which timed out (and
+    are still running) for 'timeout' seconds, the items not started yet are
+    timed out too since no thread is left to run them.
+    """
+    items = list(items)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    started = {}  # time at which each item started running
+
+    def run(index):
+        started[index] = time.monotonic()
+        return function(items[index])
+
+    def timed_out(future):
+        index = futures[future]
+        if on_error is None:
+            raise TimeoutError(f"Item {index} timed out.")
+        return index, on_error(items[index], TimeoutError())
+
+    try:
+        futures = {executor.submit(run, index): index
+                   for index in range(len(items))}
+        pending = set(futures)
+        hung = set()  # futures which timed out but are still running
+        starved_since = None  # since when all the threads are hung
+        while pending:
+            wait_time = None
+            if timeout is not None:
+                # wait until the next deadline. Items not started yet have
+                # their deadline at least 'timeout' seconds from now.
+                deadlines = [started[futures[future]] + timeout
+                             for future in pending
+                             if futures[future] in started]
+                if starved_since is not None:
+                    deadlines.append(starved_since + timeout)
+                wait_time = timeout
+                if deadlines:
+                    wait_time = max(min(deadlines) - time.monotonic(), 0)
+            done, pending = wait(pending, timeout=wait_time,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    result = on_error(items[index], e)
+                yield index, result
+            if timeout is None:
+                continue
+            now = time.monotonic()
+            expired = {future for future in pending
+                       if futures[future] in started and
+                       now - started[futures[future]] >= timeout}
+            for future in expired:
+                yield timed_out(future)
+            pending -= expired
+            hung = {future for future in hung | expired if not future.done()}
+            if len(hung) < executor._max_workers:
+                starved_since = None
+            elif starved_since is None:
+                starved_since = now
+            elif now - starved_since >= timeout:
+                # no thread left for the items not started yet
+                for future in pending:
+                    future.cancel()
+                    yield timed_out(future)
+                return
+    finally:
+        # don't wait for hung threads, they are left behind
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aimap(function, items, executor=None,
+                max_concurrency=MAX_CONCURRENCY, timeout=None, on_error=None):
+    """Async counterpart of imap_in_threads: apply a function on each item
+    in an executor without blocking the event loop and yield the
+    (index, result) pairs as soon as each item is done.
+
+    Parameters
+    ----------
+    function : callable
+               The function to apply on each item (it must be picklable if
+               the executor is a ProcessPoolExecutor).
+    items : list
+            The items to process.
+    executor : concurrent.futures.Executor, optional
+               The executor running the function. If None, the default
+               executor of the event loop (threads) is used.
+    max_concurrency : int, optional
+                      The maximal number of items running in the executor
+                      at the same time. An item which timed out keeps its
+                      slot until it really ends.
+    timeout : float, optional
+              If not None, the maximal time (in seconds) given to each item
+              once it started running (not while it waits for a worker of
+              the executor). Items in a ProcessPoolExecutor start once they
+              are sent to the worker processes.
+    on_error : callable, optional
+               If not None, called as on_error(item, exception) when an item
+               fails or times out and its return value is used as result.
+               Otherwise, the exception is raised.
+    """
+    items = list(items)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(index):
+        await semaphore.acquire()
+        future, started = _submit(loop, executor, function, items[index])
+        try:
+            if timeout is not None:
+                # the deadline starts once the item is running
+                await asyncio.wait({future, started},
+                                   return_when=asyncio.FIRST_COMPLETED)
+            # the item is not cancelled on timeout: it cannot be stopped
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.CancelledError:
+            # the iteration stopped: don't start the item if still queued
+            future.cancel()
+            raise
+        except Exception as e:
+            if on_error is None:
+                raise
+            result = on_error(items[index], e)
+        finally:
+            started.cancel()
+            if future.done():
+                semaphore.release()
+            else:
+                # timed out but still running: the slot is taken until then
+                future.add_done_callback(
+                        lambda future: _release(future, semaphore))
+        return index, result
+
+    tasks = [asyncio.ensure_future(run(index)) for index in range(len(items))]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        # stop the remaining items if the iteration stops early
+        for task in tasks:
+            task.cancel()
+
+
+def _submit(loop, executor, function, item):
+    # submit an item to an executor. Returns the future of its result and a
+    # future done once the item started running.
+    if executor is None or isinstance(executor, ThreadPoolExecutor):
+        started = loop.create_future()
+
+        def call():
+            loop.call_soon_threadsafe(_set_done, started)
+            return function(item)
+
+        return loop.run_in_executor(executor, call), started
+    # the item runs elsewhere (e.g.: in a process) and cannot signal the
+    # event loop: it started once the executor marks it as running
+    future = executor.submit(function, item)
+    started = asyncio.ensure_future(_wait_running(future))
+    return asyncio.wrap_future(future, loop=loop), started
+
+
+def _set_done(future):
+    if not future.done():
+        future.set_result(None)
+
+
+async def _wait_running(future):
+    while not future.running() and not future.done():
+        await asyncio.sleep(START_POLL_INTERVAL)
+
+
+def _release(future, semaphore):
+    # release the slot of an item which timed out once it really ends
+    if not future.cancelled():
+        # retrieved such that asyncio does not log it as never retrieved
+        future.exception()
+    semaphore.release()
 
 
 def styled_text(text, color="", style=""):
@@ -0,0 +1,198 @@
+from ..bases import BaseUtility
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+
+CACHE_TABLE = "calculations_v1"
+
+
+def default_cache_path(top_directory):
+    """Returns the path of the cache file of a calculation tree in the user
+    cache directory ($XDG_CACHE_HOME/abioutput or ~/.cache/abioutput).
+
+    Parameters
+    ----------
+    top_directory : str
+                    The top directory of the calculation tree.
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME",
+                               os.path.join(os.path.expanduser("~"),
+                                            ".cache"))
+    top_directory = os.path.abspath(os.path.expanduser(top_directory))
+    key = hashlib.sha1(top_directory.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, "abioutput", f"status_{key}.sqlite")
+
+
+def get_fingerprint(paths):
+    """Returns a cheap fingerprint of a list of files made from their sizes
+    and modification times only (the files are not read).
+
+    Parameters
+    ----------
+    paths : list
+            The file paths.
+    """
+    fingerprint = []
+    for path in sorted(paths):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        fingerprint.append([path, stat.st_size, stat.st_mtime_ns])
+    return json.dumps(fingerprint)
+
+
+class StatusCache(BaseUtility):
+    """Persistent (SQLite) cache of the status, convergence and output
+    variables of calculations. Each entry is keyed on the fingerprint of the
+    log and output files of the calculation: when these files change, the
+    entry is dropped and everything is computed again.
+
+    The cache can be shared between threads. Writes are committed right
+    away unless they are done inside a batch (see the batch method).
+    """
+    _loggername = "StatusCache"
+
+    def __init__(self, path, **kwargs):
+        """StatusCache init method.
+
+        Parameters
+        ----------
+        path : str
+               The path of the SQLite database. It is created if needed.
+        """
+        super().__init__(**kwargs)
+        self.path = os.path.abspath(os.path.expanduser(path))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._logger.debug(f"Using status cache: {self.path}.")
+        self._lock = threading.Lock()
+        self._nbatches = 0  # number of batches in progress
+        self._connection = sqlite3.connect(self.path,
+                                           check_same_thread=False)
+        # losing the cache on a crash is harmless => don't wait for the disk
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {CACHE_TABLE} ("
+                "path TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                "status TEXT, convergence INTEGER, "
+                "variables TEXT NOT NULL DEFAULT '{}')")
+        self._connection.commit()
+
+    def get(self, path, fingerprint):
+        """Returns the cached data of a calculation.
+
+        Parameters
+        ----------
+        path : str
+               The calculation directory.
+        fingerprint : str
+                      The current fingerprint of the calculation files.
+
+        Returns
+        -------
+        dict : The 'status', 'convergence' and 'variables' cached. Missing
+               data is None (or not in 'variables'). None is returned if the
+               calculation is not in the cache or if its files changed.
+        """
+        with self._lock:
+            return self._get(path, fingerprint)
+
+    def _get(self, path, fingerprint):
+        # same as get without the lock
+        row = self._connection.execute(
+                f"SELECT fingerprint, status, convergence, variables "
+                f"FROM {CACHE_TABLE} WHERE path = ?", (path, )).fetchone()
+        if row is None or row[0] != fingerprint:
+            return None
+        status = json.loads(row[1]) if row[1] is not None else None
+        convergence = bool(row[2]) if row[2] is not None else None
+        variables = {}
+        for name, value in json.loads(row[3]).items():
+            if value is not None:
+                value = tuple(value)
+            variables[name] = value
+        return {"status": status, "convergence": convergence,
+                "variables": variables}
+
+    def set(self, path, fingerprint, status=None, convergence=None,
+            variables=None):
+        """Stores data of a calculation. Data already cached for the same
+        fingerprint is kept (unless overwritten) while data cached for
+        another fingerprint is dropped.
+
+        Parameters
+        ----------
+        path : str
+               The calculation directory.
+        fingerprint : str
+                      The current fingerprint of the calculation files.
+        status : dict, optional
+                 The calculation status.
+        convergence : bool, optional
+                      The calculation convergence status.
+        variables : dict, optional
+                    Output variables (name: (value, units)).
+        """
+        # the cached data is read and replaced under the same lock not to
+        # lose the data set by another thread in between
+        with self._lock:
+            self._set(path, fingerprint, status, convergence, variables)
+            if not self._nbatches:
+                self._connection.commit()
+
+    def _set(self, path, fingerprint, status, convergence, variables):
+        # same as set without the lock and the commit
+        record = self._get(path, fingerprint)
+        if record is None:
+            record = {"status": None, "convergence": None, "variables": {}}
+        if status is not None:
+            record["status"] = status
+        if convergence is not None:
+            record["convergence"] = convergence
+        if variables is not None:
+            record["variables"].update(variables)
+        if record["status"] is not None:
+            status = json.dumps(record["status"])
+        convergence = record["convergence"]
+        if convergence is not None:
+            convergence = int(convergence)
+        self._connection.execute(
+                f"INSERT OR REPLACE INTO {CACHE_TABLE} "
+                f"(path, fingerprint, status, convergence, variables) "
+                f"VALUES (?, ?, ?, ?, ?)",
+                (path, fingerprint, status, convergence,
+                 json.dumps(record["variables"])))
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Context manager committing the data set inside it at once when
+        exiting (e.g.: once per status refresh of a calculation tree
+        instead of once per calculation). Batches can be nested or entered
+        by several threads: the commit is done when the last one exits.
+        """
+        with self._lock:
+            self._nbatches += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._nbatches -= 1
+                if not self._nbatches:
+                    self._connection.commit()
+
+    def clear(self):
+        """Remove everything from the cache.
+        """
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {CACHE_TABLE}")
+            self._connection.commit()
+
+    def close(self):
+        """Close the database.
+        """
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,99 @@
+"""Benchmarks of the parsers on synthetic ABINIT files of growing sizes
+(see abioutput.unittests.synthetic).
+
+Written for asv (https://asv.readthedocs.io): methods starting with 'time_'
+are timed and those starting with 'peakmem_' measure the peak memory.
+"""
+from abioutput.parsers import (DOSParser, EIGParser, FatbandParser,
+                               OutputParser, SelfEnergyParser)
+from abioutput.parsers.dmft import DMFTEigParser, DMFTProjectorsParser
+from abioutput.unittests.synthetic import write_synthetic_file
+import os
+import shutil
+import tempfile
+
+
+class _ParserBenchmark:
+    # subclasses define the kind of file, the parser callable (called with
+    # the path of the file) and the generator kwargs of each size
+    kind = None
+    parse = None
+    sizes = {}
+    params = ["small", "medium", "large"]
+    param_names = ["size"]
+
+    def setup(self, size):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "bench")
+        write_synthetic_file(self.path, self.kind, **self.sizes[size])
+
+    def teardown(self, size):
+        shutil.rmtree(self.directory)
+
+    def time_parse(self, size):
+        self.parse(self.path)
+
+    def peakmem_parse(self, size):
+        self.parse(self.path)
+
+
+class EIGParserSuite(_ParserBenchmark):
+    kind = "eig"
+    sizes = {"small": {"nkpt": 50, "nband": 10},
+             "medium": {"nkpt": 500, "nband": 50},
+             "large": {"nkpt": 2000, "nband": 200}}
+    parse = staticmethod(EIGParser.from_file)
+
+
+class PolarizedEIGParserSuite(EIGParserSuite):
+    sizes = {name: dict(size, polarized=True) for name, size in
+             EIGParserSuite.sizes.items()}
+
+
+class FatbandParserSuite(_ParserBenchmark):
+    kind = "fatband"
+    sizes = {"small": {"nkpt": 50, "nband": 10},
+             "medium": {"nkpt": 500, "nband": 50},
+             "large": {"nkpt": 2000, "nband": 100}}
+    parse = staticmethod(FatbandParser)
+
+
+class DOSParserSuite(_ParserBenchmark):
+    kind = "dos"
+    sizes = {"small": {"nenergy": 500},
+             "medium": {"nenergy": 5000, "ncolumn": 10},
+             "large": {"nenergy": 50000, "ncolumn": 20}}
+    parse = staticmethod(DOSParser)
+
+
+class DMFTEigParserSuite(_ParserBenchmark):
+    kind = "dmft_eig"
+    sizes = {"small": {"nkpt": 50, "nband": 5},
+             "medium": {"nkpt": 500, "nband": 10, "nspin": 2},
+             "large": {"nkpt": 2000, "nband": 10, "nspin": 2}}
+    parse = staticmethod(DMFTEigParser)
+
+
+class DMFTProjectorsParserSuite(_ParserBenchmark):
+    kind = "dmft_projectors"
+    sizes = {"small": {"nkpt": 10, "nband": 5},
+             "medium": {"nkpt": 100, "nband": 10, "natom": 2},
+             "large": {"nkpt": 200, "nband": 20, "nspin": 2, "natom": 2,
+                       "norb": 7}}
+    parse = staticmethod(DMFTProjectorsParser)
+
+
+class SelfEnergyParserSuite(_ParserBenchmark):
+    kind = "self_energy"
+    sizes = {"small": {"nfrequency": 100},
+             "medium": {"nfrequency": 10000},
+             "large": {"nfrequency": 100000}}
+    parse = staticmethod(SelfEnergyParser)
+
+
+class OutputParserSuite(_ParserBenchmark):
+    kind = "output"
+    sizes = {"small": {"ndtset": 1, "nkpt": 10, "nband": 8},
+             "medium": {"ndtset": 5, "nkpt": 100, "nband": 20},
+             "large": {"ndtset": 20, "nkpt": 500, "nband": 50}}
+    parse = staticmethod(OutputParser)
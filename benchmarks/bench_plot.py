@@ -0,0 +1,47 @@
+"""Benchmarks of the rendering of figures with many curves.
+
+Written for asv (https://asv.readthedocs.io): methods starting with 'time_'
+are timed and those starting with 'peakmem_' measure the peak memory.
+"""
+from abioutput.plot import Plot
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+NPOINTS = 1000
+
+
+class PlotManyCurves:
+    params = [100, 1000, 5000]
+    param_names = ["ncurves"]
+
+    def setup(self, ncurves):
+        plt.switch_backend("Agg")
+        xs = np.linspace(0, 1, NPOINTS)
+        # smooth band-like curves
+        ys = 0.1 * np.arange(ncurves)[:, None] + np.cos(2 * np.pi * xs)
+        self.plot = Plot()
+        for y in ys:
+            self.plot.add_curve(xs, y)
+        # overlay a second plot with another style
+        other = Plot()
+        for y in ys[:ncurves // 2]:
+            other.add_curve(xs, y + 1, color="r", linestyle="--")
+        self.plot = self.plot + other
+        self._show = plt.show
+        plt.show = _draw
+
+    def teardown(self, ncurves):
+        plt.show = self._show
+        plt.close("all")
+
+    def time_plot(self, ncurves):
+        self.plot.plot()
+
+    def peakmem_plot(self, ncurves):
+        self.plot.plot()
+
+
+def _draw():
+    # render the figure without a display
+    plt.gcf().canvas.draw()
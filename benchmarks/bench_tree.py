@@ -0,0 +1,121 @@
+"""Benchmarks of the calculation tree scanning on synthetic trees of 100,
+1000 and 10000 calculations in mixed states (see
+abioutput.unittests.synthetic.make_calculation_tree).
+
+Written for asv (https://asv.readthedocs.io): methods starting with 'time_'
+are timed, those starting with 'peakmem_' measure the peak memory and
+those starting with 'track_' record the number of file system calls
+(directory scans, stats and file opens) of each phase.
+"""
+from abioutput.utils.builders import TreeBuilder
+from abioutput.utils.output_pool import OUTPUT_POOL
+from abioutput.utils.routines import find_calculation_dirs
+from abioutput.unittests.synthetic import make_calculation_tree
+import builtins
+import contextlib
+import os
+
+
+SIZES = [100, 1000, 10000]
+# file system functions counted by the track_ benchmarks
+FILE_SYSTEM_CALLS = ((os, "scandir"), (os, "listdir"), (os, "stat"),
+                     (os, "lstat"), (builtins, "open"))
+
+
+class TreeSuite:
+    params = SIZES
+    param_names = ["ncalculations"]
+    timeout = 1200
+    # one call per sample (each sample has its own setup): the status and
+    # the parsed outputs of a call are never reused by the next one
+    number = 1
+    warmup_time = 0
+
+    def setup_cache(self):
+        # trees are built once for all benchmarks in the working directory
+        # (a temporary directory removed by asv at the end)
+        top = os.path.abspath("trees")
+        trees = {}
+        for size in SIZES:
+            trees[size] = os.path.join(top, f"tree{size}")
+            make_calculation_tree(trees[size], size)
+        return trees
+
+    def setup(self, trees, ncalculations):
+        self.top = trees[ncalculations]
+        # nothing parsed by another benchmark or sample is reused and the
+        # status is always computed (never taken from the last update)
+        OUTPUT_POOL.clear()
+        self.builder = TreeBuilder(self.top, time_between_updates=0)
+
+    def time_discovery(self, trees, ncalculations):
+        find_calculation_dirs(self.top)
+
+    def time_tree(self, trees, ncalculations):
+        TreeBuilder(self.top)
+
+    def time_status(self, trees, ncalculations):
+        self.builder.status
+
+    def time_print_status(self, trees, ncalculations):
+        with _quiet():
+            self.builder.print_status()
+
+    def time_print_attributes(self, trees, ncalculations):
+        with _quiet():
+            self.builder.print_attributes("status", "ecut", "etotal",
+                                          sortby="ecut", delta=["etotal"])
+
+    def peakmem_tree(self, trees, ncalculations):
+        TreeBuilder(self.top)
+
+    def peakmem_status(self, trees, ncalculations):
+        self.builder.status
+
+    def peakmem_print_attributes(self, trees, ncalculations):
+        with _quiet():
+            self.builder.print_attributes("status", "ecut", "etotal",
+                                          sortby="ecut", delta=["etotal"])
+
+    def track_discovery_calls(self, trees, ncalculations):
+        with _count_calls() as calls:
+            find_calculation_dirs(self.top)
+        return calls[0]
+
+    def track_status_calls(self, trees, ncalculations):
+        with _count_calls() as calls:
+            self.builder.status
+        return calls[0]
+
+    track_discovery_calls.unit = "calls"
+    track_status_calls.unit = "calls"
+
+
+@contextlib.contextmanager
+def _quiet():
+    # printed tables are not benchmarked
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            yield
+
+
+@contextlib.contextmanager
+def _count_calls():
+    # count the calls to the file system functions while in the context
+    calls = [0]
+    originals = [(module, name, getattr(module, name))
+                 for module, name in FILE_SYSTEM_CALLS]
+
+    def counting(function):
+        def wrapper(*args, **kwargs):
+            calls[0] += 1
+            return function(*args, **kwargs)
+        return wrapper
+
+    for module, name, function in originals:
+        setattr(module, name, counting(function))
+    try:
+        yield calls
+    finally:
+        for module, name, function in originals:
+            setattr(module, name, function)
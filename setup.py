@@ -25,6 +25,9 @@ except (ImportError, ModuleNotFoundError):
 setup(name="abioutput",
       description="Python package to ease reading abinit output using abipy.",
       install_requires=install_requires,
+      # HDF5 binary files and eigenvalue stores
+      extras_require={"hdf5": ["h5py"]},
+      entry_points={"console_scripts": ["abioutput = abioutput.cli:main"]},
       )
 
 if not abipyexists: